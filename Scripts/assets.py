@@ -1,11 +1,20 @@
 import sys
 import argparse
+import concurrent.futures
+import fnmatch
+import hashlib
+import json
+import lzma
+import mmap
 import shutil
+import struct
 import subprocess
 import os
 import re
+import time
+import zlib
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import setup
 
@@ -19,7 +28,14 @@ except ImportError:
 
 import tempfile
 import utils
-from utils import UI
+from utils import UI, CacheIndex, Fs
+
+np: Optional[object] = None
+
+try:
+    import numpy as np
+except ImportError:
+    pass
 
 
 class AssetConfig:
@@ -57,44 +73,141 @@ class AssetConfig:
         return list(bundles.keys())
 
     @classmethod
-    def create_temp_config_with_absolute_paths(cls) -> Optional[str]:
+    def get_unity_version(cls) -> str:
         config = cls.load()
-        temp_path_str = config.get("global", {}).get("temp_project_path")
-
-        if not temp_path_str or os.path.isabs(temp_path_str):
-            return None
+        version = config.get("global", {}).get("unity_version", "")
+        if not version:
+            UI.error("'unity_version' not specified in config.")
+            sys.exit(1)
+        return version
 
-        absolute_temp_path = (utils.Paths.PROJECT / temp_path_str).resolve()
+    @classmethod
+    def get_temp_project_root(cls) -> Path:
+        config = cls.load()
+        temp_path_str = config.get("global", {}).get(
+            "temp_project_path", ".build/cache/unity-project"
+        )
+        return (utils.Paths.PROJECT / temp_path_str).resolve()
 
+    @classmethod
+    def create_temp_config(cls, overrides: Dict[str, Path]) -> str:
         with open(cls.CONFIG_PATH, "r", encoding="utf-8") as f:
             toml_content = f.read()
 
-        pattern = r'(temp_project_path\s*=\s*)"[^"]*"'
-        replacement = rf'\1"{absolute_temp_path.as_posix()}"'
-        modified_toml_content = re.sub(pattern, replacement, toml_content)
+        for key, value in overrides.items():
+            pattern = rf'({key}\s*=\s*)"[^"]*"'
+            replacement = rf'\1"{value.as_posix()}"'
+            toml_content = re.sub(pattern, replacement, toml_content)
 
+        Fs.ensure_dir(utils.Paths.TEMP)
         with tempfile.NamedTemporaryFile(
-            mode="w+", delete=False, suffix=".toml", encoding="utf-8"
+            mode="w+",
+            delete=False,
+            suffix=".toml",
+            dir=utils.Paths.TEMP,
+            encoding="utf-8",
         ) as temp_config_file:
-            temp_config_file.write(modified_toml_content)
+            temp_config_file.write(toml_content)
             return temp_config_file.name
 
 
+class UnityProjectPool:
+    STAMP_FILE = ".last-used"
+    LEGACY_ENTRIES = (
+        "Assets",
+        "Library",
+        "Logs",
+        "Packages",
+        "ProjectSettings",
+        "Temp",
+        "UserSettings",
+    )
+    DEFAULT_MAX_BYTES = 4 * 1024**3
+
+    @classmethod
+    def _root(cls) -> Path:
+        return AssetConfig.get_temp_project_root()
+
+    @classmethod
+    def key(cls, unity_version: str, target: Optional[str]) -> str:
+        return f"{unity_version}-{target or 'all'}"
+
+    @classmethod
+    def _migrate_legacy(cls, root: Path, unity_version: str) -> None:
+        legacy = [root / name for name in cls.LEGACY_ENTRIES if (root / name).exists()]
+        if not legacy:
+            return
+
+        destination = root / cls.key(unity_version, None)
+        UI.info(f"Moving existing temp project into pool entry '{destination.name}'.")
+        Fs.ensure_dir(destination)
+        for path in legacy:
+            if (destination / path.name).exists():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                shutil.move(str(path), str(destination / path.name))
+
+    @classmethod
+    def acquire(cls, unity_version: str, target: Optional[str]) -> Path:
+        root = cls._root()
+        cls._migrate_legacy(root, unity_version)
+
+        project = root / cls.key(unity_version, target)
+        Fs.ensure_dir(project)
+        (project / cls.STAMP_FILE).touch()
+        CacheIndex.touch(project)
+        return project
+
+    @classmethod
+    def entries(cls) -> List[Tuple[Path, float, int]]:
+        root = cls._root()
+        if not root.exists():
+            return []
+
+        entries = []
+        for path in root.iterdir():
+            if not path.is_dir() or path.name in cls.LEGACY_ENTRIES:
+                continue
+            stamp = path / cls.STAMP_FILE
+            last_used = stamp.stat().st_mtime if stamp.exists() else 0.0
+            entries.append((path, last_used, Fs.dir_size(path)))
+        return sorted(entries, key=lambda e: e[1], reverse=True)
+
+    @classmethod
+    def prune(cls, max_bytes: int, keep: Optional[Path] = None) -> None:
+        total = 0
+        for path, _, size in cls.entries():
+            total += size
+            if total <= max_bytes or path == keep:
+                continue
+            with UI.spin(f"Evicting temp project '{path.name}' ({size} bytes)..."):
+                shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
 class AbbTool:
     TOOL_ID = "CryptikLemur.AssetBundleBuilder"
     TOOL_VERSION = "4.0.1"
     ABB_PATH = utils.Paths.TOOLS / "assetbundlebuilder"
 
     @classmethod
-    def build(cls, bundle_name: str):
+    def build(
+        cls,
+        bundle_name: str,
+        project_path: Path,
+        target: Optional[str] = None,
+        output_dir: Optional[Path] = None,
+    ):
         if not cls.ABB_PATH.exists():
             UI.error(
                 "ABB tool not found.", hint="Run 'python Scripts/setup.py setup assets'"
             )
             sys.exit(1)
 
-        temp_config = AssetConfig.create_temp_config_with_absolute_paths()
-        config_path = temp_config if temp_config else str(AssetConfig.CONFIG_PATH)
+        overrides = {"temp_project_path": project_path}
+        if output_dir:
+            overrides["output_directory"] = output_dir
+        temp_config = AssetConfig.create_temp_config(overrides)
 
         UI.step(f"Building bundle '{bundle_name}'...")
 
@@ -102,11 +215,13 @@ class AbbTool:
             str(cls.ABB_PATH),
             bundle_name,
             "--config",
-            config_path,
+            temp_config,
             "--non-interactive",
             "--ci",
             "-vv",
         ]
+        if target:
+            cmd += ["--target", target]
 
         try:
             utils.run(cmd, cwd=utils.Paths.PROJECT, capture=True)
@@ -119,10 +234,1359 @@ class AbbTool:
                 UI.print_line(e.stderr)
             sys.exit(1)
         finally:
-            if temp_config and os.path.exists(temp_config):
+            if os.path.exists(temp_config):
                 os.remove(temp_config)
 
 
+class Lz4:
+    @staticmethod
+    def decompress(src: bytes, uncompressed_size: int) -> bytes:
+        dst = bytearray()
+        i = 0
+        end = len(src)
+
+        while i < end:
+            token = src[i]
+            i += 1
+
+            literal_length = token >> 4
+            if literal_length == 15:
+                while True:
+                    b = src[i]
+                    i += 1
+                    literal_length += b
+                    if b != 255:
+                        break
+            dst += src[i : i + literal_length]
+            i += literal_length
+
+            if i >= end:
+                break
+
+            offset = src[i] | (src[i + 1] << 8)
+            i += 2
+            if offset == 0 or offset > len(dst):
+                raise ValueError("Corrupt LZ4 block: invalid match offset.")
+
+            match_length = token & 0x0F
+            if match_length == 15:
+                while True:
+                    b = src[i]
+                    i += 1
+                    match_length += b
+                    if b != 255:
+                        break
+            match_length += 4
+
+            start = len(dst) - offset
+            if offset >= match_length:
+                dst += dst[start : start + match_length]
+            else:
+                for k in range(match_length):
+                    dst.append(dst[start + k])
+
+        if len(dst) != uncompressed_size:
+            raise ValueError(
+                f"Corrupt LZ4 block: expected {uncompressed_size} bytes, got {len(dst)}."
+            )
+        return bytes(dst)
+
+
+class UnityBundle:
+    SIGNATURE = b"UnityFS\x00"
+
+    COMPRESSION_NAMES = {0: "none", 1: "lzma", 2: "lz4", 3: "lz4hc"}
+
+    FLAG_COMPRESSION_MASK = 0x3F
+    FLAG_BLOCKS_INFO_AT_END = 0x80
+    FLAG_BLOCK_INFO_NEED_PADDING = 0x200
+
+    CLASS_NAMES = {
+        21: "Material",
+        28: "Texture2D",
+        48: "Shader",
+        49: "TextAsset",
+        114: "MonoBehaviour",
+        142: "AssetBundle",
+    }
+
+    CLASS_ID_ASSET_BUNDLE = 142
+    CLASS_ID_MONO_BEHAVIOUR = 114
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file_size = 0
+        self.format_version = 0
+        self.unity_revision = ""
+        self.flags = 0
+        self.blocks: List[Tuple[int, int, int]] = []
+        self.nodes: List[Tuple[int, int, int, str]] = []
+        self.objects: List[Dict] = []
+        self.container: Dict[str, int] = {}
+
+    @property
+    def compression(self) -> str:
+        return UnityBundle._compression_name(self.flags)
+
+    @property
+    def compressed_size(self) -> int:
+        return sum(block[1] for block in self.blocks)
+
+    @property
+    def uncompressed_size(self) -> int:
+        return sum(block[0] for block in self.blocks)
+
+    @property
+    def shaders(self) -> List[str]:
+        return sorted(
+            name for name in self.container if name.lower().endswith(".shader")
+        )
+
+    @staticmethod
+    def _compression_name(flags: int) -> str:
+        code = flags & UnityBundle.FLAG_COMPRESSION_MASK
+        return UnityBundle.COMPRESSION_NAMES.get(code, f"unknown({code})")
+
+    @staticmethod
+    def _read_cstring(data, offset: int) -> Tuple[str, int]:
+        end = data.find(b"\x00", offset)
+        if end < 0:
+            raise ValueError("Unterminated string in bundle header.")
+        return bytes(data[offset:end]).decode("utf-8", "replace"), end + 1
+
+    @staticmethod
+    def _align(offset: int, alignment: int) -> int:
+        return (offset + alignment - 1) & ~(alignment - 1)
+
+    @staticmethod
+    def _decompress(data: bytes, uncompressed_size: int, flags: int) -> bytes:
+        code = flags & UnityBundle.FLAG_COMPRESSION_MASK
+        if code == 0:
+            return bytes(data)
+        if code in (2, 3):
+            return Lz4.decompress(data, uncompressed_size)
+        if code == 1:
+            props = data[0]
+            dict_size = struct.unpack_from("<I", data, 1)[0]
+            lzma_filter = {
+                "id": lzma.FILTER_LZMA1,
+                "lc": props % 9,
+                "lp": (props // 9) % 5,
+                "pb": props // 45,
+                "dict_size": dict_size,
+            }
+            decompressor = lzma.LZMADecompressor(
+                format=lzma.FORMAT_RAW, filters=[lzma_filter]
+            )
+            return decompressor.decompress(bytes(data[5:]), uncompressed_size)
+        raise ValueError(f"Unsupported compression type {code}.")
+
+    @classmethod
+    def load(cls, path: Path) -> "UnityBundle":
+        bundle = cls(path)
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            payload = bundle._parse_archive(data)
+        bundle._parse_serialized_files(payload)
+        return bundle
+
+    def _parse_archive(self, data) -> bytes:
+        if data[: len(self.SIGNATURE)] != self.SIGNATURE:
+            raise ValueError("Not a UnityFS bundle.")
+
+        offset = len(self.SIGNATURE)
+        self.format_version = struct.unpack_from(">I", data, offset)[0]
+        offset += 4
+        _, offset = self._read_cstring(data, offset)
+        self.unity_revision, offset = self._read_cstring(data, offset)
+
+        self.file_size, info_compressed, info_uncompressed, self.flags = (
+            struct.unpack_from(">qIII", data, offset)
+        )
+        offset += 20
+
+        if self.format_version >= 7:
+            offset = self._align(offset, 16)
+
+        if self.flags & self.FLAG_BLOCKS_INFO_AT_END:
+            info_offset = len(data) - info_compressed
+            data_offset = offset
+        else:
+            info_offset = offset
+            data_offset = offset + info_compressed
+
+        info = self._decompress(
+            data[info_offset : info_offset + info_compressed],
+            info_uncompressed,
+            self.flags,
+        )
+        self._parse_blocks_info(info)
+
+        if self.flags & self.FLAG_BLOCK_INFO_NEED_PADDING:
+            data_offset = self._align(data_offset, 16)
+
+        payload = bytearray()
+        for uncompressed, compressed, block_flags in self.blocks:
+            chunk = data[data_offset : data_offset + compressed]
+            payload += self._decompress(chunk, uncompressed, block_flags)
+            data_offset += compressed
+        return bytes(payload)
+
+    def _parse_blocks_info(self, info: bytes) -> None:
+        offset = 16
+        (block_count,) = struct.unpack_from(">i", info, offset)
+        offset += 4
+        for _ in range(block_count):
+            self.blocks.append(struct.unpack_from(">IIH", info, offset))
+            offset += 10
+
+        (node_count,) = struct.unpack_from(">i", info, offset)
+        offset += 4
+        for _ in range(node_count):
+            node_offset, node_size, node_flags = struct.unpack_from(
+                ">qqI", info, offset
+            )
+            name, offset = self._read_cstring(info, offset + 20)
+            self.nodes.append((node_offset, node_size, node_flags, name))
+
+    def _parse_serialized_files(self, payload: bytes) -> None:
+        for node_offset, node_size, _, name in self.nodes:
+            if name.endswith((".resS", ".resource")):
+                continue
+            try:
+                self._parse_serialized_file(
+                    payload[node_offset : node_offset + node_size], name
+                )
+            except (struct.error, ValueError, IndexError):
+                UI.warn(
+                    f"Could not parse serialized file '{name}' in {self.path.name}."
+                )
+
+    def _parse_serialized_file(self, data: bytes, node_name: str) -> None:
+        version = struct.unpack_from(">I", data, 8)[0]
+        if version < 22:
+            raise ValueError(f"Unsupported serialized file version {version}.")
+
+        big_endian = data[16] != 0
+        _, _, data_offset, _ = struct.unpack_from(">Iqqq", data, 20)
+        offset = 48
+        e = ">" if big_endian else "<"
+
+        _, offset = self._read_cstring(data, offset)
+        _, type_tree_enabled = struct.unpack_from(e + "iB", data, offset)
+        offset += 5
+
+        class_ids = []
+        (type_count,) = struct.unpack_from(e + "i", data, offset)
+        offset += 4
+        for _ in range(type_count):
+            (class_id,) = struct.unpack_from(e + "i", data, offset)
+            offset += 7
+            if class_id == self.CLASS_ID_MONO_BEHAVIOUR:
+                offset += 16
+            offset += 16
+            if type_tree_enabled:
+                node_count, string_size = struct.unpack_from(e + "ii", data, offset)
+                offset += 8 + node_count * 32 + string_size
+                (dependency_count,) = struct.unpack_from(e + "i", data, offset)
+                offset += 4 + dependency_count * 4
+            class_ids.append(class_id)
+
+        (object_count,) = struct.unpack_from(e + "i", data, offset)
+        offset += 4
+        for _ in range(object_count):
+            offset = self._align(offset, 4)
+            path_id, byte_start, byte_size, type_index = struct.unpack_from(
+                e + "qqIi", data, offset
+            )
+            offset += 24
+            class_id = class_ids[type_index]
+            self.objects.append(
+                {
+                    "file": node_name,
+                    "path_id": path_id,
+                    "class_id": class_id,
+                    "size": byte_size,
+                }
+            )
+            if class_id == self.CLASS_ID_ASSET_BUNDLE:
+                start = data_offset + byte_start
+                self._parse_container(data[start : start + byte_size], e)
+
+    def _parse_container(self, data: bytes, e: str) -> None:
+        def read_string(offset: int) -> Tuple[str, int]:
+            (length,) = struct.unpack_from(e + "i", data, offset)
+            value = data[offset + 4 : offset + 4 + length].decode("utf-8", "replace")
+            return value, self._align(offset + 4 + length, 4)
+
+        _, offset = read_string(0)
+        (preload_count,) = struct.unpack_from(e + "i", data, offset)
+        offset += 4 + preload_count * 12
+
+        (container_count,) = struct.unpack_from(e + "i", data, offset)
+        offset += 4
+        for _ in range(container_count):
+            name, offset = read_string(offset)
+            _, _, _, path_id = struct.unpack_from(e + "iiiq", data, offset)
+            offset += 20
+            self.container[name] = path_id
+
+    def asset_name(self, obj: Dict) -> str:
+        if obj["class_id"] == self.CLASS_ID_ASSET_BUNDLE:
+            return "(bundle manifest)"
+        path_id = obj["path_id"]
+        for name, container_id in self.container.items():
+            if container_id == path_id:
+                return name
+        return "(dependency)"
+
+    def class_name(self, class_id: int) -> str:
+        return self.CLASS_NAMES.get(class_id, f"ClassID {class_id}")
+
+
+class BundleInspector:
+    TARGETS = ("linux", "mac", "win")
+    DEFAULT_BUDGET = 64 * 1024
+
+    @staticmethod
+    def _ratio(compressed: int, uncompressed: int) -> str:
+        if uncompressed == 0:
+            return "-"
+        return f"{compressed / uncompressed:.1%}"
+
+    @classmethod
+    def _group_key(cls, path: Path) -> Tuple[str, Optional[str]]:
+        stem, _, target = path.name.rpartition("_")
+        if stem and target in cls.TARGETS:
+            return stem, target
+        return path.name, None
+
+    @classmethod
+    def find_bundles(cls) -> List[Path]:
+        output_dir = AssetConfig.get_output_directory()
+        if not output_dir.exists():
+            return []
+        return sorted(
+            f
+            for f in output_dir.iterdir()
+            if f.is_file()
+            and f.suffix != ".manifest"
+            and AssetCleaner._is_unity_bundle(f)
+        )
+
+    @classmethod
+    def report(cls, bundle: UnityBundle) -> None:
+        size = bundle.path.stat().st_size
+        UI.header(f"{bundle.path.name} ({utils.format_size(size)})")
+        UI.info(
+            f"Unity {bundle.unity_revision}, format {bundle.format_version}, "
+            f"{bundle.compression}"
+        )
+
+        for index, (uncompressed, compressed, flags) in enumerate(bundle.blocks):
+            UI.print_line(
+                f"  block {index}: {utils.format_size(compressed):>10} / "
+                f"{utils.format_size(uncompressed):>10} "
+                f"({cls._ratio(compressed, uncompressed)}, "
+                f"{UnityBundle._compression_name(flags)})"
+            )
+
+        ratio = bundle.compressed_size / max(bundle.uncompressed_size, 1)
+        for _, node_size, _, name in bundle.nodes:
+            UI.print_line(
+                f"  node {name}: {utils.format_size(node_size)} "
+                f"(~{utils.format_size(int(node_size * ratio))} compressed)"
+            )
+
+        for obj in sorted(bundle.objects, key=lambda o: o["size"], reverse=True):
+            UI.print_line(
+                f"    {utils.format_size(obj['size']):>10}  "
+                f"{bundle.class_name(obj['class_id']):<12} "
+                f"{bundle.asset_name(obj)}"
+            )
+
+    @classmethod
+    def check_targets(cls, bundles: List[UnityBundle]) -> bool:
+        groups: Dict[str, Dict[str, List[str]]] = {}
+        for bundle in bundles:
+            stem, target = cls._group_key(bundle.path)
+            if target:
+                groups.setdefault(stem, {})[target] = bundle.shaders
+
+        ok = True
+        for stem, targets in groups.items():
+            missing = [t for t in cls.TARGETS if t not in targets]
+            if missing:
+                UI.warn(f"'{stem}' has no bundle for target(s): {', '.join(missing)}")
+
+            all_shaders = set().union(*targets.values())
+            consistent = True
+            for target, shaders in sorted(targets.items()):
+                absent = sorted(all_shaders - set(shaders))
+                if absent:
+                    UI.error(
+                        f"'{stem}_{target}' is missing shader(s): {', '.join(absent)}"
+                    )
+                    consistent = False
+            ok = ok and consistent
+            if consistent:
+                UI.success(
+                    f"'{stem}' contains the same {len(all_shaders)} shader(s) "
+                    f"across {len(targets)} target(s)."
+                )
+        return ok
+
+    @classmethod
+    def check_budget(cls, bundles: List[UnityBundle], budget: int) -> bool:
+        ok = True
+        for bundle in bundles:
+            size = bundle.path.stat().st_size
+            if size > budget:
+                UI.error(
+                    f"'{bundle.path.name}' is {utils.format_size(size)}, "
+                    f"over the budget of {utils.format_size(budget)}."
+                )
+                ok = False
+        if ok:
+            UI.success(f"All bundles are within {utils.format_size(budget)}.")
+        return ok
+
+
+class Png:
+    SIGNATURE = b"\x89PNG\r\n\x1a\n"
+    CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+    METADATA_CHUNKS = {b"tEXt", b"zTXt", b"iTXt", b"tIME"}
+    FINALISTS = 2
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        bit_depth: int,
+        color_type: int,
+        pixels: bytes,
+        chunks_before: Optional[List[Tuple[bytes, bytes]]] = None,
+        chunks_after: Optional[List[Tuple[bytes, bytes]]] = None,
+    ):
+        self.width = width
+        self.height = height
+        self.bit_depth = bit_depth
+        self.color_type = color_type
+        self.pixels = pixels
+        self.chunks_before = chunks_before or []
+        self.chunks_after = chunks_after or []
+
+    @property
+    def bytes_per_pixel(self) -> int:
+        return max(1, self.CHANNELS[self.color_type] * self.bit_depth // 8)
+
+    @property
+    def stride(self) -> int:
+        return (self.width * self.CHANNELS[self.color_type] * self.bit_depth + 7) // 8
+
+    @classmethod
+    def decode(cls, data: bytes) -> "Png":
+        if not data.startswith(cls.SIGNATURE):
+            raise ValueError("Not a PNG file.")
+
+        offset = len(cls.SIGNATURE)
+        header = None
+        idat = []
+        before: List[Tuple[bytes, bytes]] = []
+        after: List[Tuple[bytes, bytes]] = []
+
+        while offset < len(data):
+            length, chunk_type = struct.unpack_from(">I4s", data, offset)
+            chunk = data[offset + 8 : offset + 8 + length]
+            (crc,) = struct.unpack_from(">I", data, offset + 8 + length)
+            if zlib.crc32(chunk_type + chunk) != crc:
+                raise ValueError(f"CRC mismatch in {chunk_type.decode()} chunk.")
+            offset += 12 + length
+
+            if chunk_type == b"IHDR":
+                header = struct.unpack(">IIBBBBB", chunk)
+            elif chunk_type == b"IDAT":
+                idat.append(chunk)
+            elif chunk_type == b"IEND":
+                break
+            elif chunk_type not in cls.METADATA_CHUNKS:
+                (after if idat else before).append((chunk_type, chunk))
+
+        if header is None or not idat:
+            raise ValueError("Missing IHDR or IDAT chunk.")
+
+        width, height, bit_depth, color_type, _, _, interlace = header
+        if color_type not in cls.CHANNELS:
+            raise ValueError(f"Unsupported color type {color_type}.")
+        if interlace:
+            raise ValueError("Interlaced PNGs are not supported.")
+
+        png = cls(width, height, bit_depth, color_type, b"", before, after)
+        raw = zlib.decompress(b"".join(idat))
+        png.pixels = cls._unfilter(raw, height, png.stride, png.bytes_per_pixel)
+        return png
+
+    @staticmethod
+    def _unfilter(raw: bytes, height: int, stride: int, bpp: int) -> bytes:
+        if len(raw) < height * (stride + 1):
+            raise ValueError("Truncated image data.")
+
+        out = bytearray(height * stride)
+        prev = bytearray(stride)
+        pos = 0
+
+        for y in range(height):
+            filter_type = raw[pos]
+            line = bytearray(raw[pos + 1 : pos + 1 + stride])
+            pos += stride + 1
+
+            if filter_type == 1:
+                for i in range(bpp, stride):
+                    line[i] = (line[i] + line[i - bpp]) & 0xFF
+            elif filter_type == 2:
+                for i in range(stride):
+                    line[i] = (line[i] + prev[i]) & 0xFF
+            elif filter_type == 3:
+                for i in range(stride):
+                    left = line[i - bpp] if i >= bpp else 0
+                    line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+            elif filter_type == 4:
+                for i in range(stride):
+                    if i >= bpp:
+                        a = line[i - bpp]
+                        c = prev[i - bpp]
+                    else:
+                        a = c = 0
+                    b = prev[i]
+                    p = a + b - c
+                    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                    if pa <= pb and pa <= pc:
+                        pred = a
+                    elif pb <= pc:
+                        pred = b
+                    else:
+                        pred = c
+                    line[i] = (line[i] + pred) & 0xFF
+            elif filter_type != 0:
+                raise ValueError(f"Invalid filter type {filter_type} on row {y}.")
+
+            out[y * stride : (y + 1) * stride] = line
+            prev = line
+
+        return bytes(out)
+
+    @staticmethod
+    def _filter_row(filter_type: int, row: bytes, prev: bytes, bpp: int) -> bytes:
+        if filter_type == 0:
+            return row
+        if filter_type == 1:
+            return row[:bpp] + bytes((a - b) & 0xFF for a, b in zip(row[bpp:], row))
+        if filter_type == 2:
+            return bytes((a - b) & 0xFF for a, b in zip(row, prev))
+
+        left = bytes(bpp) + row[:-bpp]
+        if filter_type == 3:
+            return bytes(
+                (x - ((a + b) >> 1)) & 0xFF for x, a, b in zip(row, left, prev)
+            )
+
+        upper_left = bytes(bpp) + prev[:-bpp]
+        out = bytearray(len(row))
+        for i, (x, a, b, c) in enumerate(zip(row, left, prev, upper_left)):
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            if pa <= pb and pa <= pc:
+                out[i] = (x - a) & 0xFF
+            elif pb <= pc:
+                out[i] = (x - b) & 0xFF
+            else:
+                out[i] = (x - c) & 0xFF
+        return bytes(out)
+
+    _ABS_TABLE = bytes(b if b < 128 else 256 - b for b in range(256))
+
+    @staticmethod
+    def _row_cost(filtered: bytes) -> int:
+        return sum(filtered.translate(Png._ABS_TABLE))
+
+    def filter_candidates(self) -> List[bytes]:
+        stride = self.stride
+        bpp = self.bytes_per_pixel
+        prev = bytes(stride)
+        fixed: List[List[bytes]] = [[] for _ in range(5)]
+        adaptive: List[bytes] = []
+
+        for y in range(self.height):
+            row = self.pixels[y * stride : (y + 1) * stride]
+            options = [self._filter_row(f, row, prev, bpp) for f in range(5)]
+            for f, filtered in enumerate(options):
+                fixed[f].append(bytes([f]) + filtered)
+            best = min(range(5), key=lambda f: self._row_cost(options[f]))
+            adaptive.append(bytes([best]) + options[best])
+            prev = row
+
+        return [b"".join(rows) for rows in fixed] + [b"".join(adaptive)]
+
+    @staticmethod
+    def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + chunk_type
+            + data
+            + struct.pack(">I", zlib.crc32(chunk_type + data))
+        )
+
+    def encode(self, idat: bytes) -> bytes:
+        header = struct.pack(
+            ">IIBBBBB",
+            self.width,
+            self.height,
+            self.bit_depth,
+            self.color_type,
+            0,
+            0,
+            0,
+        )
+        parts = [self.SIGNATURE, self._chunk(b"IHDR", header)]
+        parts += [self._chunk(t, d) for t, d in self.chunks_before]
+        parts.append(self._chunk(b"IDAT", idat))
+        parts += [self._chunk(t, d) for t, d in self.chunks_after]
+        parts.append(self._chunk(b"IEND", b""))
+        return b"".join(parts)
+
+    def optimize(self) -> bytes:
+        candidates = self.filter_candidates()
+        screened = sorted(candidates, key=lambda stream: len(zlib.compress(stream, 6)))[
+            : self.FINALISTS
+        ]
+
+        best = None
+        for stream in screened:
+            for strategy in (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED):
+                compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+                idat = compressor.compress(stream) + compressor.flush()
+                if best is None or len(idat) < len(best):
+                    best = idat
+        return self.encode(best)
+
+    def to_rgba(self) -> bytes:
+        if self.bit_depth != 8:
+            raise ValueError("Only 8-bit PNGs can be converted to RGBA.")
+
+        pixels = self.pixels
+        if self.color_type == 6:
+            return pixels
+
+        out = bytearray(self.width * self.height * 4)
+        out[3::4] = b"\xff" * (self.width * self.height)
+        if self.color_type == 2:
+            out[0::4] = pixels[0::3]
+            out[1::4] = pixels[1::3]
+            out[2::4] = pixels[2::3]
+        elif self.color_type == 0:
+            out[0::4] = out[1::4] = out[2::4] = pixels
+        elif self.color_type == 4:
+            out[0::4] = out[1::4] = out[2::4] = pixels[0::2]
+            out[3::4] = pixels[1::2]
+        elif self.color_type == 3:
+            chunks = dict(self.chunks_before)
+            palette = chunks.get(b"PLTE", b"")
+            alpha = chunks.get(b"tRNS", b"")
+            for i, index in enumerate(pixels):
+                out[i * 4 : i * 4 + 3] = palette[index * 3 : index * 3 + 3]
+                if index < len(alpha):
+                    out[i * 4 + 3] = alpha[index]
+        return bytes(out)
+
+
+class TextureOptimizer:
+    CACHE_DIR = utils.Paths.CACHE / "textures"
+    CACHE_VERSION = b"png-opt-1"
+
+    TEXTURE_GLOBS = ["Mods/Microtools/Textures/**/*.png", "Mods/Microtools/About/*.png"]
+    ATLAS_PATTERN = "dh_*_overlay_*.png"
+    ATLAS_NAME = "dh_overlay_atlas"
+    ATLAS_PADDING = 2
+
+    @classmethod
+    def find_textures(cls) -> List[Path]:
+        files = set()
+        for pattern in cls.TEXTURE_GLOBS:
+            files.update(utils.Paths.PROJECT.glob(pattern))
+        return sorted(files)
+
+    @classmethod
+    def _cache_key(cls, data: bytes) -> str:
+        return hashlib.sha256(cls.CACHE_VERSION + data).hexdigest()
+
+    @staticmethod
+    def _same_image(source: Png, data: bytes) -> bool:
+        try:
+            candidate = Png.decode(data)
+        except (ValueError, struct.error, zlib.error):
+            return False
+        return (
+            candidate.width,
+            candidate.height,
+            candidate.bit_depth,
+            candidate.color_type,
+            candidate.pixels,
+            candidate.chunks_before,
+            candidate.chunks_after,
+        ) == (
+            source.width,
+            source.height,
+            source.bit_depth,
+            source.color_type,
+            source.pixels,
+            source.chunks_before,
+            source.chunks_after,
+        )
+
+    @classmethod
+    def _write_cache(cls, data: bytes, optimized: bytes) -> None:
+        Fs.ensure_dir(cls.CACHE_DIR)
+        cache_file = cls.CACHE_DIR / f"{cls._cache_key(data)}.png"
+        temp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        temp.write_bytes(optimized)
+        os.replace(temp, cache_file)
+
+    @classmethod
+    def optimize_file(cls, path: Path, dry_run: bool) -> Tuple[int, int, bool]:
+        data = path.read_bytes()
+        cache_file = cls.CACHE_DIR / f"{cls._cache_key(data)}.png"
+
+        try:
+            optimized = cache_file.read_bytes()
+        except OSError:
+            optimized = b""
+        cached = optimized.startswith(Png.SIGNATURE)
+        if not cached:
+            source = Png.decode(data)
+            optimized = source.optimize()
+            if len(optimized) >= len(data) or not cls._same_image(source, optimized):
+                optimized = data
+            cls._write_cache(data, optimized)
+            if optimized is not data:
+                cls._write_cache(optimized, optimized)
+
+        if not dry_run and len(optimized) < len(data):
+            path.write_bytes(optimized)
+        return len(data), len(optimized), cached
+
+    @classmethod
+    def pack_atlas(cls, sources: List[Path], output_dir: Path) -> Tuple[Path, Path]:
+        sprites = []
+        for path in sources:
+            png = Png.decode(path.read_bytes())
+            sprites.append((path.stem, png.width, png.height, png.to_rgba()))
+
+        pad = cls.ATLAS_PADDING
+        sprites.sort(key=lambda s: (-s[2], s[0]))
+
+        max_width = max(s[1] for s in sprites) + pad * 2
+        total_area = sum((s[1] + pad * 2) * (s[2] + pad * 2) for s in sprites)
+        width = 1
+        while width < max(max_width, int(total_area**0.5)):
+            width *= 2
+
+        placements = {}
+        x = y = shelf_height = 0
+        for name, w, h, _ in sprites:
+            if x + w + pad * 2 > width:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            placements[name] = (x + pad, y + pad)
+            x += w + pad * 2
+            shelf_height = max(shelf_height, h + pad * 2)
+
+        height = 1
+        while height < y + shelf_height:
+            height *= 2
+
+        canvas = bytearray(width * height * 4)
+        for name, w, h, rgba in sprites:
+            px, py = placements[name]
+            for row in range(h):
+                dst = ((py + row) * width + px) * 4
+                canvas[dst : dst + w * 4] = rgba[row * w * 4 : (row + 1) * w * 4]
+
+        metadata = {
+            "texture": f"{cls.ATLAS_NAME}.png",
+            "width": width,
+            "height": height,
+        }
+        metadata["sprites"] = {
+            name: {
+                "rect": [placements[name][0], placements[name][1], w, h],
+                "uv": [
+                    placements[name][0] / width,
+                    1 - (placements[name][1] + h) / height,
+                    (placements[name][0] + w) / width,
+                    1 - placements[name][1] / height,
+                ],
+            }
+            for name, w, h, _ in sorted(sprites)
+        }
+
+        Fs.ensure_dir(output_dir)
+        atlas_path = output_dir / f"{cls.ATLAS_NAME}.png"
+        metadata_path = output_dir / f"{cls.ATLAS_NAME}.json"
+        atlas_path.write_bytes(Png(width, height, 8, 6, bytes(canvas)).optimize())
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        return atlas_path, metadata_path
+
+
+def _optimize_texture_worker(path: Path, dry_run: bool) -> Tuple[int, int, bool]:
+    return TextureOptimizer.optimize_file(path, dry_run)
+
+
+class DdsEncoder:
+    SOURCE_DIR = utils.Paths.PROJECT / "Assets" / "Textures"
+    OUTPUT_DIR = utils.Paths.PROJECT / "Mods" / "Microtools" / "Textures"
+
+    DDSD_CAPS = 0x1
+    DDSD_HEIGHT = 0x2
+    DDSD_WIDTH = 0x4
+    DDSD_PIXELFORMAT = 0x1000
+    DDSD_MIPMAPCOUNT = 0x20000
+    DDSD_LINEARSIZE = 0x80000
+    DDPF_FOURCC = 0x4
+    DDSCAPS_COMPLEX = 0x8
+    DDSCAPS_TEXTURE = 0x1000
+    DDSCAPS_MIPMAP = 0x400000
+
+    FOURCC = {"bc1": b"DXT1", "bc3": b"DXT5"}
+    BLOCK_SIZE = {"bc1": 8, "bc3": 16}
+
+    @staticmethod
+    def _is_power_of_two(value: int) -> bool:
+        return value > 0 and value & (value - 1) == 0
+
+    @staticmethod
+    def _to_565(rgb):
+        rgb = np.rint(rgb).astype(np.uint16)
+        return (
+            ((rgb[..., 0] >> 3) << 11) | ((rgb[..., 1] >> 2) << 5) | (rgb[..., 2] >> 3)
+        )
+
+    @staticmethod
+    def _from_565(value):
+        r = (value >> 11) & 0x1F
+        g = (value >> 5) & 0x3F
+        b = value & 0x1F
+        return np.stack(
+            [(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=-1
+        ).astype(np.float32)
+
+    @staticmethod
+    def _blocks(image):
+        height, width = image.shape[:2]
+        pad_y, pad_x = -height % 4, -width % 4
+        if pad_y or pad_x:
+            image = np.pad(image, ((0, pad_y), (0, pad_x), (0, 0)), mode="edge")
+        rows, cols = image.shape[0] // 4, image.shape[1] // 4
+        return (
+            image.reshape(rows, 4, cols, 4, 4)
+            .transpose(0, 2, 1, 3, 4)
+            .reshape(rows * cols, 16, 4)
+        )
+
+    @classmethod
+    def _encode_color_blocks(cls, rgb):
+        low = rgb.min(axis=1)
+        high = rgb.max(axis=1)
+        inset = (high - low) / 16
+        c0 = cls._to_565(np.clip(high - inset, 0, 255))
+        c1 = cls._to_565(np.clip(low + inset, 0, 255))
+
+        p0 = cls._from_565(c0)
+        p1 = cls._from_565(c1)
+        palette = np.stack([p0, p1, (2 * p0 + p1) / 3, (p0 + 2 * p1) / 3], axis=1)
+        distances = ((rgb[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=-1)
+        indices = distances.argmin(axis=-1).astype(np.uint32)
+        indices[c0 == c1] = 0
+
+        shifts = np.arange(16, dtype=np.uint32) * 2
+        bits = np.bitwise_or.reduce(indices << shifts, axis=1)
+
+        count = len(rgb)
+        return np.concatenate(
+            [
+                c0.astype("<u2").view(np.uint8).reshape(count, 2),
+                c1.astype("<u2").view(np.uint8).reshape(count, 2),
+                bits.astype("<u4").view(np.uint8).reshape(count, 4),
+            ],
+            axis=1,
+        )
+
+    @staticmethod
+    def _encode_alpha_blocks(alpha):
+        a0 = alpha.max(axis=1)
+        a1 = alpha.min(axis=1)
+
+        steps = np.arange(2, 8, dtype=np.float32)
+        interpolated = (
+            (8 - steps) * a0[:, None].astype(np.float32)
+            + (steps - 1) * a1[:, None].astype(np.float32)
+        ) / 7
+        palette = np.concatenate(
+            [a0[:, None], a1[:, None], np.rint(interpolated)], axis=1
+        ).astype(np.float32)
+
+        distances = np.abs(alpha[:, :, None].astype(np.float32) - palette[:, None, :])
+        indices = distances.argmin(axis=-1).astype(np.uint64)
+        indices[a0 == a1] = 0
+
+        shifts = np.arange(16, dtype=np.uint64) * 3
+        bits = np.bitwise_or.reduce(indices << shifts, axis=1)
+
+        count = len(alpha)
+        return np.concatenate(
+            [
+                a0.astype(np.uint8).reshape(count, 1),
+                a1.astype(np.uint8).reshape(count, 1),
+                bits.astype("<u8").view(np.uint8).reshape(count, 8)[:, :6],
+            ],
+            axis=1,
+        )
+
+    @classmethod
+    def encode_level(cls, image, fmt: str) -> bytes:
+        blocks = cls._blocks(image)
+        color = cls._encode_color_blocks(blocks[:, :, :3].astype(np.float32))
+        if fmt == "bc1":
+            return color.tobytes()
+        alpha = cls._encode_alpha_blocks(np.rint(blocks[:, :, 3]).astype(np.uint8))
+        return np.concatenate([alpha, color], axis=1).tobytes()
+
+    @staticmethod
+    def _downsample(image):
+        if image.shape[0] > 1:
+            image = (image[0::2] + image[1::2]) / 2
+        if image.shape[1] > 1:
+            image = (image[:, 0::2] + image[:, 1::2]) / 2
+        return image
+
+    @classmethod
+    def _header(cls, width: int, height: int, fmt: str, levels: int, top_size: int):
+        flags = (
+            cls.DDSD_CAPS
+            | cls.DDSD_HEIGHT
+            | cls.DDSD_WIDTH
+            | cls.DDSD_PIXELFORMAT
+            | cls.DDSD_LINEARSIZE
+        )
+        caps = cls.DDSCAPS_TEXTURE
+        if levels > 1:
+            flags |= cls.DDSD_MIPMAPCOUNT
+            caps |= cls.DDSCAPS_COMPLEX | cls.DDSCAPS_MIPMAP
+
+        return (
+            b"DDS "
+            + struct.pack("<7I", 124, flags, height, width, top_size, 0, levels)
+            + bytes(44)
+            + struct.pack(
+                "<2I4s5I", 32, cls.DDPF_FOURCC, cls.FOURCC[fmt], 0, 0, 0, 0, 0
+            )
+            + struct.pack("<5I", caps, 0, 0, 0, 0)
+        )
+
+    @classmethod
+    def encode_file(
+        cls, source: Path, output_dir: Path, fmt: str, flip: bool
+    ) -> Tuple[Optional[Path], str, int, List[str]]:
+        png = Png.decode(source.read_bytes())
+        width, height = png.width, png.height
+        if width % 4 or height % 4:
+            return None, fmt, 0, [f"{width}x{height} is not a multiple of 4; skipped."]
+
+        warnings = []
+        image = np.frombuffer(png.to_rgba(), dtype=np.uint8).reshape(height, width, 4)
+        if flip:
+            image = image[::-1]
+        if fmt == "auto":
+            fmt = "bc3" if (image[:, :, 3] < 255).any() else "bc1"
+
+        if cls._is_power_of_two(width) and cls._is_power_of_two(height):
+            levels = max(width, height).bit_length()
+        else:
+            levels = 1
+            warnings.append(
+                f"{width}x{height} is not a power of two; writing without mipmaps."
+            )
+
+        level_image = image.astype(np.float32)
+        data = []
+        for _ in range(levels):
+            data.append(cls.encode_level(level_image, fmt))
+            level_image = cls._downsample(level_image)
+
+        Fs.ensure_dir(output_dir)
+        output = output_dir / f"{source.stem}.dds"
+        header = cls._header(width, height, fmt, levels, len(data[0]))
+        output.write_bytes(header + b"".join(data))
+        return output, fmt, levels, warnings
+
+
+def _encode_dds_worker(
+    source: Path, output_dir: Path, fmt: str, flip: bool
+) -> Tuple[Optional[Path], str, int, List[str]]:
+    return DdsEncoder.encode_file(source, output_dir, fmt, flip)
+
+
+class ShaderAnalyzer:
+    SOURCE_DIR = utils.Paths.PROJECT / "Assets" / "Shaders"
+
+    PROGRAM_PATTERN = re.compile(
+        r"\b(CG|HLSL)(PROGRAM|INCLUDE)\b(.*?)\bEND(?:CG|HLSL)\b", re.S
+    )
+    COMMENT_PATTERN = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+    STATE_PATTERN = re.compile(
+        r"^\s*(Cull|ZWrite|ZTest|ZClip|Blend|BlendOp|ColorMask|Offset|AlphaToMask"
+        r"|Lighting|Conservative)\b([^\n]*)",
+        re.M | re.I,
+    )
+    FUNCTION_PATTERN = re.compile(
+        r"^[ \t]*(?:inline\s+)?[A-Za-z_]\w*\s+([A-Za-z_]\w*)\s*\([^;{)]*\)"
+        r"\s*(?::\s*\w+\s*)?\{",
+        re.M,
+    )
+    TOKEN_PATTERN = re.compile(
+        r"\d+\.?\d*(?:[eE][+-]?\d+)?[fhFH]?|\.\d+(?:[eE][+-]?\d+)?[fhFH]?"
+        r"|[A-Za-z_]\w*|\+\+|--|[+\-*/]=|&&|\|\||[<>=!]=|[^\s\w]"
+    )
+
+    DEFAULT_STATES = {
+        "cull": "back",
+        "zwrite": "on",
+        "ztest": "lequal",
+        "blend": "off",
+        "colormask": "rgba",
+        "lighting": "off",
+        "alphatomask": "off",
+    }
+
+    SAMPLE_FUNCTIONS = {
+        "tex2D",
+        "tex2Dlod",
+        "tex2Dbias",
+        "tex2Dgrad",
+        "tex2Dproj",
+        "tex3D",
+        "texCUBE",
+        "texCUBElod",
+        "SAMPLE_TEXTURE2D",
+        "SAMPLE_TEXTURE2D_LOD",
+        "Sample",
+        "SampleLevel",
+        "SampleBias",
+        "SampleGrad",
+        "Load",
+    }
+    INTRINSICS = set(
+        "abs acos asin atan atan2 ceil clamp cos cross ddx ddy degrees distance dot "
+        "exp exp2 floor fmod frac fwidth length lerp log log2 mad max min mul "
+        "normalize pow radians reflect refract round rsqrt saturate sign sin "
+        "smoothstep sqrt step tan".split()
+    )
+    BRANCH_KEYWORDS = {"if", "for", "while", "switch"}
+    BUILTIN_VARIANTS = {
+        "multi_compile_instancing": 2,
+        "multi_compile_fog": 4,
+        "multi_compile_particles": 2,
+        "multi_compile_fwdbase": 16,
+        "multi_compile_shadowcaster": 2,
+    }
+    METRICS = (
+        "samples",
+        "alu",
+        "branches",
+        "discards",
+        "vertex_alu",
+        "variants",
+        "states",
+    )
+
+    @classmethod
+    def find_shaders(cls) -> List[Path]:
+        return sorted(cls.SOURCE_DIR.glob("**/*.shader"))
+
+    @staticmethod
+    def _block_end(text: str, open_brace: int) -> int:
+        depth = 0
+        for i in range(open_brace, len(text)):
+            if text[i] == "{":
+                depth += 1
+            elif text[i] == "}":
+                depth -= 1
+                if depth == 0:
+                    return i
+        raise ValueError("Unbalanced braces.")
+
+    @classmethod
+    def _blocks(cls, text: str, keyword: str) -> List[Tuple[int, int]]:
+        blocks = []
+        for match in re.finditer(rf"\b{keyword}\s*\{{", text):
+            start = match.end() - 1
+            end = cls._block_end(text, start)
+            if not any(s <= start <= e for s, e in blocks):
+                blocks.append((start, end))
+        return blocks
+
+    @classmethod
+    def _states(cls, text: str) -> Dict[str, str]:
+        states = {}
+        for command, value in cls.STATE_PATTERN.findall(text):
+            states[command.lower()] = " ".join(value.split()).lower()
+        if re.search(r"\bStencil\s*\{", text):
+            states["stencil"] = "custom"
+        return states
+
+    @classmethod
+    def _variants(cls, program: str) -> int:
+        total = 1
+        for directive, options in re.findall(
+            r"#pragma\s+((?:multi_compile|shader_feature)\w*)([^\n]*)", program
+        ):
+            if directive in cls.BUILTIN_VARIANTS:
+                total *= cls.BUILTIN_VARIANTS[directive]
+                continue
+            keywords = options.split()
+            if directive.startswith("shader_feature") and len(keywords) == 1:
+                total *= 2
+            else:
+                total *= max(len(keywords), 1)
+        return total
+
+    @classmethod
+    def _functions(cls, program: str) -> Dict[str, str]:
+        code = "\n".join(
+            line for line in program.splitlines() if not line.lstrip().startswith("#")
+        )
+        functions = {}
+        for match in cls.FUNCTION_PATTERN.finditer(code):
+            start = match.end() - 1
+            end = cls._block_end(code, start)
+            functions[match.group(1)] = code[start + 1 : end]
+        return functions
+
+    @classmethod
+    def _function_cost(
+        cls, body: str, known: set
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        cost = {"samples": 0, "alu": 0, "branches": 0, "discards": 0}
+        calls: Dict[str, int] = {}
+        tokens = cls.TOKEN_PATTERN.findall(body)
+
+        for i, token in enumerate(tokens):
+            prev = tokens[i - 1] if i > 0 else ";"
+            following = tokens[i + 1] if i + 1 < len(tokens) else ""
+
+            if following == "(" and (token[0].isalpha() or token[0] == "_"):
+                if token in cls.BRANCH_KEYWORDS:
+                    cost["branches"] += 1
+                elif token in cls.SAMPLE_FUNCTIONS:
+                    cost["samples"] += 1
+                elif token == "clip":
+                    cost["discards"] += 1
+                    cost["branches"] += 1
+                elif token in cls.INTRINSICS:
+                    cost["alu"] += 1
+                elif token in known:
+                    calls[token] = calls.get(token, 0) + 1
+            elif token == "discard":
+                cost["discards"] += 1
+            elif token == "?":
+                cost["branches"] += 1
+            elif token in ("+", "-"):
+                if prev not in ("(", ",", "=", "return", "?", ":", ";", "{") and not (
+                    prev in "+-*/<>!" or prev.endswith("=")
+                ):
+                    cost["alu"] += 1
+            elif token in (
+                "*",
+                "/",
+                "+=",
+                "-=",
+                "*=",
+                "/=",
+                "<",
+                ">",
+                "<=",
+                ">=",
+                "==",
+                "!=",
+            ):
+                cost["alu"] += 1
+
+        return cost, calls
+
+    @classmethod
+    def _entry_cost(cls, name: str, functions: Dict[str, str]) -> Dict[str, int]:
+        parsed = {
+            fn: cls._function_cost(body, set(functions))
+            for fn, body in functions.items()
+        }
+        memo: Dict[str, Dict[str, int]] = {}
+
+        def resolve(fn: str, stack: Tuple[str, ...]) -> Dict[str, int]:
+            if fn in memo:
+                return memo[fn]
+            own, calls = parsed[fn]
+            total = dict(own)
+            for callee, count in calls.items():
+                if callee in stack:
+                    continue
+                callee_cost = resolve(callee, stack + (callee,))
+                for key, value in callee_cost.items():
+                    total[key] += value * count
+            memo[fn] = total
+            return total
+
+        if name not in parsed:
+            return {"samples": 0, "alu": 0, "branches": 0, "discards": 0}
+        return resolve(name, (name,))
+
+    @classmethod
+    def analyze(cls, path: Path) -> Dict[str, Dict[str, int]]:
+        text = path.read_text(encoding="utf-8")
+
+        programs: List[str] = []
+        includes: List[str] = []
+
+        def extract(match: re.Match) -> str:
+            if match.group(2) == "INCLUDE":
+                includes.append(cls.COMMENT_PATTERN.sub("", match.group(3)))
+                return ""
+            programs.append(cls.COMMENT_PATTERN.sub("", match.group(3)))
+            return f"__PROGRAM_{len(programs) - 1}__"
+
+        shaderlab = cls.COMMENT_PATTERN.sub("", cls.PROGRAM_PATTERN.sub(extract, text))
+        name_match = re.search(r'\bShader\s+"([^"]+)"', shaderlab)
+        shader_name = name_match.group(1) if name_match else path.stem
+        shared = "\n".join(includes)
+
+        results = {}
+        for sub_index, (sub_start, sub_end) in enumerate(
+            cls._blocks(shaderlab, "SubShader")
+        ):
+            subshader = shaderlab[sub_start + 1 : sub_end]
+            passes = cls._blocks(subshader, "Pass")
+
+            outer = subshader
+            for start, end in reversed(passes):
+                outer = outer[:start] + outer[end + 1 :]
+            outer = re.sub(r"\bTags\s*\{[^}]*\}", "", outer)
+            sub_states = cls._states(outer)
+
+            for pass_index, (start, end) in enumerate(passes):
+                body = subshader[start + 1 : end]
+                states = dict(sub_states)
+                states.update(cls._states(re.sub(r"\bTags\s*\{[^}]*\}", "", body)))
+                changes = sum(
+                    1
+                    for key, value in states.items()
+                    if cls.DEFAULT_STATES.get(key) != value
+                )
+
+                program_match = re.search(r"__PROGRAM_(\d+)__", body)
+                program = (
+                    shared + "\n" + programs[int(program_match.group(1))]
+                    if program_match
+                    else ""
+                )
+                pass_name = re.search(r'\bName\s+"([^"]+)"', body)
+                label = pass_name.group(1) if pass_name else f"{sub_index}.{pass_index}"
+
+                functions = cls._functions(program)
+                fragment = re.search(r"#pragma\s+fragment\s+(\w+)", program)
+                vertex = re.search(r"#pragma\s+vertex\s+(\w+)", program)
+                stats = (
+                    cls._entry_cost(fragment.group(1), functions)
+                    if fragment
+                    else {"samples": 0, "alu": 0, "branches": 0, "discards": 0}
+                )
+                vertex_stats = (
+                    cls._entry_cost(vertex.group(1), functions) if vertex else {}
+                )
+                stats["vertex_alu"] = vertex_stats.get("alu", 0)
+                stats["variants"] = cls._variants(program)
+                stats["states"] = changes
+
+                results[f"{shader_name}/{label}"] = stats
+        return results
+
+
+class ShaderStatsHistory:
+    HISTORY_FILE = utils.Paths.CACHE / "shader_stats_history.json"
+    MAX_ENTRIES = 200
+
+    @classmethod
+    def load(cls) -> List[Dict]:
+        if not cls.HISTORY_FILE.exists():
+            return []
+        try:
+            with open(cls.HISTORY_FILE, "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", [])
+        except (OSError, json.JSONDecodeError, AttributeError):
+            UI.warn(f"Ignoring unreadable shader history at '{cls.HISTORY_FILE}'.")
+            return []
+
+    @classmethod
+    def record(cls, stats: Dict[str, Dict[str, int]]) -> None:
+        entries = cls.load()
+        revision = utils.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=utils.Paths.PROJECT,
+            capture=True,
+            check=False,
+        ).stdout
+        entries.append(
+            {
+                "timestamp": int(time.time()),
+                "revision": (revision or "").strip() or None,
+                "passes": stats,
+            }
+        )
+        Fs.ensure_dir(cls.HISTORY_FILE.parent)
+        with open(cls.HISTORY_FILE, "w", encoding="utf-8") as f:
+            json.dump({"entries": entries[-cls.MAX_ENTRIES :]}, f, indent=2)
+
+    @classmethod
+    def regressions(
+        cls, stats: Dict[str, Dict[str, int]], tolerance: float
+    ) -> List[str]:
+        entries = cls.load()
+        if not entries:
+            return []
+        baseline = entries[-1]["passes"]
+
+        found = []
+        for key, metrics in stats.items():
+            previous = baseline.get(key)
+            if previous is None:
+                continue
+            for metric, value in metrics.items():
+                old = previous.get(metric, 0)
+                if value > old * (1 + tolerance):
+                    found.append(f"{key}: {metric} {old} -> {value}")
+        return found
+
+
+def collect_shader_stats() -> Dict[str, Dict[str, int]]:
+    stats = {}
+    for path in ShaderAnalyzer.find_shaders():
+        try:
+            stats.update(ShaderAnalyzer.analyze(path))
+        except (OSError, ValueError) as e:
+            UI.warn(f"Could not analyze '{path.name}': {e}")
+    return stats
+
+
 class AssetCleaner:
     @staticmethod
     def _is_unity_bundle(file_path: Path) -> bool:
@@ -150,7 +1614,7 @@ class AssetCleaner:
 
     @classmethod
     def clean_cache(cls):
-        cache_dir = utils.Paths.BUILD / "cache" / "unity-project"
+        cache_dir = AssetConfig.get_temp_project_root()
         if cache_dir.exists():
             with UI.spin(f"Cleaning build cache at '{cache_dir}'..."):
                 shutil.rmtree(cache_dir)
@@ -187,14 +1651,41 @@ class AssetCleaner:
 
 def run_build(args):
     bundles = AssetConfig.get_bundle_names()
+
+    regressions = ShaderStatsHistory.regressions(collect_shader_stats(), 0.0)
+    for regression in regressions:
+        UI.warn(
+            f"Shader cost regression: {regression}",
+            hint="Run 'python Scripts/assets.py shader-stats' for details",
+        )
+
     UI.header("Starting Asset Bundle Build")
 
+    project = UnityProjectPool.acquire(AssetConfig.get_unity_version(), args.target)
+    UI.info(f"Temp project: {project}")
+
     for bundle in bundles:
-        AbbTool.build(bundle)
+        AbbTool.build(bundle, project, args.target)
 
+    UnityProjectPool.prune(args.cache_limit, keep=project)
     UI.success("All bundles built successfully.")
 
 
+def run_warm(args):
+    bundles = AssetConfig.get_bundle_names()
+    UI.header("Warming Unity Temp Project")
+
+    project = UnityProjectPool.acquire(AssetConfig.get_unity_version(), args.target)
+    UI.info(f"Temp project: {project}")
+
+    with tempfile.TemporaryDirectory(prefix="microtools-warm-") as scratch:
+        for bundle in bundles:
+            AbbTool.build(bundle, project, args.target, Path(scratch))
+
+    UnityProjectPool.prune(args.cache_limit, keep=project)
+    UI.success("Temp project is warm.")
+
+
 def run_clean(args):
     if not any([args.bundles, args.cache, args.manifests, args.meta, args.all]):
         UI.error(
@@ -220,15 +1711,206 @@ def run_clean(args):
     UI.success("Cleanup finished.")
 
 
+def run_inspect(args):
+    paths = (
+        [Path(p) for p in args.files] if args.files else BundleInspector.find_bundles()
+    )
+    if not paths:
+        UI.error("No asset bundles found.", hint="Run 'python Scripts/assets.py build'")
+        sys.exit(1)
+
+    bundles = []
+    for path in paths:
+        try:
+            bundle = UnityBundle.load(path)
+        except (OSError, ValueError, struct.error, lzma.LZMAError) as e:
+            UI.error(f"Failed to read '{path}': {e}")
+            sys.exit(1)
+        BundleInspector.report(bundle)
+        bundles.append(bundle)
+
+    UI.header("Bundle Checks")
+    targets_ok = BundleInspector.check_targets(bundles)
+    budget_ok = BundleInspector.check_budget(bundles, args.budget)
+
+    if not (targets_ok and budget_ok):
+        sys.exit(1)
+
+
+def run_textures(args):
+    files = (
+        [Path(p) for p in args.files]
+        if args.files
+        else TextureOptimizer.find_textures()
+    )
+    if not files:
+        UI.info("No textures found.")
+        return
+
+    UI.header("Optimizing Textures")
+    CacheIndex.touch(TextureOptimizer.CACHE_DIR)
+
+    total_before = total_after = 0
+    failed = False
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(_optimize_texture_worker, path, args.dry_run): path
+            for path in files
+        }
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            name = path.relative_to(utils.Paths.PROJECT) if path.is_absolute() else path
+            try:
+                before, after, cached = future.result()
+            except (OSError, ValueError, zlib.error) as e:
+                UI.error(f"{name}: {e}")
+                failed = True
+                continue
+
+            total_before += before
+            total_after += after
+            note = " (cached)" if cached else ""
+            if after < before:
+                UI.success(f"{name}: {before} -> {after} bytes{note}")
+            else:
+                UI.info(f"{name}: already optimal{note}")
+
+    saved = total_before - total_after
+    verb = "Would save" if args.dry_run else "Saved"
+    UI.success(f"{verb} {saved} bytes across {len(files)} file(s).")
+
+    if args.atlas:
+        sources = sorted(
+            f for f in files if fnmatch.fnmatch(f.name, TextureOptimizer.ATLAS_PATTERN)
+        )
+        if not sources:
+            UI.warn("No overlay sprites found for the atlas.")
+        else:
+            with UI.spin(f"Packing {len(sources)} sprite(s) into an atlas..."):
+                atlas_path, metadata_path = TextureOptimizer.pack_atlas(
+                    sources, Path(args.atlas_dir)
+                )
+            UI.info(f"Atlas: {atlas_path}")
+            UI.info(f"UV metadata: {metadata_path}")
+
+    if failed:
+        sys.exit(1)
+
+
+def run_dds(args):
+    if np is None:
+        UI.error(
+            "NumPy is required for DDS conversion.",
+            hint="Run 'python Scripts/setup.py setup assets'",
+        )
+        sys.exit(1)
+
+    sources = (
+        [Path(p) for p in args.files]
+        if args.files
+        else sorted(DdsEncoder.SOURCE_DIR.glob("*.png"))
+    )
+    if not sources:
+        UI.info("No source textures found.")
+        return
+
+    output_dir = Path(args.output) if args.output else DdsEncoder.OUTPUT_DIR
+    UI.header("Converting Textures to DDS")
+
+    failed = False
+    skipped = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(
+                _encode_dds_worker, source, output_dir, args.format, args.flip
+            ): source
+            for source in sources
+        }
+        for future in concurrent.futures.as_completed(futures):
+            source = futures[future]
+            try:
+                output, fmt, levels, warnings = future.result()
+            except (OSError, ValueError, zlib.error) as e:
+                UI.error(f"{source.name}: {e}")
+                failed = True
+                continue
+
+            for warning in warnings:
+                UI.warn(f"{source.name}: {warning}")
+            if output is None:
+                skipped += 1
+                continue
+            UI.success(
+                f"{source.name} -> {output.name} ({fmt.upper()}, {levels} mip level(s))"
+            )
+
+    if failed:
+        UI.error("Some textures could not be converted.")
+        sys.exit(1)
+    UI.success(f"Converted {len(sources) - skipped} texture(s), skipped {skipped}.")
+
+
+def run_shader_stats(args):
+    stats = collect_shader_stats()
+    if not stats:
+        UI.info("No shaders found.")
+        return
+
+    UI.header("Shader Cost Estimate")
+    columns = ShaderAnalyzer.METRICS
+    width = max(len(key) for key in stats)
+    UI.print_line(f"{'pass':<{width}}  " + "  ".join(f"{c:>10}" for c in columns))
+    for key, metrics in sorted(stats.items()):
+        UI.print_line(
+            f"{key:<{width}}  " + "  ".join(f"{metrics[c]:>10}" for c in columns)
+        )
+
+    regressions = ShaderStatsHistory.regressions(stats, args.tolerance / 100)
+    for regression in regressions:
+        UI.warn(f"Regression: {regression}")
+
+    if args.record:
+        ShaderStatsHistory.record(stats)
+        UI.success(f"Recorded stats in '{ShaderStatsHistory.HISTORY_FILE}'.")
+    elif regressions:
+        UI.error(
+            f"{len(regressions)} shader cost regression(s) found.",
+            hint="Use --record to accept the new numbers as the baseline",
+        )
+        sys.exit(1)
+    else:
+        UI.success("No shader cost regressions.")
+
+
 def main():
     setup.Runtime.enforce_venv()
 
     parser = argparse.ArgumentParser(description="Manage Microtools assets")
     subparsers = parser.add_subparsers(dest="command", metavar="", required=True)
 
-    build_parser = subparsers.add_parser("build", help="Build asset bundles")
+    pool_parser = argparse.ArgumentParser(add_help=False)
+    pool_parser.add_argument(
+        "--target",
+        choices=["windows", "mac", "linux"],
+        help="Build a single target with its own temp project (default: all)",
+    )
+    pool_parser.add_argument(
+        "--cache-limit",
+        type=int,
+        default=UnityProjectPool.DEFAULT_MAX_BYTES,
+        help="Size cap in bytes for all pooled temp projects",
+    )
+
+    build_parser = subparsers.add_parser(
+        "build", parents=[pool_parser], help="Build asset bundles"
+    )
     build_parser.set_defaults(func=run_build)
 
+    warm_parser = subparsers.add_parser(
+        "warm", parents=[pool_parser], help="Pre-import the Unity temp project"
+    )
+    warm_parser.set_defaults(func=run_warm)
+
     clean_parser = subparsers.add_parser("clean", help="Clean asset artifacts")
     clean_parser.add_argument(
         "--bundles", action="store_true", help="Remove compiled bundles"
@@ -241,6 +1923,79 @@ def main():
     clean_parser.add_argument("--all", action="store_true", help="Clean everything")
     clean_parser.set_defaults(func=run_clean)
 
+    inspect_parser = subparsers.add_parser(
+        "inspect", help="Inspect bundle contents and check size budgets"
+    )
+    inspect_parser.add_argument(
+        "files", nargs="*", help="Bundle files (default: all in output directory)"
+    )
+    inspect_parser.add_argument(
+        "--budget",
+        type=int,
+        default=BundleInspector.DEFAULT_BUDGET,
+        help=f"Maximum size per bundle in bytes (default: {BundleInspector.DEFAULT_BUDGET})",
+    )
+    inspect_parser.set_defaults(func=run_inspect)
+
+    textures_parser = subparsers.add_parser(
+        "textures", help="Losslessly recompress PNG textures"
+    )
+    textures_parser.add_argument(
+        "files", nargs="*", help="PNG files (default: mod textures and About images)"
+    )
+    textures_parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Number of worker processes"
+    )
+    textures_parser.add_argument(
+        "--dry-run", action="store_true", help="Report savings without writing files"
+    )
+    textures_parser.add_argument(
+        "--atlas", action="store_true", help="Pack overlay sprites into an atlas"
+    )
+    textures_parser.add_argument(
+        "--atlas-dir",
+        default=str(utils.Paths.BUILD / "atlas"),
+        help="Output directory for the atlas and its UV metadata",
+    )
+    textures_parser.set_defaults(func=run_textures)
+
+    dds_parser = subparsers.add_parser(
+        "dds", help="Convert source textures to block-compressed DDS"
+    )
+    dds_parser.add_argument(
+        "files", nargs="*", help="PNG files (default: Assets/Textures/*.png)"
+    )
+    dds_parser.add_argument(
+        "--format",
+        choices=["auto", "bc1", "bc3"],
+        default="auto",
+        help="Block format; auto picks BC3 for textures with alpha (default: auto)",
+    )
+    dds_parser.add_argument(
+        "--flip", action="store_true", help="Flip rows vertically before encoding"
+    )
+    dds_parser.add_argument(
+        "-o", "--output", help="Output directory (default: Mods/Microtools/Textures)"
+    )
+    dds_parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Number of worker processes"
+    )
+    dds_parser.set_defaults(func=run_dds)
+
+    shader_stats_parser = subparsers.add_parser(
+        "shader-stats", help="Estimate shader costs and flag regressions"
+    )
+    shader_stats_parser.add_argument(
+        "--record", action="store_true", help="Append the current stats to history"
+    )
+    shader_stats_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.0,
+        help="Allowed increase per metric in percent (default: 0)",
+    )
+    shader_stats_parser.set_defaults(func=run_shader_stats)
+
     if len(sys.argv) == 1:
         parser.print_help(sys.stderr)
         sys.exit(1)
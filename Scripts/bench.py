@@ -0,0 +1,296 @@
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import setup
+
+setup.Runtime.enforce_venv()
+
+import perf
+import rw_find
+import rw_launch
+import rw_log
+import utils
+from utils import UI
+
+ASSEMBLY_DIR = utils.Paths.PROJECT / "Mods" / "Microtools" / "1.6" / "Assemblies"
+ASSEMBLY = ASSEMBLY_DIR / "Microtools.dll"
+
+
+class BuildFingerprint:
+    @staticmethod
+    def _git(*args: str) -> str:
+        try:
+            result = utils.run(
+                ["git", *args], cwd=utils.Paths.PROJECT, capture=True, timeout=30
+            )
+            return result.stdout.strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return ""
+
+    @classmethod
+    def collect(cls, game_directory: Path) -> dict:
+        if not ASSEMBLY.is_file():
+            raise RuntimeError(f"{ASSEMBLY.name} not found. Build it first.")
+
+        pdb = ASSEMBLY.with_suffix(".pdb")
+        try:
+            game_version = (game_directory / "Version.txt").read_text().strip()
+        except OSError:
+            game_version = ""
+
+        return {
+            "assembly": hashlib.blake2b(
+                ASSEMBLY.read_bytes(), digest_size=16
+            ).hexdigest(),
+            "config": (
+                "Debug"
+                if pdb.is_file() and pdb.stat().st_mtime >= ASSEMBLY.stat().st_mtime - 5
+                else "Release"
+            ),
+            "commit": cls._git("rev-parse", "HEAD"),
+            "dirty": bool(cls._git("status", "--porcelain", "--", "Source")),
+            "game_version": game_version,
+        }
+
+
+class ScenarioBench:
+    OUTPUT_DIR = utils.Paths.BUILD / "bench"
+    DATA_DIR = OUTPUT_DIR / "scenario-data"
+    TEMPLATE_DIRS = ["Config"]
+    RESULT_FILE = "MicrotoolsBenchmark.json"
+
+    def __init__(self, args):
+        self.args = args
+        self.info = rw_find.find_installation(args.install)
+        if not self.info:
+            raise RuntimeError("RimWorld installation not found.")
+        self.template = args.template or rw_log.save_data_folder()
+        self.save_name, self.save_path = self._resolve_save(args.save)
+
+    def _resolve_save(self, save: str) -> tuple[str, Path]:
+        path = Path(save)
+        if path.suffix != ".rws":
+            path = self.template / "Saves" / f"{save}.rws"
+        if not path.is_file():
+            raise FileNotFoundError(f"Save not found: {path}")
+        return path.stem, path
+
+    def prepare(self) -> None:
+        for name in self.TEMPLATE_DIRS:
+            source, target = self.template / name, self.DATA_DIR / name
+            if source.is_dir():
+                shutil.copytree(source, target, dirs_exist_ok=True)
+        saves = self.DATA_DIR / "Saves"
+        utils.Fs.ensure_dir(saves)
+        shutil.copy2(self.save_path, saves / f"{self.save_name}.rws")
+
+    def _run_once(self, index: int) -> dict:
+        result_path = self.DATA_DIR / self.RESULT_FILE
+        perf_path = self.DATA_DIR / perf.PERF_FILE
+        result_path.unlink(missing_ok=True)
+        perf_path.unlink(missing_ok=True)
+
+        rw_launch.find_and_kill(self.info["executable"])
+        process = rw_launch.launch(
+            Path(self.info["directory"]),
+            self.info["executable"],
+            [
+                f"-savedatafolder={self.DATA_DIR}",
+                "-logfile",
+                str(self.OUTPUT_DIR / f"scenario-{index + 1}.log"),
+                f"-microtoolsBenchmark={self.save_name}",
+                f"-microtoolsBenchmarkSeconds={self.args.seconds}",
+                f"-microtoolsBenchmarkThings={self.args.things}",
+                f"-microtoolsBenchmarkOut={result_path}",
+            ],
+        )
+        try:
+            process.wait(timeout=self.args.timeout)
+        except subprocess.TimeoutExpired:
+            rw_launch.StartupBench._stop(process)
+            raise RuntimeError(
+                f"Run {index + 1} did not finish within {self.args.timeout}s "
+                "(is the Debug build linked?)."
+            )
+
+        try:
+            result = json.loads(result_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Run {index + 1} produced no results: {e}")
+        if "error" in result:
+            raise RuntimeError(f"Run {index + 1} failed: {result['error']}")
+
+        if perf_path.is_file():
+            sessions = perf.PerfLog.sessions(perf_path)
+            result["scopes"] = perf.PerfStats.summarize(perf.PerfStats.merge(sessions))
+        return result
+
+    def run(self) -> list[dict]:
+        utils.Fs.ensure_dir(self.OUTPUT_DIR)
+        self.prepare()
+        runs = []
+        for index in range(self.args.runs):
+            with UI.spin(f"Run {index + 1}/{self.args.runs}..."):
+                runs.append(self._run_once(index))
+            UI.info(
+                ", ".join(
+                    f"{phase} {sum(frames) / max(len(frames), 1):.2f}ms"
+                    for phase, frames in runs[-1]["phases"].items()
+                )
+            )
+        return runs
+
+    @staticmethod
+    def summarize(runs: list[dict]) -> dict[str, dict]:
+        phases: dict[str, list[float]] = {}
+        for run in runs:
+            for phase, frames in run["phases"].items():
+                phases.setdefault(phase, []).extend(frames)
+
+        summary = {}
+        for phase, frames in phases.items():
+            if not frames:
+                continue
+            percentile = rw_launch.StartupBench.percentile
+            summary[phase] = {
+                "frames": len(frames),
+                "mean": sum(frames) / len(frames),
+                "p50": percentile(frames, 0.50),
+                "p95": percentile(frames, 0.95),
+                "p99": percentile(frames, 0.99),
+                "max": max(frames),
+            }
+        return summary
+
+    def report(self, runs: list[dict], fingerprint: dict) -> Path:
+        summary = self.summarize(runs)
+        UI.header(f"Scenario frame times: {self.save_name} ({len(runs)} runs)")
+        UI.print_line(
+            f"{'phase':<12} {'frames':>8} {'mean':>8} {'p50':>8} "
+            f"{'p95':>8} {'p99':>8} {'max':>8}"
+        )
+        for phase, s in summary.items():
+            UI.print_line(
+                f"{phase:<12} {s['frames']:>8} {s['mean']:>8.2f} {s['p50']:>8.2f} "
+                f"{s['p95']:>8.2f} {s['p99']:>8.2f} {s['max']:>8.2f}"
+            )
+        UI.print_line(
+            f"{utils.Colors.DIM}All times in milliseconds.{utils.Colors.RESET}"
+        )
+
+        scopes = [run["scopes"] for run in runs if run.get("scopes")]
+        if scopes:
+            perf.print_report(scopes[-1], f"last run, {len(scopes)} with counters")
+
+        output = (
+            self.OUTPUT_DIR
+            / f"scenario-{self.save_name}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        output.write_text(
+            json.dumps(
+                {
+                    "fingerprint": fingerprint,
+                    "save": self.save_name,
+                    "seconds": self.args.seconds,
+                    "things": self.args.things,
+                    "summary": summary,
+                    "runs": runs,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        return output
+
+
+def run_bench(args) -> None:
+    if args.runs < 1:
+        raise RuntimeError("--runs must be at least 1.")
+
+    bench = ScenarioBench(args)
+    fingerprint = BuildFingerprint.collect(Path(bench.info["directory"]))
+    if fingerprint["config"] != "Debug":
+        UI.warn(
+            "Microtools.dll looks like a Release build; the benchmark runner is "
+            "Debug-only.",
+            hint="Run: python Scripts/dev.py --config Debug",
+        )
+    UI.info(
+        f"Build {fingerprint['assembly'][:12]} ({fingerprint['config']}) at "
+        f"{fingerprint['commit'][:10] or 'unknown commit'}"
+        f"{' (dirty)' if fingerprint['dirty'] else ''}"
+    )
+
+    output = bench.report(bench.run(), fingerprint)
+    UI.success(f"Results written to {output}")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the in-game DirectHaul/StorageLens scenario benchmark"
+    )
+    parser.add_argument(
+        "save", help="Save name in the template's Saves folder, or a .rws path"
+    )
+    parser.add_argument(
+        "--install",
+        help="Registered installation name (see 'rw_find.py list')",
+    )
+    parser.add_argument(
+        "--template",
+        type=Path,
+        help="Save data folder to copy Config and saves from (default: the game's)",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Iterations to run (default: 3)"
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=30,
+        help="Duration of each scripted phase in seconds (default: 30)",
+    )
+    parser.add_argument(
+        "--things",
+        type=int,
+        default=2000,
+        help="Things to select for placement previews (default: 2000)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600,
+        help="Seconds to wait for a run to finish (default: 600)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    env = setup.Environment(setup.MANIFEST)
+    if not env.manifest["launch"].check():
+        UI.error(
+            "'launch' environment is not configured.",
+            hint="Run: python Scripts/setup.py setup launch",
+        )
+        sys.exit(1)
+
+    args = _parse_args()
+    try:
+        run_bench(args)
+    except (RuntimeError, FileNotFoundError) as e:
+        UI.error(f"Fatal error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        UI.error("Cancelled by user.")
+        sys.exit(130)
@@ -0,0 +1,210 @@
+import argparse
+import concurrent.futures
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import setup
+
+setup.Runtime.enforce_venv()
+
+import assets
+import build
+import rw_find
+import rw_launch
+import rw_link
+import utils
+from utils import UI
+
+PROJECT_FILE = utils.Paths.PROJECT / "Source" / "Microtools.csproj"
+MODS_SOURCE = utils.Paths.PROJECT / "Mods"
+ASSEMBLY = MODS_SOURCE / "Microtools" / "1.6" / "Assemblies" / "Microtools.dll"
+
+
+class StageTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: list[tuple[str, float, float]] = []
+
+    def run(self, name: str, func, *args):
+        begin = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.stages.append((name, begin - self.start, time.perf_counter() - begin))
+
+    def report(self) -> None:
+        total = time.perf_counter() - self.start
+        UI.header(f"Dev loop finished in {total:.2f}s")
+        UI.print_line(f"{'stage':<12} {'start':>8} {'duration':>9}")
+        for name, offset, duration in sorted(self.stages, key=lambda s: s[1]):
+            UI.print_line(f"{name:<12} {offset:>7.2f}s {duration:>8.2f}s")
+
+
+def _shutdown_game(executable: str) -> int:
+    return rw_launch.find_and_kill(executable)
+
+
+def _build_assembly(config: str) -> None:
+    cmd = [
+        "dotnet",
+        "build",
+        str(PROJECT_FILE),
+        "-c",
+        config,
+        "/property:GenerateFullPaths=true",
+        "/consoleloggerparameters:NoSummary;ForceNoAlign",
+    ]
+    try:
+        utils.run(cmd, capture=True)
+    except subprocess.CalledProcessError as e:
+        for line in build._parse_dotnet_errors(e.stdout) + build._parse_dotnet_errors(
+            e.stderr
+        ):
+            UI.print_line(f"{utils.Colors.RED}{line.strip()}{utils.Colors.RESET}")
+        raise RuntimeError(f"Build failed ({config}).") from e
+
+
+def _check_shaders() -> list[str]:
+    return assets.ShaderStatsHistory.regressions(assets.collect_shader_stats(), 0.0)
+
+
+def _ensure_deployed(target_root: Path) -> None:
+    rw_link.deploy_mods(MODS_SOURCE, target_root)
+    if not rw_link.is_deployed(MODS_SOURCE, target_root):
+        raise RuntimeError(f"Could not deploy mods into {target_root}.")
+
+
+def _assembly_mtime() -> float:
+    try:
+        return ASSEMBLY.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def run_dev(args) -> None:
+    timer = StageTimer()
+
+    info = rw_find.find_installation(args.install)
+    if not info:
+        raise RuntimeError("RimWorld installation not found.")
+
+    previous_assembly = _assembly_mtime()
+
+    UI.step("Stopping game, building and checking shaders in parallel...")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as pool:
+        shutdown = pool.submit(
+            timer.run, "shutdown", _shutdown_game, info["executable"]
+        )
+        compiled = pool.submit(timer.run, "build", _build_assembly, args.config)
+        shaders = (
+            None
+            if args.skip_shaders
+            else pool.submit(timer.run, "shaders", _check_shaders)
+        )
+
+        stopped = shutdown.result()
+        UI.info(f"Stopped {stopped} running instance(s).")
+
+        compiled.result()
+        if _assembly_mtime() > previous_assembly:
+            UI.success(f"Built {ASSEMBLY.name} ({args.config}).")
+        else:
+            UI.info(f"{ASSEMBLY.name} is up to date.")
+
+        timer.run("deploy", _ensure_deployed, Path(info["mods"]))
+        UI.success("Mods are deployed.")
+
+        if shaders is not None:
+            for regression in shaders.result():
+                UI.warn(
+                    f"Shader cost regression: {regression}",
+                    hint="Run 'python Scripts/assets.py shader-stats' for details",
+                )
+
+    process = timer.run(
+        "launch",
+        rw_launch.launch,
+        Path(info["directory"]),
+        info["executable"],
+    )
+    UI.success(f"Process started (PID: {process.pid}).")
+
+    if not args.no_manage_window:
+        timer.run(
+            "window",
+            rw_launch.position_on_monitor,
+            process,
+            args.monitor,
+            not args.no_maximize,
+        )
+        UI.success("Window positioned.")
+
+    timer.report()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rebuild Microtools and restart RimWorld in one step"
+    )
+    parser.add_argument(
+        "--install",
+        help="Registered installation name (see 'rw_find.py list')",
+    )
+    parser.add_argument(
+        "--config",
+        "-c",
+        choices=["Debug", "Release"],
+        default="Debug",
+        help="Build configuration (default: Debug)",
+    )
+    parser.add_argument(
+        "--skip-shaders",
+        action="store_true",
+        help="Skip the shader cost regression check",
+    )
+    parser.add_argument(
+        "-m",
+        "--monitor",
+        type=int,
+        default=0,
+        help="Monitor index for window placement",
+    )
+    parser.add_argument(
+        "--no-manage-window",
+        action="store_true",
+        help="Skip window positioning",
+    )
+    parser.add_argument(
+        "--no-maximize",
+        action="store_true",
+        help="Position window without maximizing",
+    )
+    return parser.parse_args()
+
+
+def main():
+    env = setup.Environment(setup.MANIFEST)
+    for component in ["launch", "build"]:
+        if not env.manifest[component].check():
+            UI.error(
+                f"'{component}' environment is not configured.",
+                hint=f"Run: python Scripts/setup.py setup {component}",
+            )
+            sys.exit(1)
+
+    args = _parse_args()
+    try:
+        run_dev(args)
+    except (RuntimeError, FileNotFoundError) as e:
+        UI.error(f"Fatal error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        UI.error("Cancelled by user.")
+        sys.exit(130)
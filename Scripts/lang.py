@@ -0,0 +1,583 @@
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from collections import Counter
+from pathlib import Path
+
+import setup
+import utils
+from utils import UI, Colors, Fs
+
+MOD_VERSION_DIR = utils.Paths.PROJECT / "Mods" / "Microtools" / "1.6"
+LANGUAGES_DIR = MOD_VERSION_DIR / "Languages"
+DEFS_DIR = MOD_VERSION_DIR / "Defs"
+SOURCE_DIR = utils.Paths.PROJECT / "Source"
+KEY_PREFIX = "Microtools."
+REFERENCE_LANGUAGE = "English"
+PLACEHOLDER_PATTERN = re.compile(r"\{[^{}\s]*\}")
+KEY_SHAPE = re.compile(r"[A-Za-z_]\w*(?:\.\w+)+")
+TOKEN_PATTERN = re.compile(
+    r"//[^\n]*|/\*.*?\*/|'(?:[^'\\\n]|\\.)*'"
+    r'|(?P<verbatim>\$?@\$?)"(?P<verbatim_body>(?:[^"]|"")*)"'
+    r'|(?P<regular>\$?)"(?P<regular_body>(?:[^"\\\n]|\\.)*)"',
+    re.DOTALL,
+)
+TRANSLATE_CALL = re.compile(
+    r"\s*\.\s*(?:Translate|TranslateSimple|TranslateWithBackup|CanTranslate)\s*\("
+)
+INTERPOLATION_HOLE = re.compile(r"\{\{|\}\}|\{[^{}]*\}")
+INJECTABLE_FIELDS = {
+    "label",
+    "labelShort",
+    "description",
+    "reportString",
+    "jobString",
+    "verb",
+    "gerund",
+}
+
+
+class _Parser:
+    @staticmethod
+    def _files(directory: Path) -> list[Path]:
+        return sorted(directory.rglob("*.xml")) if directory.is_dir() else []
+
+    @staticmethod
+    def _leaves(path: Path):
+        depth = 0
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            yield depth, elem
+
+    @classmethod
+    def language(cls, directory: Path) -> dict:
+        result = {"keyed": {}, "injected": {}, "duplicates": [], "errors": []}
+        seen: dict[str, str] = {}
+        for path in cls._files(directory):
+            relative = path.relative_to(directory).as_posix()
+            parts = relative.split("/")
+            if parts[0] == "Keyed":
+                section, prefix = result["keyed"], ""
+            elif parts[0] == "DefInjected" and len(parts) > 2:
+                section, prefix = result["injected"], f"{parts[1]}/"
+            else:
+                continue
+
+            try:
+                for depth, elem in cls._leaves(path):
+                    if depth != 1:
+                        continue
+                    key = prefix + elem.tag
+                    if key in seen:
+                        result["duplicates"].append(
+                            {"key": key, "files": [seen[key], relative]}
+                        )
+                    seen[key] = relative
+                    section[key] = elem.text or ""
+                    elem.clear()
+            except ET.ParseError as e:
+                result["errors"].append(f"{relative}: {e}")
+        return result
+
+    @classmethod
+    def defs(cls, directory: Path) -> dict:
+        result = {"keyed": {}, "injected": {}, "duplicates": [], "errors": []}
+        for path in cls._files(directory):
+            relative = path.relative_to(directory).as_posix()
+            try:
+                for depth, elem in cls._leaves(path):
+                    if depth != 1:
+                        continue
+                    def_name = elem.findtext("defName")
+                    if def_name:
+                        for child in elem:
+                            if child.tag in INJECTABLE_FIELDS and child.text:
+                                key = f"{elem.tag}/{def_name}.{child.tag}"
+                                result["injected"][key] = child.text
+                    elem.clear()
+            except ET.ParseError as e:
+                result["errors"].append(f"{relative}: {e}")
+        return result
+
+
+def _parse_worker(kind: str, directory: Path) -> dict:
+    return _Parser.defs(directory) if kind == "defs" else _Parser.language(directory)
+
+
+class ParseCache:
+    FILE = utils.Paths.CACHE / "lang-check.json"
+    VERSION = 1
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.entries: dict[str, dict] = {}
+        if enabled:
+            try:
+                with open(self.FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, json.JSONDecodeError, AttributeError):
+                pass
+
+    @staticmethod
+    def stamp(directory: Path) -> dict[str, list[int]]:
+        stamp = {}
+        for path in _Parser._files(directory):
+            stat = path.stat()
+            stamp[path.relative_to(directory).as_posix()] = [
+                stat.st_mtime_ns,
+                stat.st_size,
+            ]
+        return stamp
+
+    def get(self, name: str, stamp: dict) -> dict | None:
+        entry = self.entries.get(name)
+        if self.enabled and entry and entry.get("stamp") == stamp:
+            return entry["result"]
+        return None
+
+    def put(self, name: str, stamp: dict, result: dict) -> None:
+        self.entries[name] = {"stamp": stamp, "result": result}
+
+    def save(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            Fs.ensure_dir(self.FILE.parent)
+            temp = self.FILE.with_name(f"{self.FILE.name}.{os.getpid()}.tmp")
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "entries": self.entries}, f)
+            os.replace(temp, self.FILE)
+        except OSError:
+            pass
+
+
+class CoverageCheck:
+    def __init__(self, languages: list[str], jobs: int | None, use_cache: bool):
+        self.languages = languages
+        self.jobs = jobs
+        self.cache = ParseCache(use_cache)
+        self.parsed: dict[str, dict] = {}
+        self.cached = 0
+
+    @staticmethod
+    def available() -> list[str]:
+        if not LANGUAGES_DIR.is_dir():
+            return []
+        return sorted(p.name for p in LANGUAGES_DIR.iterdir() if p.is_dir())
+
+    def _sources(self) -> dict[str, tuple[str, Path]]:
+        sources = {"@Defs": ("defs", DEFS_DIR)}
+        for name in {REFERENCE_LANGUAGE, *self.languages}:
+            sources[name] = ("language", LANGUAGES_DIR / name)
+        return sources
+
+    def parse(self) -> None:
+        pending = {}
+        for name, (kind, directory) in self._sources().items():
+            stamp = ParseCache.stamp(directory)
+            result = self.cache.get(name, stamp)
+            if result is None:
+                pending[name] = (kind, directory, stamp)
+            else:
+                self.parsed[name] = result
+                self.cached += 1
+
+        if pending:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                futures = {
+                    pool.submit(_parse_worker, kind, directory): name
+                    for name, (kind, directory, _) in pending.items()
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    name = futures[future]
+                    self.parsed[name] = future.result()
+                    self.cache.put(name, pending[name][2], self.parsed[name])
+        self.cache.save()
+
+    @staticmethod
+    def _placeholders(text: str) -> Counter:
+        return Counter(PLACEHOLDER_PATTERN.findall(text))
+
+    @classmethod
+    def _compare(cls, reference: dict[str, str], actual: dict[str, str]) -> dict:
+        mismatched = [
+            key
+            for key in sorted(reference.keys() & actual.keys())
+            if cls._placeholders(reference[key]) != cls._placeholders(actual[key])
+        ]
+        return {
+            "total": len(reference),
+            "translated": len(reference.keys() & actual.keys()),
+            "missing": sorted(reference.keys() - actual.keys()),
+            "stale": sorted(actual.keys() - reference.keys()),
+            "placeholders": mismatched,
+        }
+
+    def results(self) -> dict[str, dict]:
+        english = self.parsed[REFERENCE_LANGUAGE]
+        defs = self.parsed["@Defs"]
+        results = {}
+        for name in self.languages:
+            parsed = self.parsed[name]
+            injected = (
+                parsed["injected"] if name == REFERENCE_LANGUAGE else defs["injected"]
+            )
+            results[name] = {
+                "keyed": self._compare(english["keyed"], parsed["keyed"]),
+                "injected": self._compare(injected, parsed["injected"]),
+                "duplicates": parsed["duplicates"],
+                "errors": parsed["errors"],
+            }
+        return results
+
+
+class KeyIndexCache(ParseCache):
+    FILE = utils.Paths.CACHE / "lang-keys.json"
+
+
+class KeyIndex:
+    def __init__(self, use_cache: bool):
+        self.cache = KeyIndexCache(use_cache)
+        self.files: dict[str, list] = {}
+        self.scanned = 0
+
+    @staticmethod
+    def _dynamic_pattern(body: str) -> str:
+        parts, position = [], 0
+        for hole in INTERPOLATION_HOLE.finditer(body):
+            parts.append(re.escape(body[position : hole.start()]))
+            token = hole.group()
+            parts.append(re.escape(token[0]) if token in ("{{", "}}") else ".+")
+            position = hole.end()
+        parts.append(re.escape(body[position:]))
+        return "".join(parts)
+
+    @classmethod
+    def scan(cls, text: str) -> list[list]:
+        entries = []
+        line, position = 1, 0
+        for match in TOKEN_PATTERN.finditer(text):
+            prefix = match.group("verbatim") or match.group("regular")
+            body = match.group("verbatim_body")
+            if body is None:
+                body = match.group("regular_body")
+            if body is None:
+                continue
+            if match.group("verbatim") is not None:
+                body = body.replace('""', '"')
+
+            line += text.count("\n", position, match.start())
+            position = match.start()
+            called = TRANSLATE_CALL.match(text, match.end()) is not None
+            dynamic = False
+            if "$" in (prefix or ""):
+                holes = INTERPOLATION_HOLE.findall(body)
+                dynamic = any(hole not in ("{{", "}}") for hole in holes)
+                if not dynamic:
+                    body = body.replace("{{", "{").replace("}}", "}")
+            if called and dynamic:
+                entries.append(["dynamic", body, line])
+            elif called:
+                entries.append(["call", body, line])
+            elif not dynamic and KEY_SHAPE.fullmatch(body):
+                entries.append(["literal", body, line])
+        return entries
+
+    def build(self) -> None:
+        for path in sorted(SOURCE_DIR.rglob("*.cs")):
+            relative = path.relative_to(utils.Paths.PROJECT).as_posix()
+            data = path.read_bytes()
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            entries = self.cache.get(relative, digest)
+            if entries is None:
+                entries = self.scan(data.decode("utf-8-sig", errors="replace"))
+                self.cache.put(relative, digest, entries)
+                self.scanned += 1
+            self.files[relative] = entries
+
+        self.cache.entries = {
+            name: entry
+            for name, entry in self.cache.entries.items()
+            if name in self.files
+        }
+        self.cache.save()
+
+    def report(self, defined: dict[str, str]) -> dict:
+        calls: dict[str, list[str]] = {}
+        dynamic: dict[str, list[str]] = {}
+        literals: set[str] = set()
+        for name, entries in self.files.items():
+            for kind, value, line in entries:
+                site = f"{name}:{line}"
+                if kind == "call":
+                    calls.setdefault(value, []).append(site)
+                elif kind == "dynamic":
+                    dynamic.setdefault(value, []).append(site)
+                else:
+                    literals.add(value)
+
+        patterns = {body: re.compile(self._dynamic_pattern(body)) for body in dynamic}
+        matched = {
+            body: sorted(key for key in defined if pattern.fullmatch(key))
+            for body, pattern in patterns.items()
+        }
+        dynamic_keys = {key for keys in matched.values() for key in keys}
+
+        undefined = {key: sites for key, sites in calls.items() if key not in defined}
+        return {
+            "files": len(self.files),
+            "call_sites": sum(len(sites) for sites in calls.values()),
+            "keys": dict(sorted(calls.items())),
+            "missing": {
+                key: sites
+                for key, sites in sorted(undefined.items())
+                if key.startswith(KEY_PREFIX)
+            },
+            "external": sorted(
+                key for key in undefined if not key.startswith(KEY_PREFIX)
+            ),
+            "unused": sorted(
+                key
+                for key in defined
+                if key not in calls and key not in literals and key not in dynamic_keys
+            ),
+            "indirect": sorted(
+                key for key in defined if key not in calls and key in literals
+            ),
+            "dynamic": {
+                body: {"sites": sites, "matches": matched[body]}
+                for body, sites in sorted(dynamic.items())
+            },
+        }
+
+
+def _coverage(section: dict) -> str:
+    if not section["total"]:
+        return "-"
+    return f"{section['translated'] / section['total']:.0%}"
+
+
+def _failures(result: dict, strict: bool) -> int:
+    count = len(result["errors"]) + len(result["duplicates"])
+    for section in (result["keyed"], result["injected"]):
+        count += len(section["placeholders"])
+        if strict:
+            count += len(section["missing"]) + len(section["stale"])
+    return count
+
+
+def print_matrix(results: dict[str, dict], strict: bool, details: bool) -> None:
+    UI.header("Translation coverage")
+    UI.print_line(
+        f"{'language':<20} {'keyed':>6} {'defs':>6} {'missing':>8} {'stale':>6} "
+        f"{'dupes':>6} {'{n}':>4} {'xml':>4}"
+    )
+    for name, result in results.items():
+        keyed, injected = result["keyed"], result["injected"]
+        missing = len(keyed["missing"]) + len(injected["missing"])
+        stale = len(keyed["stale"]) + len(injected["stale"])
+        placeholders = len(keyed["placeholders"]) + len(injected["placeholders"])
+        failed = _failures(result, strict)
+        color = Colors.RED if failed else (Colors.YELLOW if missing else Colors.GREEN)
+        UI.print_line(
+            f"{color}{name:<20}{Colors.RESET} {_coverage(keyed):>6} "
+            f"{_coverage(injected):>6} {missing:>8} {stale:>6} "
+            f"{len(result['duplicates']):>6} {placeholders:>4} "
+            f"{len(result['errors']):>4}"
+        )
+
+        if not details:
+            continue
+        for label, keys in [
+            ("missing", keyed["missing"] + injected["missing"]),
+            ("stale", keyed["stale"] + injected["stale"]),
+            ("placeholders differ", keyed["placeholders"] + injected["placeholders"]),
+        ]:
+            for key in keys:
+                UI.print_line(f"  {Colors.DIM}{label:<20}{Colors.RESET} {key}")
+        for duplicate in result["duplicates"]:
+            UI.print_line(
+                f"  {Colors.DIM}{'duplicate':<20}{Colors.RESET} {duplicate['key']} "
+                f"({', '.join(duplicate['files'])})"
+            )
+        for error in result["errors"]:
+            UI.print_line(f"  {Colors.RED}{'malformed':<20}{Colors.RESET} {error}")
+
+
+def run_check(args) -> None:
+    available = CoverageCheck.available()
+    if REFERENCE_LANGUAGE not in available:
+        UI.error(f"Reference language not found in {LANGUAGES_DIR}")
+        sys.exit(1)
+    unknown = [name for name in args.languages if name not in available]
+    if unknown:
+        UI.error(
+            f"Unknown language(s): {', '.join(unknown)}",
+            hint=f"Available: {', '.join(available)}",
+        )
+        sys.exit(1)
+
+    languages = args.languages or [n for n in available if n != REFERENCE_LANGUAGE]
+    check = CoverageCheck(languages, args.jobs, not args.no_cache)
+    with UI.spin(f"Parsing {len(languages)} language(s)..."):
+        check.parse()
+    UI.info(f"{len(check.parsed) - check.cached} parsed, {check.cached} cached")
+
+    for name in [REFERENCE_LANGUAGE, "@Defs"]:
+        for error in check.parsed[name]["errors"]:
+            UI.error(f"{name}: {error}")
+    if check.parsed[REFERENCE_LANGUAGE]["errors"] or check.parsed["@Defs"]["errors"]:
+        sys.exit(1)
+
+    results = check.results()
+    print_matrix(results, args.strict, args.details)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        UI.success(f"Report written to {args.json}")
+
+    failed = [
+        name for name, result in results.items() if _failures(result, args.strict)
+    ]
+    if failed:
+        UI.error(
+            f"{len(failed)} language(s) failed: {', '.join(failed)}",
+            hint="Run with --details to list the keys.",
+        )
+        sys.exit(1)
+    UI.success("All languages passed.")
+
+
+def print_keys(report: dict, details: bool) -> None:
+    UI.header("Translation keys")
+    for key, sites in report["missing"].items():
+        UI.print_line(f"  {Colors.RED}{'missing':<10}{Colors.RESET} {key}")
+        for site in sites:
+            UI.print_line(f"  {'':<10} {Colors.DIM}{site}{Colors.RESET}")
+    for key in report["unused"]:
+        UI.print_line(f"  {Colors.YELLOW}{'unused':<10}{Colors.RESET} {key}")
+    for body, entry in report["dynamic"].items():
+        UI.print_line(
+            f"  {Colors.CYAN}{'dynamic':<10}{Colors.RESET} {body} "
+            f"({len(entry['matches'])} key(s), {', '.join(entry['sites'])})"
+        )
+
+    if not details:
+        return
+    for key in report["indirect"]:
+        UI.print_line(f"  {Colors.DIM}{'indirect':<10}{Colors.RESET} {key}")
+    for key in report["external"]:
+        UI.print_line(f"  {Colors.DIM}{'external':<10}{Colors.RESET} {key}")
+    for key, sites in report["keys"].items():
+        UI.print_line(f"  {Colors.DIM}{'used':<10}{Colors.RESET} {key}")
+        for site in sites:
+            UI.print_line(f"  {'':<10} {Colors.DIM}{site}{Colors.RESET}")
+
+
+def run_keys(args) -> None:
+    english = _Parser.language(LANGUAGES_DIR / REFERENCE_LANGUAGE)
+    for error in english["errors"]:
+        UI.error(f"{REFERENCE_LANGUAGE}: {error}")
+    if english["errors"]:
+        sys.exit(1)
+
+    index = KeyIndex(not args.no_cache)
+    with UI.spin("Indexing Translate() calls..."):
+        index.build()
+    report = index.report(english["keyed"])
+    UI.info(
+        f"{report['files']} source file(s) ({index.scanned} scanned, "
+        f"{report['files'] - index.scanned} cached), {report['call_sites']} call "
+        f"site(s), {len(report['keys'])} key(s), {len(english['keyed'])} defined"
+    )
+
+    print_keys(report, args.details)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        UI.success(f"Report written to {args.json}")
+
+    UI.info(
+        f"{len(report['missing'])} missing, {len(report['unused'])} unused, "
+        f"{len(report['external'])} external (vanilla) key(s)"
+    )
+    if report["missing"] or (args.strict and report["unused"]):
+        UI.error(
+            "Translation keys are out of sync with English Keyed.",
+            hint=f"Define missing keys in {REFERENCE_LANGUAGE}/Keyed or fix the call sites.",
+        )
+        sys.exit(1)
+    UI.success("All Translate() keys are defined.")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check Microtools translations")
+    subparsers = parser.add_subparsers(dest="command", metavar="")
+
+    check_parser = subparsers.add_parser(
+        "check", help="Compare every language against English and the Defs"
+    )
+    check_parser.add_argument(
+        "languages", nargs="*", help="Language folders to check (default: all)"
+    )
+    check_parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Number of worker processes"
+    )
+    check_parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Also fail on missing and stale keys",
+    )
+    check_parser.add_argument(
+        "--details", action="store_true", help="List the offending keys"
+    )
+    check_parser.add_argument(
+        "--no-cache", action="store_true", help="Reparse every language"
+    )
+    check_parser.add_argument("--json", type=Path, help="Write the full report here")
+
+    keys_parser = subparsers.add_parser(
+        "keys", help="Index Translate() keys in Source and find missing or unused ones"
+    )
+    keys_parser.add_argument(
+        "--strict", action="store_true", help="Also fail on unused keys"
+    )
+    keys_parser.add_argument(
+        "--details", action="store_true", help="List every key and call site"
+    )
+    keys_parser.add_argument(
+        "--no-cache", action="store_true", help="Rescan every source file"
+    )
+    keys_parser.add_argument("--json", type=Path, help="Write the full report here")
+
+    if len(sys.argv) == 1:
+        parser.print_help(sys.stderr)
+        sys.exit(1)
+
+    return parser.parse_args()
+
+
+def run():
+    setup.Runtime.enforce_venv()
+    args = _parse_args()
+
+    if args.command == "check":
+        run_check(args)
+    elif args.command == "keys":
+        run_keys(args)
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    except KeyboardInterrupt:
+        UI.error("Cancelled by user.")
+        sys.exit(130)
@@ -0,0 +1,225 @@
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+import setup
+from rw_log import save_data_folder
+from utils import UI, Colors
+
+PERF_FILE = "MicrotoolsPerf.log"
+
+
+class PerfLog:
+    @classmethod
+    def default_path(cls) -> Path:
+        return save_data_folder() / PERF_FILE
+
+    @classmethod
+    def sessions(cls, path: Path) -> list[dict]:
+        sessions: list[dict] = []
+        current = None
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("# session"):
+                    parts = line.split(maxsplit=3)
+                    current = {
+                        "started": parts[2] if len(parts) > 2 else "",
+                        "version": parts[3] if len(parts) > 3 else "",
+                        "scopes": {},
+                    }
+                    sessions.append(current)
+                    continue
+                if current is None:
+                    current = {"started": "", "version": "", "scopes": {}}
+                    sessions.append(current)
+                cls._add_sample(current["scopes"], line)
+        return sessions
+
+    @staticmethod
+    def _add_sample(scopes: dict, line: str) -> None:
+        name, _, rest = line.partition(" ")
+        fields = dict(item.split("=", 1) for item in rest.split() if "=" in item)
+        try:
+            frames = int(fields["frames"])
+            calls = int(fields["calls"])
+            values = [int(v) for v in fields.get("us", "").split(",") if v]
+        except (KeyError, ValueError):
+            return
+
+        scope = scopes.setdefault(name, {"frames": 0, "calls": 0, "us": []})
+        scope["frames"] += max(frames, len(values))
+        scope["calls"] += calls
+        scope["us"].extend(values)
+
+
+class PerfStats:
+    @staticmethod
+    def _percentile(values: list[int], idle: int, p: float) -> float:
+        total = len(values) + idle
+        index = max(0, math.ceil(p * total) - 1)
+        return 0.0 if index < idle else float(values[index - idle])
+
+    @classmethod
+    def summarize(cls, scopes: dict) -> dict[str, dict]:
+        summary = {}
+        for name, scope in scopes.items():
+            frames = scope["frames"]
+            if frames == 0:
+                continue
+            values = sorted(scope["us"])
+            idle = frames - len(values)
+            summary[name] = {
+                "frames": frames,
+                "active": len(values),
+                "calls_per_frame": scope["calls"] / frames,
+                "mean": sum(values) / frames,
+                "p50": cls._percentile(values, idle, 0.50),
+                "p99": cls._percentile(values, idle, 0.99),
+                "max": float(values[-1]) if values else 0.0,
+            }
+        return dict(sorted(summary.items(), key=lambda kv: -kv[1]["mean"]))
+
+    @staticmethod
+    def merge(sessions: list[dict]) -> dict:
+        merged: dict = {}
+        for session in sessions:
+            for name, scope in session["scopes"].items():
+                target = merged.setdefault(name, {"frames": 0, "calls": 0, "us": []})
+                target["frames"] += scope["frames"]
+                target["calls"] += scope["calls"]
+                target["us"].extend(scope["us"])
+        return merged
+
+
+def _load(path: Path, session: int | None) -> tuple[dict, str]:
+    if not path.is_file():
+        UI.error(f"Perf log not found: {path}", hint="Run a Debug build first")
+        sys.exit(1)
+
+    sessions = PerfLog.sessions(path)
+    if not sessions:
+        UI.error(f"No samples in {path}")
+        sys.exit(1)
+
+    if session is None:
+        return PerfStats.merge(sessions), f"{path.name}, {len(sessions)} session(s)"
+    try:
+        selected = sessions[session]
+    except IndexError:
+        UI.error(f"Session {session} not found ({len(sessions)} available).")
+        sys.exit(1)
+    return selected["scopes"], f"{path.name}, session {selected['started']}"
+
+
+def print_report(summary: dict[str, dict], title: str) -> None:
+    UI.header(f"Per-frame cost ({title})")
+    if not summary:
+        UI.info("No scopes recorded.")
+        return
+
+    UI.print_line(
+        f"{'scope':<44} {'frames':>8} {'calls/f':>8} "
+        f"{'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}"
+    )
+    for name, s in summary.items():
+        UI.print_line(
+            f"{name:<44} {s['frames']:>8} {s['calls_per_frame']:>8.2f} "
+            f"{s['mean']:>9.1f} {s['p50']:>9.1f} {s['p99']:>9.1f} {s['max']:>9.0f}"
+        )
+    UI.print_line(f"{Colors.DIM}All times in microseconds per frame.{Colors.RESET}")
+
+
+def _delta(before: float, after: float) -> str:
+    change = after - before
+    if before == 0:
+        return f"{change:+9.1f}        "
+    color = Colors.RED if change > 0 else Colors.GREEN
+    return f"{change:+9.1f} {color}{change / before:+7.1%}{Colors.RESET}"
+
+
+def print_diff(base: dict[str, dict], head: dict[str, dict]) -> None:
+    UI.header("Per-frame cost diff (B - A, microseconds)")
+    UI.print_line(
+        f"{'scope':<44} {'mean A':>9} {'mean B':>9} {'delta':>17} "
+        f"{'p99 A':>9} {'p99 B':>9} {'delta':>17}"
+    )
+    empty = {"mean": 0.0, "p99": 0.0}
+    for name in sorted(base.keys() | head.keys()):
+        a = base.get(name, empty)
+        b = head.get(name, empty)
+        UI.print_line(
+            f"{name:<44} {a['mean']:>9.1f} {b['mean']:>9.1f} "
+            f"{_delta(a['mean'], b['mean'])} "
+            f"{a['p99']:>9.1f} {b['p99']:>9.1f} {_delta(a['p99'], b['p99'])}"
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Aggregate Microtools Debug performance counters"
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="")
+
+    report_parser = subparsers.add_parser(
+        "report", help="Per-scope mean/p99 microseconds per frame"
+    )
+    report_parser.add_argument(
+        "file",
+        nargs="?",
+        type=Path,
+        default=PerfLog.default_path(),
+        help=f"Perf log (default: {PERF_FILE} in the save data folder)",
+    )
+    report_parser.add_argument(
+        "--session",
+        type=int,
+        help="Only report this session index (e.g. -1 for the latest)",
+    )
+    report_parser.add_argument(
+        "--json", type=Path, help="Write the summary here as JSON"
+    )
+
+    diff_parser = subparsers.add_parser("diff", help="Compare two perf logs")
+    diff_parser.add_argument("base", type=Path, help="Baseline perf log (A)")
+    diff_parser.add_argument("head", type=Path, help="Perf log to compare (B)")
+    diff_parser.add_argument(
+        "--session",
+        type=int,
+        help="Compare this session index in both files instead of all sessions",
+    )
+
+    if len(sys.argv) == 1:
+        parser.print_help(sys.stderr)
+        sys.exit(1)
+
+    return parser.parse_args()
+
+
+def run():
+    setup.Runtime.enforce_venv()
+    args = _parse_args()
+
+    if args.command == "report":
+        scopes, title = _load(args.file, args.session)
+        summary = PerfStats.summarize(scopes)
+        print_report(summary, title)
+        if args.json:
+            args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+            UI.success(f"Summary written to {args.json}")
+    elif args.command == "diff":
+        base, _ = _load(args.base, args.session)
+        head, _ = _load(args.head, args.session)
+        print_diff(PerfStats.summarize(base), PerfStats.summarize(head))
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    except KeyboardInterrupt:
+        UI.error("Cancelled by user.")
+        sys.exit(130)
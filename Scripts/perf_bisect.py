@@ -0,0 +1,451 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import shutil
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import setup
+
+setup.Runtime.enforce_venv()
+
+import bench
+import build
+import rw_link
+import utils
+from utils import UI, Colors
+
+BISECT_DIR = utils.Paths.BUILD / "bisect"
+WORKTREES = BISECT_DIR / "worktrees"
+PROJECT_FILE = Path("Source") / "Microtools.csproj"
+ASSEMBLY = Path("Mods") / "Microtools" / "1.6" / "Assemblies" / "Microtools.dll"
+BENCHMARK_SOURCE = Path("Source") / "Debug" / "Benchmark.cs"
+
+
+def _git(*args: str, cwd: Path = utils.Paths.PROJECT) -> str:
+    result = utils.run(["git", *args], cwd=cwd, capture=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(
+            result.stderr.strip()
+            or f"git {' '.join(args)} exited with code {result.returncode}"
+        )
+    return result.stdout.strip()
+
+
+class Candidate:
+    def __init__(self, sha: str, subject: str):
+        self.sha = sha
+        self.subject = subject
+        self.worktree = WORKTREES / sha[:12]
+        self.values: list[float] = []
+        self.verdict = ""
+
+    @property
+    def short(self) -> str:
+        return self.sha[:10]
+
+    @property
+    def value(self) -> float:
+        return statistics.median(self.values)
+
+
+class WorktreeBuilder:
+    def __init__(self, jobs: int, keep: bool):
+        self.keep = keep
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+        self.futures: dict[str, concurrent.futures.Future] = {}
+        self.git_lock = threading.Lock()
+        self.env = {
+            "NUGET_PACKAGES": os.environ.get(
+                "NUGET_PACKAGES", str(Path.home() / ".nuget" / "packages")
+            ),
+            "DOTNET_CLI_TELEMETRY_OPTOUT": "1",
+        }
+
+    def _checkout(self, candidate: Candidate) -> None:
+        with self.git_lock:
+            if candidate.worktree.is_dir():
+                try:
+                    if (
+                        _git("rev-parse", "HEAD", cwd=candidate.worktree)
+                        == candidate.sha
+                    ):
+                        return
+                except RuntimeError:
+                    pass
+                _git("worktree", "remove", "--force", str(candidate.worktree))
+            utils.Fs.ensure_dir(WORKTREES)
+            _git("worktree", "add", "--detach", str(candidate.worktree), candidate.sha)
+
+    def _build(self, candidate: Candidate) -> Path:
+        try:
+            self._checkout(candidate)
+        except RuntimeError as e:
+            raise RuntimeError(f"Could not check out {candidate.short}: {e}") from e
+        assembly = candidate.worktree / ASSEMBLY
+        if assembly.is_file():
+            return assembly
+
+        cmd = [
+            "dotnet",
+            "build",
+            str(candidate.worktree / PROJECT_FILE),
+            "-c",
+            "Debug",
+            "-nodeReuse:false",
+            "/property:GenerateFullPaths=true",
+            "/consoleloggerparameters:NoSummary;ForceNoAlign",
+        ]
+        result = utils.run(cmd, env=self.env, capture=True, timeout=900, check=False)
+        if result.returncode != 0:
+            errors = build._parse_dotnet_errors(
+                result.stdout
+            ) + build._parse_dotnet_errors(result.stderr)
+            raise RuntimeError(
+                f"Build of {candidate.short} failed"
+                + (f": {errors[0].strip()}" if errors else ".")
+            )
+        if not assembly.is_file():
+            raise RuntimeError(f"Build of {candidate.short} produced no assembly.")
+        return assembly
+
+    def submit(self, candidate: Candidate) -> concurrent.futures.Future:
+        if candidate.sha not in self.futures:
+            self.futures[candidate.sha] = self.pool.submit(self._build, candidate)
+        return self.futures[candidate.sha]
+
+    def close(self, candidates: list[Candidate]) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        if self.keep:
+            return
+        for candidate in candidates:
+            if not candidate.worktree.is_dir():
+                continue
+            try:
+                _git("worktree", "remove", "--force", str(candidate.worktree))
+            except RuntimeError as e:
+                UI.warn(f"Could not remove {candidate.worktree}: {e}")
+        _git("worktree", "prune")
+
+
+class Metric:
+    def __init__(self, spec: str):
+        name, _, stat = spec.rpartition(":")
+        if not name or not stat:
+            raise RuntimeError(
+                f"Invalid metric '{spec}'. Use <phase or scope>:<stat>, "
+                "e.g. directhaul:p99 or DirectHaul.PlacementService.Calculate:mean."
+            )
+        self.spec, self.name, self.stat = spec, name, stat
+
+    def extract(self, run: dict) -> float:
+        if self.name in run["phases"]:
+            source = bench.ScenarioBench.summarize([run])[self.name]
+        elif self.name in run.get("scopes", {}):
+            source = run["scopes"][self.name]
+        else:
+            raise RuntimeError(f"Metric '{self.name}' not present in benchmark output.")
+        if self.stat not in source:
+            raise RuntimeError(
+                f"Unknown stat '{self.stat}' (available: {', '.join(source)})."
+            )
+        return float(source[self.stat])
+
+
+class PerfBisect:
+    def __init__(self, args):
+        self.args = args
+        self.metric = Metric(args.metric)
+        self.bench = bench.ScenarioBench(args)
+        self.target_mods = Path(self.bench.info["mods"])
+        self.builder = WorktreeBuilder(args.jobs, args.keep)
+        self.candidates = self._candidates(args.good, args.bad)
+        self.worktree_candidates = list(self.candidates)
+        self.baseline: float | None = None
+
+    @staticmethod
+    def _candidates(good: str, bad: str) -> list[Candidate]:
+        try:
+            good_sha = _git("rev-parse", "--verify", f"{good}^{{commit}}")
+            bad_sha = _git("rev-parse", "--verify", f"{bad}^{{commit}}")
+        except RuntimeError as e:
+            raise RuntimeError(f"Unknown revision: {e}") from e
+        try:
+            _git("merge-base", "--is-ancestor", good_sha, bad_sha)
+        except RuntimeError:
+            raise RuntimeError(f"{good} is not an ancestor of {bad}.")
+
+        candidates = [Candidate(good_sha, _git("log", "-1", "--format=%s", good_sha))]
+        log = _git(
+            "log",
+            "--reverse",
+            "--ancestry-path",
+            "--format=%H%x09%s",
+            f"{good_sha}..{bad_sha}",
+        )
+        for line in log.splitlines():
+            sha, _, subject = line.partition("\t")
+            candidates.append(Candidate(sha, subject))
+        if len(candidates) < 2:
+            raise RuntimeError("No commits between good and bad.")
+        return candidates
+
+    def _snapshot_links(self) -> dict[Path, str | None]:
+        links = {}
+        for source in (utils.Paths.PROJECT / "Mods").iterdir():
+            if source.is_dir():
+                target = self.target_mods / source.name
+                links[target] = os.readlink(target) if target.is_symlink() else None
+        return links
+
+    @staticmethod
+    def _restore_links(links: dict[Path, str | None]) -> None:
+        for target, source in links.items():
+            if source is None:
+                if target.is_symlink():
+                    target.unlink()
+            else:
+                utils.Fs.create_symlink(Path(source), target)
+
+    def _deploy(self, candidate: Candidate) -> None:
+        source_mods = candidate.worktree / "Mods"
+        rw_link.deploy_mods(source_mods, self.target_mods, mode="link")
+        for source in source_mods.iterdir():
+            if not source.is_dir():
+                continue
+            target = self.target_mods / source.name
+            if target.resolve() != source.resolve():
+                raise RuntimeError(
+                    f"{target} does not point at {candidate.short}'s worktree; "
+                    "perf_bisect needs symlinked mods (not 'rw_link.py sync')."
+                )
+
+    def measure(self, candidate: Candidate) -> float:
+        if candidate.values:
+            return candidate.value
+
+        future = self.builder.submit(candidate)
+        with UI.spin(f"Building {candidate.short}..."):
+            future.result()
+        if not (candidate.worktree / BENCHMARK_SOURCE).is_file():
+            raise RuntimeError(f"{candidate.short} predates the in-game benchmark.")
+
+        self._deploy(candidate)
+        UI.header(f"Benchmarking {candidate.short} {candidate.subject}")
+        runs = self.bench.run()
+        candidate.values = [self.metric.extract(run) for run in runs]
+        UI.info(
+            f"{self.metric.spec} = {candidate.value:.2f} "
+            f"(min {min(candidate.values):.2f}, max {max(candidate.values):.2f})"
+        )
+        return candidate.value
+
+    def is_regressed(self, value: float) -> bool:
+        return value > self.baseline * (1 + self.args.threshold / 100)
+
+    def _prefetch(self, low: int, high: int) -> None:
+        if high - low > 1:
+            self.builder.submit(self.candidates[(low + high) // 2])
+
+    def run(self) -> Candidate | None:
+        links = self._snapshot_links()
+        good, bad = self.candidates[0], self.candidates[-1]
+        self.builder.submit(good)
+        self.builder.submit(bad)
+        self._prefetch(0, len(self.candidates) - 1)
+
+        try:
+            self.baseline = self.measure(good)
+            good.verdict = "good"
+            if not self.is_regressed(self.measure(bad)):
+                bad.verdict = "within noise"
+                return None
+            bad.verdict = "bad"
+
+            low, high = 0, len(self.candidates) - 1
+            while high - low > 1:
+                mid = (low + high) // 2
+                self._prefetch(low, mid)
+                self._prefetch(mid, high)
+                candidate = self.candidates[mid]
+                try:
+                    regressed = self.is_regressed(self.measure(candidate))
+                except RuntimeError as e:
+                    UI.warn(f"Skipping {candidate.short}: {e}")
+                    candidate.verdict = "skipped"
+                    del self.candidates[mid]
+                    high -= 1
+                    continue
+                candidate.verdict = "bad" if regressed else "good"
+                if regressed:
+                    high = mid
+                else:
+                    low = mid
+            return self.candidates[high]
+        finally:
+            self._restore_links(links)
+            self.builder.close(self.worktree_candidates)
+
+    def report(self, culprit: Candidate | None) -> Path:
+        measured = [c for c in self.candidates if c.values]
+        UI.header(
+            f"Bisect summary ({self.metric.spec}, threshold {self.args.threshold}%)"
+        )
+        UI.print_line(
+            f"{'commit':<10} {'median':>10} {'min':>10} {'max':>10} {'delta':>8}  "
+            f"{'verdict':<13} subject"
+        )
+        for c in measured:
+            delta = (c.value / self.baseline - 1) if self.baseline else 0.0
+            color = Colors.RED if c.verdict == "bad" else ""
+            UI.print_line(
+                f"{color}{c.short:<10} {c.value:>10.2f} {min(c.values):>10.2f} "
+                f"{max(c.values):>10.2f} {delta:>+8.1%}  {c.verdict:<13} "
+                f"{c.subject[:60]}{Colors.RESET if color else ''}"
+            )
+
+        if culprit:
+            UI.success(f"First regressing commit: {culprit.short} {culprit.subject}")
+        else:
+            UI.info("The bad commit is within the noise threshold of the good one.")
+
+        output = BISECT_DIR / f"bisect-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        output.write_text(
+            json.dumps(
+                {
+                    "metric": self.metric.spec,
+                    "threshold": self.args.threshold,
+                    "repeat": self.args.runs,
+                    "culprit": culprit.sha if culprit else None,
+                    "candidates": [
+                        {
+                            "sha": c.sha,
+                            "subject": c.subject,
+                            "values": c.values,
+                            "verdict": c.verdict,
+                        }
+                        for c in measured
+                    ],
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        return output
+
+
+def run_bisect(args) -> None:
+    if args.runs < 1:
+        raise RuntimeError("--repeat must be at least 1.")
+    if not shutil.which("dotnet"):
+        raise RuntimeError("dotnet was not found on PATH.")
+
+    utils.Fs.ensure_dir(BISECT_DIR)
+    bisect = PerfBisect(args)
+    steps = (len(bisect.candidates) - 1).bit_length() + 1
+    UI.info(
+        f"{len(bisect.candidates)} candidates from {bisect.candidates[0].short} "
+        f"to {bisect.candidates[-1].short}, about {steps} benchmarks "
+        f"of {args.runs} run(s) each."
+    )
+    output = bisect.report(bisect.run())
+    UI.info(f"Results written to {output}")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Bisect a frame time regression with the in-game benchmark"
+    )
+    parser.add_argument("good", help="Last known good revision")
+    parser.add_argument("bad", help="First known bad revision")
+    parser.add_argument(
+        "save", help="Save name in the template's Saves folder, or a .rws path"
+    )
+    parser.add_argument(
+        "--metric",
+        default="directhaul:p99",
+        help="<phase or Perf scope>:<stat> to compare (default: directhaul:p99)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=5.0,
+        help="Percent above the good commit that counts as a regression (default: 5)",
+    )
+    parser.add_argument(
+        "--repeat",
+        dest="runs",
+        type=int,
+        default=3,
+        help="Benchmark runs per commit; the median is compared (default: 3)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=2,
+        help="Parallel candidate builds (default: 2)",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the worktrees under .build/bisect afterwards",
+    )
+    parser.add_argument(
+        "--install",
+        help="Registered installation name (see 'rw_find.py list')",
+    )
+    parser.add_argument(
+        "--template",
+        type=Path,
+        help="Save data folder to copy Config and saves from (default: the game's)",
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=20,
+        help="Duration of each scripted phase in seconds (default: 20)",
+    )
+    parser.add_argument(
+        "--things",
+        type=int,
+        default=2000,
+        help="Things to select for placement previews (default: 2000)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600,
+        help="Seconds to wait for a run to finish (default: 600)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    env = setup.Environment(setup.MANIFEST)
+    for component in ["launch", "build"]:
+        if not env.manifest[component].check():
+            UI.error(
+                f"'{component}' environment is not configured.",
+                hint=f"Run: python Scripts/setup.py setup {component}",
+            )
+            sys.exit(1)
+
+    args = _parse_args()
+    try:
+        run_bisect(args)
+    except (RuntimeError, FileNotFoundError) as e:
+        UI.error(f"Fatal error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        UI.error("Cancelled by user.")
+        sys.exit(130)
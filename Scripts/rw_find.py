@@ -1,10 +1,18 @@
-import configparser
+import collections
+import concurrent.futures
+import contextlib
 import json
 import os
 import re
+import shlex
+import shutil
+import sqlite3
+import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import utils
 from utils import UI
@@ -22,25 +30,196 @@ try:
 except ImportError:
     pass
 
+RIMWORLD_APP_ID = "294100"
+INSTALL_ENV_VAR = "RIMWORLD_INSTALL"
+FULL_SCAN_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+FULL_SCAN_BUDGET = 300
 
-def find_installation() -> dict[str, str] | None:
-    cache_file = utils.Paths.BUILD / "cache" / "rw_path.json"
 
-    cached_path = _try_read_from_cache(cache_file)
-    if cached_path:
-        return cached_path
+def find_installation(name: str | None = None) -> dict[str, str] | None:
+    registry = InstallRegistry.load()
+
+    name = name or os.environ.get(INSTALL_ENV_VAR)
+    if name:
+        if name not in registry.installs:
+            UI.error(
+                f"Unknown RimWorld installation '{name}'.",
+                hint="Run: python Scripts/rw_find.py list",
+            )
+            return None
+        return registry.get(name)
+
+    if registry.default:
+        install = registry.get(registry.default)
+        if install:
+            return install
 
     search_strategy = _get_platform_search_strategy()
     result = None
     for finder in search_strategy:
-        result = finder()
+        result = next(finder(), None)
         if result:
             break
 
-    if result:
-        _write_to_cache(cache_file, result)
+    if not result:
+        return None
+
+    name = registry.add(result)
+    registry.default = name
+    registry.save()
+    return registry.installs[name]
+
+
+class InstallRegistry:
+    FILE = utils.Paths.INSTALL_REGISTRY
+    LEGACY_FILE = utils.Paths.CACHE / "rw_installs.json"
+    LEGACY_CACHE_FILE = utils.Paths.CACHE / "rw_path.json"
+
+    def __init__(self):
+        self.default: str | None = None
+        self.installs: dict[str, dict] = {}
+
+    @classmethod
+    def load(cls) -> "InstallRegistry":
+        registry = cls()
+        if cls.LEGACY_FILE.exists() and not cls.FILE.exists():
+            try:
+                os.replace(cls.LEGACY_FILE, cls.FILE)
+            except OSError:
+                pass
+
+        try:
+            with open(cls.FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            registry.default = data.get("default")
+            registry.installs = dict(data.get("installs", {}))
+        except (OSError, json.JSONDecodeError, AttributeError, TypeError):
+            pass
+
+        if registry.default not in registry.installs:
+            registry.default = None
 
-    return result
+        registry._migrate_legacy_cache()
+        return registry
+
+    def _migrate_legacy_cache(self) -> None:
+        if not self.LEGACY_CACHE_FILE.exists():
+            return
+
+        try:
+            with open(self.LEGACY_CACHE_FILE, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+            info = validate_path(self._root(legacy))
+            if info and not self.installs:
+                self.default = self.add(info)
+                self.save()
+        except (OSError, json.JSONDecodeError, TypeError, KeyError):
+            pass
+
+        try:
+            self.LEGACY_CACHE_FILE.unlink()
+        except OSError:
+            pass
+
+    def save(self) -> None:
+        self.FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.FILE.with_name(f"{self.FILE.name}.tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"default": self.default, "installs": self.installs}, f, indent=2)
+        os.replace(temp, self.FILE)
+
+    @staticmethod
+    def _root(info: dict) -> Path:
+        directory = Path(info["directory"])
+        if sys.platform == "darwin":
+            return directory.parent.parent
+        return directory
+
+    @classmethod
+    def _fingerprint(cls, info: dict) -> list[int] | None:
+        try:
+            root = cls._root(info).stat()
+            executable = (Path(info["directory"]) / info["executable"]).stat()
+        except (OSError, KeyError):
+            return None
+        return [
+            root.st_dev,
+            root.st_ino,
+            root.st_mtime_ns,
+            executable.st_mtime_ns,
+            executable.st_size,
+        ]
+
+    @classmethod
+    def _read_version(cls, root: Path) -> str | None:
+        for candidate in (root / "Version.txt", root.parent / "Version.txt"):
+            try:
+                with open(candidate, "r", encoding="utf-8-sig") as f:
+                    return f.readline().strip() or None
+            except OSError:
+                continue
+        return None
+
+    @classmethod
+    def _describe(cls, info: dict, name: str) -> dict:
+        root = cls._root(info)
+        return {
+            "name": name,
+            "directory": info["directory"],
+            "executable": info["executable"],
+            "mods": str(root / "Mods"),
+            "version": cls._read_version(root),
+            "fingerprint": cls._fingerprint(info),
+        }
+
+    def _unique_name(self, info: dict) -> str:
+        base = re.sub(r"[^a-z0-9.]+", "-", self._root(info).name.lower()).strip("-")
+        base = base or "rimworld"
+        name = base
+        suffix = 2
+        while name in self.installs:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        return name
+
+    def add(self, info: dict, name: str | None = None) -> str:
+        for existing, install in self.installs.items():
+            if install["directory"] == info["directory"] and name in (None, existing):
+                self.installs[existing] = self._describe(info, existing)
+                return existing
+
+        name = name or self._unique_name(info)
+        self.installs[name] = self._describe(info, name)
+        if self.default is None:
+            self.default = name
+        return name
+
+    def remove(self, name: str) -> bool:
+        if self.installs.pop(name, None) is None:
+            return False
+        if self.default == name:
+            self.default = next(iter(self.installs), None)
+        return True
+
+    def get(self, name: str) -> dict | None:
+        install = self.installs.get(name)
+        if not install:
+            return None
+
+        if (
+            install.get("fingerprint")
+            and self._fingerprint(install) == install["fingerprint"]
+        ):
+            return install
+
+        info = validate_path(self._root(install))
+        if not info:
+            UI.warn(f"Installation '{name}' is no longer valid: {install['directory']}")
+            return None
+
+        self.installs[name] = self._describe(info, name)
+        self.save()
+        return self.installs[name]
 
 
 def validate_path(path) -> dict[str, str] | None:
@@ -66,54 +245,26 @@ def validate_path(path) -> dict[str, str] | None:
     return None
 
 
-def _try_read_from_cache(cache_file: Path) -> dict[str, str] | None:
-    if not cache_file.exists():
-        return None
-
-    try:
-        with open(cache_file, "r", encoding="utf-8") as f:
-            cached_data = json.load(f)
-            path_to_validate = cached_data.get("directory")
-
-            if path_to_validate and sys.platform == "darwin":
-                path_to_validate = str(Path(path_to_validate).parent.parent)
-
-            if path_to_validate and validate_path(path_to_validate):
-                return cached_data
-    except (json.JSONDecodeError, TypeError, KeyError):
-        pass
-
-    try:
-        cache_file.unlink()
-    except OSError:
-        pass
-
-    return None
-
-
-def _write_to_cache(cache_file: Path, data: dict):
-    cache_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-
 def _get_platform_search_strategy() -> list:
     if sys.platform == "win32":
         return [
             _find_in_steam,
             _find_in_registry_windows,
+            _find_in_index,
             _find_with_full_scan,
         ]
     elif sys.platform == "linux":
         return [
             _find_in_steam,
             _find_in_desktop_files_linux,
+            _find_in_index,
             _find_with_full_scan,
         ]
     elif sys.platform == "darwin":
         return [
             _find_in_steam,
             _find_in_applications_macos,
+            _find_in_index,
             _find_with_full_scan,
         ]
     else:
@@ -121,59 +272,146 @@ def _get_platform_search_strategy() -> list:
         sys.exit(1)
 
 
-def _find_in_steam() -> dict[str, str] | None:
+_VDF_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}])|//[^\n]*')
+_VDF_ESCAPES = {"n": "\n", "t": "\t"}
+
+
+def _parse_vdf(text: str) -> dict:
+    root: dict = {}
+    stack = [root]
+    key = None
+
+    for match in _VDF_TOKEN.finditer(text):
+        quoted, brace = match.groups()
+        if brace == "{":
+            child: dict = {}
+            stack[-1][key] = child
+            stack.append(child)
+            key = None
+        elif brace == "}":
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif quoted is not None:
+            value = re.sub(r"\\(.)", lambda m: _VDF_ESCAPES.get(m[1], m[1]), quoted)
+            if key is None:
+                key = value
+            else:
+                stack[-1][key] = value
+                key = None
+    return root
+
+
+def _read_vdf(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return _parse_vdf(f.read())
+    except OSError:
+        return {}
+
+
+def _steam_roots() -> list[Path]:
+    roots = []
+
     if sys.platform == "win32":
-        steam_paths = [
+        if winreg:
+            registry_keys = [
+                (winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam", "SteamPath"),
+                (
+                    winreg.HKEY_LOCAL_MACHINE,
+                    r"Software\WOW6432Node\Valve\Steam",
+                    "InstallPath",
+                ),
+            ]
+            for hive, key_path, value_name in registry_keys:
+                try:
+                    with winreg.OpenKey(hive, key_path) as key:
+                        value, _ = winreg.QueryValueEx(key, value_name)
+                        roots.append(Path(value))
+                except OSError:
+                    continue
+        roots += [
             Path(os.environ.get("PROGRAMFILES(X86)", "C:\\Program Files (x86)"))
-            / "Steam"
-            / "steamapps"
-            / "common"
-            / "RimWorld",
-            Path(os.environ.get("PROGRAMFILES", "C:\\Program Files"))
-            / "Steam"
-            / "steamapps"
-            / "common"
-            / "RimWorld",
+            / "Steam",
+            Path(os.environ.get("PROGRAMFILES", "C:\\Program Files")) / "Steam",
         ]
-        for path in steam_paths:
-            if path.exists():
-                return {"directory": str(path), "executable": "RimWorldWin64.exe"}
 
     elif sys.platform == "linux":
-        steam_path = (
-            Path.home()
+        home = Path.home()
+        roots += [
+            home / ".local" / "share" / "Steam",
+            home / ".steam" / "steam",
+            home / ".steam" / "root",
+            home
+            / ".var"
+            / "app"
+            / "com.valvesoftware.Steam"
             / ".local"
             / "share"
-            / "Steam"
-            / "steamapps"
-            / "common"
-            / "RimWorld"
-        )
-        if steam_path.exists():
-            return {"directory": str(steam_path), "executable": "RimWorldLinux"}
+            / "Steam",
+            home / ".var" / "app" / "com.valvesoftware.Steam" / "data" / "Steam",
+            home / "snap" / "steam" / "common" / ".local" / "share" / "Steam",
+        ]
 
     elif sys.platform == "darwin":
-        steam_path = (
-            Path.home()
-            / "Library"
-            / "Application Support"
-            / "Steam"
-            / "steamapps"
-            / "common"
-            / "RimWorld"
-        )
-        if steam_path.exists():
-            return {
-                "directory": str(steam_path / "RimWorldMac.app" / "Contents" / "MacOS"),
-                "executable": "RimWorldMac",
-            }
+        roots.append(Path.home() / "Library" / "Application Support" / "Steam")
 
-    return None
+    unique = []
+    seen = set()
+    for root in roots:
+        try:
+            resolved = root.resolve()
+        except OSError:
+            continue
+        if resolved not in seen and (resolved / "steamapps").is_dir():
+            seen.add(resolved)
+            unique.append(resolved)
+    return unique
+
+
+def _steam_library_folders(steam_root: Path) -> list[Path]:
+    libraries = [steam_root]
+    data = _read_vdf(steam_root / "steamapps" / "libraryfolders.vdf")
+    folders = data.get("libraryfolders") or data.get("LibraryFolders") or {}
 
+    for key, value in folders.items():
+        if isinstance(value, dict):
+            path = value.get("path")
+        elif key.isdigit():
+            path = value
+        else:
+            path = None
+        if path:
+            libraries.append(Path(path))
+
+    unique = []
+    for library in libraries:
+        if library not in unique:
+            unique.append(library)
+    return unique
 
-def _find_in_registry_windows() -> dict[str, str] | None:
+
+def _find_in_steam() -> Iterator[dict[str, str]]:
+    for steam_root in _steam_roots():
+        for library in _steam_library_folders(steam_root):
+            steamapps = library / "steamapps"
+            manifest = _read_vdf(steamapps / f"appmanifest_{RIMWORLD_APP_ID}.acf")
+            install_dir = manifest.get("AppState", {}).get("installdir")
+            if not install_dir:
+                continue
+
+            result = validate_path(steamapps / "common" / install_dir)
+            if result:
+                yield result
+
+        result = validate_path(steam_root / "steamapps" / "common" / "RimWorld")
+        if result:
+            yield result
+
+
+def _find_in_registry_windows() -> Iterator[dict[str, str]]:
     if not winreg:
-        return None
+        return
 
     uninstall_paths = [
         r"Software\Microsoft\Windows\CurrentVersion\Uninstall",
@@ -193,43 +431,146 @@ def _find_in_registry_windows() -> dict[str, str] | None:
                                 )
                                 result = validate_path(install_loc)
                                 if result:
-                                    return result
+                                    yield result
                         except OSError:
                             continue
         except OSError:
             continue
-    return None
 
 
-def _find_in_desktop_files_linux() -> dict[str, str] | None:
-    desktop_paths = [
+class DesktopEntryIndex:
+    FILE = utils.Paths.CACHE / "desktop_entries.json"
+    ROOTS = [
         Path.home() / ".local" / "share" / "applications",
         Path("/usr/share/applications"),
         Path("/usr/local/share/applications"),
     ]
-    parser = configparser.ConfigParser()
+    KEYS = {"Name", "Exec", "Path"}
+    WORKERS = 8
 
-    for path in desktop_paths:
-        if not path.is_dir():
-            continue
-        for desktop_file in path.rglob("*.desktop"):
+    def __init__(self, path: Path = FILE):
+        self.path = path
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: dict) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(entries), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _list_files(roots: list[Path]) -> dict[str, int]:
+        files = {}
+        stack = [str(root) for root in roots if root.is_dir()]
+        while stack:
+            directory = stack.pop()
             try:
-                parser.read(desktop_file)
-                if "Desktop Entry" in parser:
-                    entry = parser["Desktop Entry"]
-                    if "rimworld" in entry.get("Name", "").lower():
-                        exec_path = entry.get("Path") or entry.get("Exec")
-                        if exec_path:
-                            install_dir = Path(re.split(r" %| '", exec_path)[0]).parent
-                            result = validate_path(install_dir)
-                            if result:
-                                return result
-            except (configparser.Error, FileNotFoundError):
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                stack.append(entry.path)
+                            elif entry.name.endswith(".desktop"):
+                                files[entry.path] = entry.stat().st_mtime_ns
+                        except OSError:
+                            continue
+            except OSError:
                 continue
-    return None
+        return files
+
+    @classmethod
+    def parse(cls, path: str) -> dict[str, str]:
+        entry = {}
+        in_section = False
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    if line.startswith("["):
+                        if in_section:
+                            break
+                        in_section = line == "[Desktop Entry]"
+                        continue
+                    if not in_section:
+                        continue
+                    key, sep, value = line.partition("=")
+                    key = key.strip()
+                    if sep and key in cls.KEYS:
+                        entry[key] = value.strip()
+        except OSError:
+            pass
+        return entry
+
+    @staticmethod
+    def exec_program(exec_line: str) -> str | None:
+        try:
+            tokens = shlex.split(exec_line)
+        except ValueError:
+            return None
 
+        tokens = [token for token in tokens if not re.fullmatch(r"%[a-zA-Z]", token)]
+        if tokens and Path(tokens[0]).name == "env":
+            tokens = tokens[1:]
+            while tokens and (tokens[0].startswith("-") or "=" in tokens[0]):
+                tokens = tokens[1:]
+        return tokens[0] if tokens else None
 
-def _find_in_applications_macos() -> dict[str, str] | None:
+    def entries(self) -> dict[str, dict]:
+        cached = self._load()
+        files = self._list_files(self.ROOTS)
+
+        entries = {}
+        stale = []
+        for path, mtime_ns in files.items():
+            record = cached.get(path)
+            if record and record.get("mtime_ns") == mtime_ns:
+                entries[path] = record
+            else:
+                stale.append(path)
+
+        if stale:
+            with concurrent.futures.ThreadPoolExecutor(self.WORKERS) as pool:
+                for path, entry in zip(stale, pool.map(self.parse, stale)):
+                    entries[path] = {"mtime_ns": files[path], "entry": entry}
+
+        if stale or len(entries) != len(cached):
+            self._save(entries)
+        return entries
+
+    def find(self) -> Iterator[dict[str, str]]:
+        for record in self.entries().values():
+            entry = record["entry"]
+            if "rimworld" not in entry.get("Name", "").lower():
+                continue
+
+            if entry.get("Path"):
+                result = validate_path(entry["Path"])
+                if result:
+                    yield result
+                    continue
+
+            program = self.exec_program(entry.get("Exec", ""))
+            if program:
+                result = validate_path(Path(program).parent)
+                if result:
+                    yield result
+
+
+def _find_in_desktop_files_linux() -> Iterator[dict[str, str]]:
+    yield from DesktopEntryIndex().find()
+
+
+def _find_in_applications_macos() -> Iterator[dict[str, str]]:
     app_paths = [
         Path("/Applications/RimWorldMac.app"),
         Path.home() / "Applications" / "RimWorldMac.app",
@@ -237,14 +578,114 @@ def _find_in_applications_macos() -> dict[str, str] | None:
     for path in app_paths:
         result = validate_path(path)
         if result:
-            return result
-    return None
+            yield result
 
 
-def _find_with_full_scan() -> dict[str, str] | None:
-    UI.warn("RimWorld not found in common locations. Starting full filesystem scan...")
-    UI.info("This might take a while...")
+class _ParallelScanner:
+    def __init__(
+        self,
+        roots: list[Path],
+        excluded_paths: set[str],
+        excluded_names: set[str],
+        target_name: str,
+        workers: int,
+        budget: float,
+    ):
+        self.excluded_paths = excluded_paths
+        self.excluded_names = excluded_names
+        self.target_name = target_name
+        self.workers = workers
+        self.deadline = time.monotonic() + budget
 
+        self._pending = collections.deque(
+            str(root)
+            for root in roots
+            if self._normalize(str(root)) not in excluded_paths
+        )
+        self._active = 0
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self.result: dict[str, str] | None = None
+        self.timed_out = False
+        self.scanned = 0
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _next_directory(self) -> str | None:
+        with self._condition:
+            while not self._pending:
+                if self._active == 0 or self._stop.is_set():
+                    self._condition.notify_all()
+                    return None
+                self._condition.wait(0.1)
+                if self._stop.is_set():
+                    return None
+            self._active += 1
+            return self._pending.pop()
+
+    def _scan_directory(self, directory: str) -> list[str]:
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                    except OSError:
+                        continue
+
+                    if entry.name in self.excluded_names:
+                        continue
+                    if self._normalize(entry.path) in self.excluded_paths:
+                        continue
+
+                    if entry.name == self.target_name:
+                        UI.step(f"Scanning: {entry.path}")
+                        result = validate_path(entry.path)
+                        if result:
+                            self.result = result
+                            self._stop.set()
+                            return []
+                        continue
+
+                    subdirs.append(entry.path)
+        except OSError:
+            pass
+        return subdirs
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            if time.monotonic() > self.deadline:
+                self.timed_out = True
+                self._stop.set()
+                break
+
+            directory = self._next_directory()
+            if directory is None:
+                break
+
+            subdirs = self._scan_directory(directory)
+            with self._condition:
+                self.scanned += 1
+                self._pending.extend(subdirs)
+                self._active -= 1
+                self._condition.notify_all()
+
+    def run(self) -> dict[str, str] | None:
+        threads = [
+            threading.Thread(target=self._worker, daemon=True)
+            for _ in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.result
+
+
+def _full_scan_scope() -> tuple[list[Path], set[str], set[str]]:
     search_roots = []
     exclude_dirs = set()
 
@@ -283,36 +724,381 @@ def _find_with_full_scan() -> dict[str, str] | None:
             ]
         )
 
-    for root in search_roots:
+    excluded_paths = set()
+    excluded_names = set()
+    for excluded in exclude_dirs:
+        excluded = Path(excluded)
+        if excluded.is_absolute():
+            excluded_paths.add(_ParallelScanner._normalize(str(excluded)))
+        else:
+            excluded_names.add(excluded.name)
+
+    return search_roots, excluded_paths, excluded_names
+
+
+def _find_with_full_scan() -> Iterator[dict[str, str]]:
+    UI.warn("RimWorld not found in common locations. Starting full filesystem scan...")
+    UI.info("This might take a while...")
+
+    search_roots, excluded_paths, excluded_names = _full_scan_scope()
+    scanner = _ParallelScanner(
+        search_roots,
+        excluded_paths,
+        excluded_names,
+        "RimWorld",
+        workers=FULL_SCAN_WORKERS,
+        budget=FULL_SCAN_BUDGET,
+    )
+    result = scanner.run()
+
+    if result:
+        UI.success("Found installation.")
+        yield result
+    elif scanner.timed_out:
+        UI.warn(
+            f"Full scan stopped after {FULL_SCAN_BUDGET}s "
+            f"({scanner.scanned} directories scanned)."
+        )
+
+
+class LocateIndexProvider:
+    BINARIES = ["plocate", "locate", "mlocate"]
+    EXECUTABLE = "RimWorldLinux"
+    DATABASE_ENV_VAR = "RIMWORLD_LOCATE_DB"
+
+    def find(self) -> Iterator[dict[str, str]]:
+        if sys.platform != "linux":
+            return
+
+        binary = next(filter(None, map(shutil.which, self.BINARIES)), None)
+        if not binary:
+            return
+
+        cmd = [binary, "--basename", "--existing", "--limit", "50"]
+        database = os.environ.get(self.DATABASE_ENV_VAR)
+        if database:
+            cmd += ["--database", database]
+        cmd.append(f"\\{self.EXECUTABLE}")
+
         try:
-            for dirpath, dirnames, _ in os.walk(root):
-                current_path = Path(dirpath)
-                is_excluded = False
-                for excluded in exclude_dirs:
-                    try:
-                        if current_path == excluded or excluded in current_path.parents:
-                            is_excluded = True
-                            break
-                    except TypeError:
-                        if str(current_path).startswith(str(excluded)):
-                            is_excluded = True
-                            break
-                if is_excluded:
-                    dirnames[:] = []
+            output = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=5, check=False
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return
+
+        for line in output.splitlines():
+            result = validate_path(Path(line.strip()).parent)
+            if result:
+                yield result
+
+
+class DirectoryIndex:
+    FILE = utils.Paths.CACHE / "rw_dir_index.sqlite"
+    TARGET_NAME = "RimWorld"
+    STALE_AFTER = 24 * 60 * 60
+    LOCK_STALE_AFTER = 60 * 60
+
+    def __init__(self, path: Path = FILE):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                children TEXT NOT NULL,
+                generation INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS candidates (
+                path TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+        return connection
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def is_stale(self) -> bool:
+        try:
+            return time.time() - self.path.stat().st_mtime > self.STALE_AFTER
+        except OSError:
+            return True
+
+    def candidates(self) -> list[str]:
+        if not self.exists():
+            return []
+        try:
+            with contextlib.closing(self._connect()) as connection:
+                return [
+                    row[0] for row in connection.execute("SELECT path FROM candidates")
+                ]
+        except sqlite3.Error:
+            return []
+
+    @property
+    def lock_path(self) -> Path:
+        return self.path.with_name(f"{self.path.name}.lock")
+
+    @contextlib.contextmanager
+    def _lock(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    age = time.time() - self.lock_path.stat().st_mtime
+                except OSError:
+                    continue
+                if age < self.LOCK_STALE_AFTER:
+                    break
+                self.lock_path.unlink(missing_ok=True)
+                continue
+
+            try:
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                yield True
+            finally:
+                self.lock_path.unlink(missing_ok=True)
+            return
+        yield False
+
+    def refresh(self) -> tuple[int, int] | None:
+        with self._lock() as acquired:
+            if not acquired:
+                return None
+            try:
+                return self._refresh()
+            except sqlite3.OperationalError:
+                raise
+            except sqlite3.DatabaseError:
+                self.path.unlink(missing_ok=True)
+                return self._refresh()
+
+    def _refresh(self) -> tuple[int, int]:
+        roots, excluded_paths, excluded_names = _full_scan_scope()
+
+        with contextlib.closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'generation'"
+            ).fetchone()
+            generation = int(row[0]) + 1 if row else 1
+
+            stack = [str(root) for root in roots]
+            visited = rescanned = 0
+            updates = []
+            found = []
+
+            while stack:
+                directory = stack.pop()
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
                     continue
+                visited += 1
+
+                row = connection.execute(
+                    "SELECT mtime_ns, children FROM dirs WHERE path = ?", (directory,)
+                ).fetchone()
+                if row and row[0] == mtime_ns:
+                    children = row[1].split("\0") if row[1] else []
+                else:
+                    rescanned += 1
+                    children = []
+                    try:
+                        with os.scandir(directory) as entries:
+                            for entry in entries:
+                                try:
+                                    if entry.is_dir(follow_symlinks=False):
+                                        children.append(entry.name)
+                                except OSError:
+                                    continue
+                    except OSError:
+                        pass
+
+                updates.append((directory, mtime_ns, "\0".join(children), generation))
+                if len(updates) >= 1000:
+                    self._flush(connection, updates)
+
+                for name in children:
+                    child = os.path.join(directory, name)
+                    if name in excluded_names:
+                        continue
+                    if _ParallelScanner._normalize(child) in excluded_paths:
+                        continue
+                    if name == self.TARGET_NAME:
+                        found.append((child, generation))
+                        continue
+                    stack.append(child)
+
+            self._flush(connection, updates)
+            connection.executemany(
+                "INSERT OR REPLACE INTO candidates VALUES (?, ?)", found
+            )
+            connection.execute("DELETE FROM dirs WHERE generation != ?", (generation,))
+            connection.execute(
+                "DELETE FROM candidates WHERE generation != ?", (generation,)
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('generation', ?)",
+                (str(generation),),
+            )
+            connection.commit()
+
+        os.utime(self.path)
+        return visited, rescanned
+
+    @staticmethod
+    def _flush(connection: sqlite3.Connection, updates: list) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)", updates
+        )
+        updates.clear()
+
+    def find(self) -> Iterator[dict[str, str]]:
+        if self.is_stale():
+            _start_background_index_refresh()
+
+        for candidate in self.candidates():
+            result = validate_path(candidate)
+            if result:
+                yield result
+
+
+def _start_background_index_refresh() -> None:
+    script = Path(__file__).resolve()
+    utils.run([sys.executable, str(script), "index"], cwd=script.parent, detach=True)
+
 
-                if "RimWorld" in dirnames:
-                    found_path = Path(dirpath) / "RimWorld"
-                    UI.step(f"Scanning: {found_path}")
-                    result = validate_path(found_path)
-                    if result:
-                        UI.success("Found installation.")
-                        return result
-                    dirnames.remove("RimWorld")
-        except PermissionError:
+def _find_in_index() -> Iterator[dict[str, str]]:
+    for provider in INDEX_PROVIDERS:
+        for result in provider.find():
+            UI.info(f"Found via {type(provider).__name__}.")
+            yield result
+
+
+INDEX_PROVIDERS = [LocateIndexProvider(), DirectoryIndex()]
+
+
+def _discover_installations(registry: InstallRegistry) -> list[dict[str, str]]:
+    seen = {
+        tuple(install["fingerprint"])
+        for install in registry.installs.values()
+        if install.get("fingerprint")
+    }
+    found = []
+    for finder in _get_platform_search_strategy():
+        if finder is _find_with_full_scan:
             continue
+        for result in finder():
+            fingerprint = InstallRegistry._fingerprint(result)
+            key = tuple(fingerprint) if fingerprint else result["directory"]
+            if key not in seen:
+                seen.add(key)
+                found.append(result)
+    return found
+
+
+def _parse_args():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Locate RimWorld installations")
+    parser.add_argument(
+        "--install",
+        help=f"Installation name (default: ${INSTALL_ENV_VAR} or registry default)",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="")
+
+    subparsers.add_parser("list", help="List registered installations")
+    subparsers.add_parser("discover", help="Register all installations found")
+
+    index_parser = subparsers.add_parser(
+        "index", help="Refresh the persistent directory index"
+    )
+    index_parser.add_argument(
+        "--background", action="store_true", help="Refresh in a detached process"
+    )
+
+    add_parser = subparsers.add_parser("add", help="Register an installation")
+    add_parser.add_argument("name", help="Installation name")
+    add_parser.add_argument("path", help="RimWorld directory")
+
+    remove_parser = subparsers.add_parser("remove", help="Forget an installation")
+    remove_parser.add_argument("name", help="Installation name")
+
+    default_parser = subparsers.add_parser(
+        "default", help="Set the default installation"
+    )
+    default_parser.add_argument("name", help="Installation name")
+
+    return parser.parse_args()
 
-    return None
+
+def _run_command(args) -> None:
+    registry = InstallRegistry.load()
+
+    if args.command == "list":
+        if not registry.installs:
+            UI.info("No installations registered.")
+        for name, install in registry.installs.items():
+            marker = "*" if name == registry.default else " "
+            version = install.get("version") or "unknown version"
+            UI.print_line(f"{marker} {name:<20} {version:<14} {install['directory']}")
+
+    elif args.command == "discover":
+        found = _discover_installations(registry)
+        for info in found:
+            UI.success(f"Registered '{registry.add(info)}': {info['directory']}")
+        registry.save()
+        if not found:
+            UI.warn("No new installations found in known locations.")
+
+    elif args.command == "index":
+        if args.background:
+            _start_background_index_refresh()
+            UI.success("Started background index refresh.")
+            return
+        try:
+            with UI.spin("Refreshing directory index..."):
+                counts = DirectoryIndex().refresh()
+        except sqlite3.Error as e:
+            UI.error(f"Could not refresh the directory index: {e}")
+            sys.exit(1)
+        if counts is None:
+            UI.info("Another directory index refresh is already running.")
+            return
+        visited, rescanned = counts
+        UI.info(f"{visited} directories checked, {rescanned} rescanned.")
+
+    elif args.command == "add":
+        info = validate_path(args.path)
+        if not info:
+            UI.error(f"Not a RimWorld installation: {args.path}")
+            sys.exit(1)
+        registry.add(info, args.name)
+        registry.save()
+        UI.success(f"Registered '{args.name}'.")
+
+    elif args.command == "remove":
+        if not registry.remove(args.name):
+            UI.error(f"Unknown installation '{args.name}'.")
+            sys.exit(1)
+        registry.save()
+        UI.success(f"Removed '{args.name}'.")
+
+    elif args.command == "default":
+        if args.name not in registry.installs:
+            UI.error(f"Unknown installation '{args.name}'.")
+            sys.exit(1)
+        registry.default = args.name
+        registry.save()
+        UI.success(f"Default installation is now '{args.name}'.")
 
 
 if __name__ == "__main__":
@@ -332,12 +1118,17 @@ if __name__ == "__main__":
             )
             sys.exit(1)
 
-        result = find_installation()
+        args = _parse_args()
+        if args.command:
+            _run_command(args)
+            sys.exit(0)
+
+        result = find_installation(args.install)
         if result:
             print(json.dumps(result, indent=2))
             sys.exit(0)
         else:
-            UI.error("RimWorld installation not found.", hint="Try running with --scan")
+            UI.error("RimWorld installation not found.")
             sys.exit(1)
     except KeyboardInterrupt:
         UI.error("Cancelled by user.")
@@ -1,4 +1,8 @@
 import argparse
+import json
+import math
+import re
+import shutil
 import sys
 import time
 import os
@@ -9,20 +13,24 @@ import setup
 setup.Runtime.enforce_venv()
 
 import rw_find
+import rw_log
+import rw_window
 import utils
 from utils import UI
 
 
-RIMWORLD_APP_ID = "294100"
+RIMWORLD_APP_ID = rw_find.RIMWORLD_APP_ID
 TIMEOUT = 30
+SHUTDOWN_TIMEOUT = 10
 
 
-def find_and_kill(executable_name: str):
+def find_and_kill(executable_name: str, timeout: float = SHUTDOWN_TIMEOUT) -> int:
     import psutil
 
     process_name_with_ext = executable_name
     process_name_without_ext = os.path.splitext(executable_name)[0]
 
+    procs = []
     for proc in psutil.process_iter(["name", "pid"]):
         try:
             proc_name = proc.info["name"]
@@ -31,8 +39,7 @@ def find_and_kill(executable_name: str):
                 process_name_without_ext.lower(),
             ]:
                 UI.step(f"Terminating process {proc_name} (PID: {proc.info['pid']})...")
-                p = psutil.Process(proc.info["pid"])
-                p.kill()
+                procs.append(proc)
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             pass
         except (psutil.Error, OSError) as e:
@@ -41,8 +48,30 @@ def find_and_kill(executable_name: str):
                 f"(PID: {proc.info.get('pid', '')}): {e}"
             )
 
+    stop_processes(procs, timeout)
+    return len(procs)
 
-def launch(directory: Path, executable: str):
+
+def stop_processes(procs, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+    import psutil
+
+    for proc in procs:
+        try:
+            proc.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for proc in alive:
+        try:
+            UI.warn(f"Process {proc.pid} ignored terminate; killing it.")
+            proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    psutil.wait_procs(alive, timeout=timeout)
+
+
+def launch(directory: Path, executable: str, extra_args: list[str] | None = None):
     import subprocess
 
     exe_path = directory / executable
@@ -56,7 +85,7 @@ def launch(directory: Path, executable: str):
             UI.warn(f"Could not set executable permission on '{exe_path}': {e}")
 
     process = subprocess.Popen(
-        [str(exe_path)],
+        [str(exe_path)] + (extra_args or []),
         cwd=str(directory),
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
@@ -84,15 +113,44 @@ def launch_steam_game(app_id: str):
         sys.exit(1)
 
 
-def position_on_monitor(process, monitor_index: int, maximize: bool):
+def position_on_monitor(
+    process, monitor_index: int, maximize: bool, tile: tuple[int, int] = (0, 1)
+):
     if sys.platform == "win32":
-        _position_window_windows(process, monitor_index, maximize)
+        _position_window_windows(process, monitor_index, maximize, tile)
     elif sys.platform == "linux":
-        _position_window_linux(process, monitor_index, maximize)
+        _position_window_linux(process, monitor_index, maximize, tile)
     else:
         UI.warn(f"Window management not implemented for {sys.platform}")
 
 
+def monitor_count() -> int:
+    if sys.platform == "win32":
+        import win32api
+
+        return max(1, len(win32api.EnumDisplayMonitors()))
+    if sys.platform == "linux":
+        with rw_window.get_backend() as backend:
+            return max(1, len(backend.monitors()))
+    return 1
+
+
+def _tile_rect(
+    monitor: tuple[int, int, int, int], tile: tuple[int, int]
+) -> tuple[int, int, int, int]:
+    slot, count = tile
+    x, y, width, height = monitor
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    cell_width, cell_height = width // columns, height // rows
+    return (
+        x + (slot % columns) * cell_width,
+        y + (slot // columns) * cell_height,
+        cell_width,
+        cell_height,
+    )
+
+
 if sys.platform == "win32":
 
     def _find_window_for_pid_win(pid):
@@ -116,7 +174,9 @@ if sys.platform == "win32":
             time.sleep(0.5)
         return None
 
-    def _position_window_windows(process, monitor_index: int, maximize: bool):
+    def _position_window_windows(
+        process, monitor_index: int, maximize: bool, tile: tuple[int, int]
+    ):
         import win32api
         import win32con
         import win32gui
@@ -138,61 +198,43 @@ if sys.platform == "win32":
         monitor_handle = monitors[monitor_index][0]
         monitor_info = win32api.GetMonitorInfo(monitor_handle)  # type: ignore[arg-type]
         work_area = monitor_info["Work"]
-        left, top = work_area[0], work_area[1]
+        left, top, width, height = _tile_rect(
+            (
+                work_area[0],
+                work_area[1],
+                work_area[2] - work_area[0],
+                work_area[3] - work_area[1],
+            ),
+            tile,
+        )
+        tiled = tile[1] > 1
+
+        flags = win32con.SWP_NOZORDER | win32con.SWP_SHOWWINDOW
+        if not tiled:
+            flags |= win32con.SWP_NOSIZE
+            width = height = 0
 
         win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
         time.sleep(0.25)
-        win32gui.SetWindowPos(
-            hwnd,
-            win32con.HWND_TOP,
-            left,
-            top,
-            0,
-            0,
-            win32con.SWP_NOSIZE | win32con.SWP_NOZORDER | win32con.SWP_SHOWWINDOW,
-        )
+        win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, left, top, width, height, flags)
         time.sleep(0.25)
-        if maximize:
+        if maximize and not tiled:
             win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
 
 
 if sys.platform == "linux":
 
-    def _check_command_exists_linux(cmd: str) -> bool:
-        try:
-            utils.run(["which", cmd], capture=True)
-            return True
-        except Exception:
-            return False
-
-    def _find_window_id_for_pid_linux(pid: int) -> str | None:
-        start_time = time.time()
-        while time.time() - start_time < TIMEOUT:
-            try:
-                result = utils.run(["wmctrl", "-lp"], capture=True)
-                for line in result.stdout.strip().split("\n"):
-                    parts = line.split()
-                    if len(parts) >= 3 and int(parts[2]) == pid:
-                        return parts[0]
-            except (Exception, ValueError):
-                pass
-            time.sleep(0.5)
-        return None
-
-    def _get_linux_monitor_geometry(monitor_index: int) -> tuple[int, int]:
-        try:
-            result = utils.run(["xrandr", "--query"], capture=True)
-
-            import re
-
-            monitors = re.findall(
-                r"(\S+) connected (?:primary )?(\d+)x(\d+)\+(\d+)\+(\d+)",
-                result.stdout,
-            )
-
-            if not monitors:
-                raise RuntimeError("Could not parse monitor geometry from xrandr.")
-
+    def _position_window_linux(
+        process, monitor_index: int, maximize: bool, tile: tuple[int, int]
+    ):
+        with rw_window.get_backend() as backend:
+            start_time = time.perf_counter()
+            window = backend.wait_for_window(process.pid, TIMEOUT)
+            if not window:
+                raise RuntimeError("Timed out waiting for the process window.")
+            found_time = time.perf_counter()
+
+            monitors = backend.monitors()
             if monitor_index >= len(monitors) or monitor_index < 0:
                 UI.warn(
                     f"Monitor index {monitor_index} is out of range. "
@@ -200,45 +242,22 @@ if sys.platform == "linux":
                 )
                 monitor_index = 0
 
-            target_monitor = monitors[monitor_index]
-            return int(target_monitor[3]), int(target_monitor[4])
-        except Exception as e:
-            raise RuntimeError(
-                "'xrandr' is required on Linux to get monitor geometry."
-            ) from e
-
-    def _position_window_linux(process, monitor_index: int, maximize: bool):
-        if not _check_command_exists_linux("wmctrl"):
-            raise RuntimeError(
-                "`wmctrl` is not installed. Please install it (e.g., 'sudo apt-get install wmctrl')."
-            )
-
-        with UI.spin("Waiting for window creation..."):
-            win_id = _find_window_id_for_pid_linux(process.pid)
-
-        if not win_id:
-            raise RuntimeError("Timed out waiting for the process window.")
-
-        x, y = _get_linux_monitor_geometry(monitor_index)
-
-        utils.run(
-            ["wmctrl", "-ir", win_id, "-b", "remove,maximized_vert,maximized_horz"],
-            capture=True,
-        )
-        time.sleep(0.25)
-        utils.run(["wmctrl", "-ir", win_id, "-e", f"0,{x},{y},-1,-1"], capture=True)
-        time.sleep(0.25)
+            x, y, width, height = _tile_rect(monitors[monitor_index], tile)
+            if tile[1] > 1:
+                backend.place(window, x, y, False, (width, height))
+            else:
+                backend.place(window, x, y, maximize)
 
-        if maximize:
-            utils.run(
-                ["wmctrl", "-ir", win_id, "-b", "add,maximized_vert,maximized_horz"],
-                capture=True,
+            UI.info(
+                f"Window 0x{window:x} found in {found_time - start_time:.2f}s, "
+                f"placed in {(time.perf_counter() - found_time) * 1000:.0f}ms "
+                f"({backend.name()} backend)."
             )
 
 
 def launch_direct(args):
     UI.step("Locating RimWorld installation...")
-    info = rw_find.find_installation()
+    info = rw_find.find_installation(args.install)
     if not info:
         raise RuntimeError("RimWorld installation not found.")
 
@@ -246,7 +265,6 @@ def launch_direct(args):
 
     if args.clear_launch:
         find_and_kill(info["executable"])
-        time.sleep(0.5)
 
     UI.step(f"Launching executable...")
     rw_proc = launch(Path(info["directory"]), info["executable"])
@@ -254,29 +272,387 @@ def launch_direct(args):
 
     if args.no_manage_window:
         UI.info("Window management disabled.")
-        return
-
-    if not args.no_manage_window:
+    else:
         with UI.spin(f"Positioning window on monitor {args.monitor}..."):
             position_on_monitor(rw_proc, args.monitor, not args.no_maximize)
 
-    UI.success("Window positioned.")
-    UI.success("RimWorld is running.")
+        UI.success("Window positioned.")
+        UI.success("RimWorld is running.")
+
+    if args.follow:
+        follow_log(args, rw_proc)
+
+
+class InstanceManager:
+    ROOT = utils.Paths.INSTANCES
+    STATE_FILE = ROOT / "state.json"
+    TEMPLATE_DIRS = ["Config"]
+
+    def __init__(self, info: dict[str, str], template: Path | None = None):
+        self.info = info
+        self.template = template or rw_log.save_data_folder()
+        self.state = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            return json.loads(self.STATE_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        utils.Fs.ensure_dir(self.ROOT)
+        temp = self.STATE_FILE.with_suffix(".tmp")
+        temp.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        os.replace(temp, self.STATE_FILE)
+
+    def data_dir(self, index: int) -> Path:
+        return self.ROOT / f"instance-{index}"
+
+    def prepare(self, index: int) -> Path:
+        data_dir = self.data_dir(index)
+        for name in self.TEMPLATE_DIRS:
+            source, target = self.template / name, data_dir / name
+            if source.is_dir() and not target.exists():
+                shutil.copytree(source, target)
+        utils.Fs.ensure_dir(data_dir / "Saves")
+        return data_dir
+
+    def process(self, index: int):
+        import psutil
+
+        entry = self.state.get(str(index))
+        if not entry:
+            return None
+        try:
+            proc = psutil.Process(entry["pid"])
+            if abs(proc.create_time() - entry["create_time"]) > 1:
+                return None
+            return proc
+        except psutil.NoSuchProcess:
+            return None
+
+    def launch(self, index: int):
+        import psutil
+
+        data_dir = self.prepare(index)
+        process = launch(
+            Path(self.info["directory"]),
+            self.info["executable"],
+            [f"-savedatafolder={data_dir}", "-logfile", str(data_dir / "Player.log")],
+        )
+        self.state[str(index)] = {
+            "pid": process.pid,
+            "create_time": psutil.Process(process.pid).create_time(),
+            "data_dir": str(data_dir),
+        }
+        self._save()
+        return process
+
+    def stop(self, index: int) -> bool:
+        proc = self.process(index)
+        if proc:
+            UI.step(f"Stopping instance {index} (PID: {proc.pid})...")
+            stop_processes([proc])
+        stopped = self.state.pop(str(index), None) is not None
+        self._save()
+        return stopped and proc is not None
+
+    def indices(self) -> list[int]:
+        return sorted(int(index) for index in self.state)
+
+    def report(self) -> None:
+        if not self.state:
+            UI.info("No tracked instances.")
+            return
+        UI.header("Instances")
+        for index in self.indices():
+            entry = self.state[str(index)]
+            status = "running" if self.process(index) else "exited"
+            UI.print_line(
+                f"{index:>3}  {status:<8} PID {entry['pid']:<8} {entry['data_dir']}"
+            )
+
+
+def _instance_layout(index: int, total: int, monitors: int, first_monitor: int):
+    monitor = (first_monitor + index) % monitors
+    sharing = [i for i in range(total) if (first_monitor + i) % monitors == monitor]
+    return monitor, (sharing.index(index), len(sharing))
+
+
+def _position_instance(args, process, index: int, total: int, monitors: int):
+    monitor, tile = _instance_layout(index, total, monitors, args.monitor)
+    position_on_monitor(process, monitor, not args.no_maximize, tile)
+
+
+def launch_instances(args):
+    info = rw_find.find_installation(args.install)
+    if not info:
+        raise RuntimeError("RimWorld installation not found.")
+
+    manager = InstanceManager(info, args.template)
+    if args.clear_launch:
+        for index in manager.indices():
+            manager.stop(index)
+
+    processes = {}
+    for index in range(args.instances):
+        if manager.process(index):
+            UI.warn(f"Instance {index} is already running; skipping.")
+            continue
+        processes[index] = manager.launch(index)
+        UI.success(f"Instance {index} started (PID: {processes[index].pid}).")
+
+    if args.no_manage_window or not processes:
+        return
+
+    monitors = monitor_count()
+    with UI.spin(f"Tiling {len(processes)} windows across {monitors} monitor(s)..."):
+        for index, process in processes.items():
+            _position_instance(args, process, index, args.instances, monitors)
+
+
+def manage_instances(args):
+    info = rw_find.find_installation(args.install)
+    if not info:
+        raise RuntimeError("RimWorld installation not found.")
+
+    manager = InstanceManager(info, args.template)
+    indices = args.indices or manager.indices()
+
+    if args.action == "list":
+        manager.report()
+        return
+
+    for index in indices:
+        stopped = manager.stop(index)
+        if args.action == "kill":
+            if stopped:
+                UI.success(f"Instance {index} stopped.")
+            else:
+                UI.info(f"Instance {index} was not running.")
+            continue
+
+        process = manager.launch(index)
+        UI.success(f"Instance {index} restarted (PID: {process.pid}).")
+        if not args.no_manage_window:
+            total = max(manager.indices()) + 1
+            _position_instance(args, process, index, total, monitor_count())
+
+
+def follow_log(args, process=None):
+    log_path = rw_log.PlayerLog.default_path()
+    UI.header(f"Following {log_path}")
+    follower = rw_log.LogFollower(log_path, rw_log.create_filter(args))
+    follower.follow(process)
 
 
 def launch_steam(args):
     if args.clear_launch:
         UI.step("Attempting to terminate existing RimWorld processes...")
         try:
-            info = rw_find.find_installation()
+            info = rw_find.find_installation(args.install)
             if info:
                 find_and_kill(info["executable"])
-                time.sleep(0.5)
         except RuntimeError:
             UI.warn("Could not find RimWorld executable to terminate.")
 
     launch_steam_game(RIMWORLD_APP_ID)
 
+    if args.follow:
+        follow_log(args)
+
+
+class LoadPhaseTracker:
+    PHASES = [
+        ("engine", r"^Initialize engine version"),
+        ("verse", r"^RimWorld \d+\.\d+"),
+        ("microtools", r"\[Microtools\]"),
+    ]
+    POLL_INTERVAL = 0.05
+
+    def __init__(
+        self, log_path: Path, ready_pattern: str | None = None, settle: float = 10.0
+    ):
+        self.log_path = log_path
+        self.phases = [(name, re.compile(pattern)) for name, pattern in self.PHASES]
+        self.ready_pattern = re.compile(ready_pattern) if ready_pattern else None
+        self.settle = settle
+
+    def follow(self, process, start_time: float, timeout: float) -> dict[str, float]:
+        timings: dict[str, float] = {}
+        offset = 0
+        partial = b""
+        last_line_time = None
+
+        while True:
+            now = time.perf_counter()
+            try:
+                with open(self.log_path, "rb") as f:
+                    f.seek(offset)
+                    chunk = f.read()
+            except FileNotFoundError:
+                chunk = b""
+            offset += len(chunk)
+
+            lines = (partial + chunk).split(b"\n")
+            partial = lines.pop()
+            for raw in lines:
+                line = raw.decode("utf-8", errors="replace").rstrip("\r")
+                last_line_time = now
+                for name, pattern in self.phases:
+                    if name not in timings and pattern.search(line):
+                        timings[name] = now - start_time
+                if self.ready_pattern and self.ready_pattern.search(line):
+                    timings["ready"] = now - start_time
+                    return timings
+
+            if (
+                not self.ready_pattern
+                and last_line_time is not None
+                and "verse" in timings
+                and now - last_line_time >= self.settle
+            ):
+                timings["ready"] = last_line_time - start_time
+                return timings
+
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Game exited with code {process.returncode} before it finished loading."
+                )
+            if now - start_time > timeout:
+                raise RuntimeError(f"Game did not finish loading within {timeout}s.")
+            time.sleep(self.POLL_INTERVAL)
+
+
+class StartupBench:
+    OUTPUT_DIR = utils.Paths.BUILD / "bench"
+    MODES = ["linked", "unlinked"]
+
+    def __init__(self, args):
+        self.args = args
+        self.info = rw_find.find_installation(args.install)
+        if not self.info:
+            raise RuntimeError("RimWorld installation not found.")
+
+        if args.executable:
+            executable = Path(args.executable).resolve()
+            self.directory, self.executable = executable.parent, executable.name
+        else:
+            self.directory = Path(self.info["directory"])
+            self.executable = self.info["executable"]
+
+        self.source_mods = utils.Paths.PROJECT / "Mods"
+        self.target_mods = Path(self.info["mods"])
+
+    def _is_linked(self) -> bool:
+        import rw_link
+
+        return rw_link.is_deployed(self.source_mods, self.target_mods)
+
+    def _set_mode(self, mode: str) -> None:
+        import rw_link
+
+        if mode == "linked":
+            rw_link.deploy_mods(self.source_mods, self.target_mods)
+        else:
+            rw_link.undeploy_mods(self.source_mods, self.target_mods)
+        if self._is_linked() != (mode == "linked"):
+            raise RuntimeError(f"Could not switch Microtools to '{mode}'.")
+
+    @staticmethod
+    def _stop(process) -> None:
+        import psutil
+
+        try:
+            parent = psutil.Process(process.pid)
+            procs = parent.children(recursive=True) + [parent]
+        except psutil.NoSuchProcess:
+            return
+        stop_processes(procs, timeout=5)
+
+    def _run_once(self, mode: str, index: int) -> dict[str, float]:
+        log_path = self.OUTPUT_DIR / f"{mode}-{index + 1}.log"
+        log_path.unlink(missing_ok=True)
+        tracker = LoadPhaseTracker(log_path, self.args.ready_pattern, self.args.settle)
+
+        find_and_kill(self.executable)
+        start_time = time.perf_counter()
+        process = launch(self.directory, self.executable, ["-logfile", str(log_path)])
+        try:
+            return tracker.follow(process, start_time, self.args.timeout)
+        finally:
+            self._stop(process)
+
+    @staticmethod
+    def percentile(values: list[float], fraction: float) -> float:
+        ordered = sorted(values)
+        position = (len(ordered) - 1) * fraction
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    def run(self) -> dict[str, list[dict[str, float]]]:
+        utils.Fs.ensure_dir(self.OUTPUT_DIR)
+        modes = self.MODES if self.args.mode == "both" else [self.args.mode]
+        was_linked = self._is_linked()
+        results: dict[str, list[dict[str, float]]] = {}
+
+        try:
+            for mode in modes:
+                UI.header(f"Startup benchmark: Microtools {mode}")
+                self._set_mode(mode)
+                results[mode] = []
+                for index in range(self.args.runs):
+                    with UI.spin(f"Run {index + 1}/{self.args.runs}..."):
+                        timings = self._run_once(mode, index)
+                    results[mode].append(timings)
+                    UI.info(
+                        ", ".join(
+                            f"{k} {v:.2f}s"
+                            for k, v in sorted(timings.items(), key=lambda kv: kv[1])
+                        )
+                    )
+        finally:
+            if self._is_linked() != was_linked:
+                self._set_mode("linked" if was_linked else "unlinked")
+
+        return results
+
+    def report(self, results: dict[str, list[dict[str, float]]]) -> None:
+        phases = [name for name, _ in LoadPhaseTracker.PHASES] + ["ready"]
+        UI.header("Startup timings (seconds since launch)")
+        UI.print_line(
+            f"{'phase':<12} {'mode':<10} {'n':>3} {'mean':>8} {'p50':>8} {'p95':>8}"
+        )
+        for phase in phases:
+            for mode, runs in results.items():
+                values = [run[phase] for run in runs if phase in run]
+                if not values:
+                    continue
+                UI.print_line(
+                    f"{phase:<12} {mode:<10} {len(values):>3} "
+                    f"{sum(values) / len(values):>8.2f} "
+                    f"{self.percentile(values, 0.5):>8.2f} "
+                    f"{self.percentile(values, 0.95):>8.2f}"
+                )
+
+        if "linked" in results and "unlinked" in results:
+            linked = [run["ready"] for run in results["linked"]]
+            unlinked = [run["ready"] for run in results["unlinked"]]
+            delta = sum(linked) / len(linked) - sum(unlinked) / len(unlinked)
+            UI.info(f"Microtools adds {delta:+.2f}s to mean time-to-ready.")
+
+        output = self.OUTPUT_DIR / f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        UI.info(f"Raw results: {output}")
+
+
+def run_bench(args):
+    if args.runs < 1:
+        raise RuntimeError("--runs must be at least 1.")
+    bench = StartupBench(args)
+    bench.report(bench.run())
+
 
 def main():
     env = setup.Environment(setup.MANIFEST)
@@ -294,6 +670,10 @@ def main():
         default="steam",
         help="Launch method: direct (executable) or steam (Steam client)",
     )
+    parser.add_argument(
+        "--install",
+        help="Registered installation name (see 'rw_find.py list')",
+    )
     parser.add_argument(
         "-c",
         "--clear-launch",
@@ -318,11 +698,78 @@ def main():
         action="store_true",
         help="Position window without maximizing (direct only)",
     )
+    parser.add_argument(
+        "-f",
+        "--follow",
+        action="store_true",
+        help="Stream Player.log after launching",
+    )
+    parser.add_argument(
+        "-n",
+        "--instances",
+        type=int,
+        help="Launch N isolated instances with their own data folders (direct only)",
+    )
+    parser.add_argument(
+        "--template",
+        type=Path,
+        help="Data folder to copy Config from for new instances "
+        "(default: the game's own data folder)",
+    )
+    rw_log.add_filter_arguments(parser)
+
+    subparsers = parser.add_subparsers(dest="command", metavar="")
+    bench_parser = subparsers.add_parser(
+        "bench", help="Measure startup time with Microtools linked and unlinked"
+    )
+    bench_parser.add_argument(
+        "--runs", type=int, default=5, help="Launches per mode (default: 5)"
+    )
+    bench_parser.add_argument(
+        "--mode",
+        choices=["both"] + StartupBench.MODES,
+        default="both",
+        help="Which link states to measure (default: both)",
+    )
+    bench_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600,
+        help="Seconds to wait for a run to finish loading (default: 600)",
+    )
+    bench_parser.add_argument(
+        "--settle",
+        type=float,
+        default=10,
+        help="Seconds of log silence that mark loading as done (default: 10)",
+    )
+    bench_parser.add_argument(
+        "--ready-pattern",
+        help="Regex on a Player.log line that marks loading as done",
+    )
+    bench_parser.add_argument(
+        "--executable",
+        help="Launch this executable instead of the installed game",
+    )
+
+    instance_parser = subparsers.add_parser(
+        "instance", help="List, kill or restart launched instances"
+    )
+    instance_parser.add_argument("action", choices=["list", "kill", "restart"])
+    instance_parser.add_argument(
+        "indices", type=int, nargs="*", help="Instance numbers (default: all)"
+    )
 
     args = parser.parse_args()
 
     try:
-        if args.method == "direct":
+        if args.command == "bench":
+            run_bench(args)
+        elif args.command == "instance":
+            manage_instances(args)
+        elif args.instances:
+            launch_instances(args)
+        elif args.method == "direct":
             launch_direct(args)
         elif args.method == "steam":
             launch_steam(args)
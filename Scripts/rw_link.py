@@ -1,5 +1,11 @@
 import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import shutil
 import sys
+import time
 from pathlib import Path
 
 import setup
@@ -61,12 +67,261 @@ def _unlink_all_mods(source_root: Path, target_root: Path) -> None:
     UI.success("Mod unlinking completed.")
 
 
-def _resolve_target_mods_directory() -> Path:
-    installation = find_installation()
+class ModSync:
+    MANIFEST_DIR = Paths.SYNC
+    LEGACY_MANIFEST_DIR = Paths.CACHE / "sync"
+    MARKER = ".rw_link_sync"
+    WORKERS = 8
+
+    def __init__(self, source: Path, target: Path):
+        self.source = source
+        self.target = target
+        key = hashlib.sha1(str(target.resolve()).encode()).hexdigest()[:12]
+        self.manifest_path = self.MANIFEST_DIR / f"{source.name}-{key}.json"
+        self._migrate_legacy_manifest()
+
+    def _migrate_legacy_manifest(self) -> None:
+        legacy = self.LEGACY_MANIFEST_DIR / self.manifest_path.name
+        if self.manifest_path.exists() or not legacy.exists():
+            return
+        try:
+            Fs.ensure_dir(self.manifest_path.parent)
+            os.replace(legacy, self.manifest_path)
+        except OSError:
+            pass
+
+    def is_synced(self) -> bool:
+        return self.manifest_path.exists() or (self.target / self.MARKER).is_file()
+
+    def _load_manifest(self) -> dict[str, list]:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: dict[str, list]) -> None:
+        Fs.ensure_dir(self.manifest_path.parent)
+        temp = self.manifest_path.with_suffix(".tmp")
+        temp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(temp, self.manifest_path)
+
+    def _scan_source(self) -> dict[str, os.stat_result]:
+        files = {}
+        stack = [""]
+        while stack:
+            relative = stack.pop()
+            with os.scandir(self.source / relative) as entries:
+                for entry in entries:
+                    path = f"{relative}/{entry.name}" if relative else entry.name
+                    if entry.is_dir():
+                        stack.append(path)
+                    elif entry.is_file():
+                        files[path] = entry.stat()
+        return files
+
+    @staticmethod
+    def _hash(path: Path) -> str | None:
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _needs_copy(
+        self, relative: str, size: int, digest: str | None, entry: list | None
+    ) -> bool:
+        target = self.target / relative
+        try:
+            if target.stat().st_size != size:
+                return True
+        except OSError:
+            return True
+        if entry and entry[2] == digest:
+            return False
+        return self._hash(target) != digest
+
+    def _copy(self, relative: str) -> None:
+        source = self.source / relative
+        target = self.target / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(source, temp)
+            shutil.copystat(source, temp)
+            os.replace(temp, target)
+        finally:
+            temp.unlink(missing_ok=True)
+
+    def _remove(self, relative: str) -> None:
+        target = self.target / relative
+        target.unlink(missing_ok=True)
+        parent = target.parent
+        while parent != self.target:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+    def run(self) -> tuple[int, int, int]:
+        if self.target.is_symlink():
+            self.target.unlink()
+        Fs.ensure_dir(self.target)
+        marker = self.target / self.MARKER
+        if not marker.is_file():
+            marker.write_text(f"{self.source.resolve()}\n", encoding="utf-8")
+
+        manifest = self._load_manifest()
+        files = self._scan_source()
+
+        changed = []
+        for relative, st in files.items():
+            entry = manifest.get(relative)
+            if (
+                entry
+                and entry[0] == st.st_size
+                and entry[1] == st.st_mtime_ns
+                and (self.target / relative).exists()
+            ):
+                continue
+            changed.append(relative)
+
+        with concurrent.futures.ThreadPoolExecutor(self.WORKERS) as pool:
+            digests = dict(
+                zip(changed, pool.map(lambda r: self._hash(self.source / r), changed))
+            )
+            to_copy = [
+                relative
+                for relative in changed
+                if self._needs_copy(
+                    relative,
+                    files[relative].st_size,
+                    digests[relative],
+                    manifest.get(relative),
+                )
+            ]
+            list(pool.map(self._copy, to_copy))
+
+        removed = [relative for relative in manifest if relative not in files]
+        for relative in removed:
+            self._remove(relative)
+
+        new_manifest = {}
+        for relative, st in files.items():
+            digest = digests.get(relative) or manifest[relative][2]
+            new_manifest[relative] = [st.st_size, st.st_mtime_ns, digest]
+        if new_manifest != manifest:
+            self._save_manifest(new_manifest)
+
+        return len(to_copy), len(removed), len(files)
+
+
+def _sync_all_mods(source_root: Path, target_root: Path) -> None:
+    if not source_root.exists():
+        UI.warn(f"No Mods directory found at {source_root}")
+        return
+
+    UI.header("Syncing Mods")
+
+    for item in source_root.iterdir():
+        if not item.is_dir():
+            continue
+        start_time = time.perf_counter()
+        try:
+            copied, removed, total = ModSync(item, target_root / item.name).run()
+        except OSError as error:
+            UI.error(f"Failed to sync {item.name}: {error}")
+            continue
+        elapsed = (time.perf_counter() - start_time) * 1000
+        UI.success(
+            f"Synced {item.name}: {copied} copied, {removed} removed, "
+            f"{total - copied} unchanged ({elapsed:.0f} ms)"
+        )
+
+    UI.success("Mod sync completed.")
+
+
+def _mod_sources(source_root: Path) -> list[Path]:
+    if not source_root.exists():
+        return []
+    return sorted(item for item in source_root.iterdir() if item.is_dir())
+
+
+def deployment_mode(source: Path, target: Path) -> str | None:
+    if target.is_symlink():
+        return "link"
+    if ModSync(source, target).is_synced():
+        return "sync"
+    if target.exists():
+        return "foreign"
+    return None
+
+
+def is_deployed(source_root: Path, target_root: Path) -> bool:
+    mods = _mod_sources(source_root)
+    for source in mods:
+        target = target_root / source.name
+        mode = deployment_mode(source, target)
+        if mode == "link" and target.resolve() == source.resolve():
+            continue
+        if mode == "sync" and target.is_dir():
+            continue
+        return False
+    return bool(mods)
+
+
+def deploy_mods(source_root: Path, target_root: Path, mode: str | None = None) -> None:
+    for source in _mod_sources(source_root):
+        target = target_root / source.name
+        current = deployment_mode(source, target)
+        if mode != "link" and current == "sync":
+            copied, removed, _ = ModSync(source, target).run()
+            if copied or removed:
+                UI.success(f"Synced {source.name}: {copied} copied, {removed} removed")
+            continue
+        if current == "link" and target.resolve() == source.resolve():
+            continue
+
+        try:
+            Fs.create_symlink(source, target)
+            UI.success(f"Linked {source.name}")
+        except FileExistsError:
+            raise RuntimeError(
+                f"{target} exists and is not managed by rw_link. Remove it, or run "
+                "'rw_link.py sync' to manage it as a copy."
+            )
+        except OSError as error:
+            if mode == "link":
+                raise RuntimeError(f"Could not link {source.name}: {error}")
+            UI.warn(f"Could not link {source.name} ({error}); syncing a copy instead.")
+            ModSync(source, target).run()
+
+
+def undeploy_mods(source_root: Path, target_root: Path) -> None:
+    for source in _mod_sources(source_root):
+        target = target_root / source.name
+        mode = deployment_mode(source, target)
+        if mode == "link":
+            target.unlink()
+            UI.success(f"Unlinked {source.name}")
+        elif mode == "sync" and target.exists():
+            shutil.rmtree(target)
+            UI.success(f"Removed synced copy of {source.name}")
+        elif mode == "foreign":
+            raise RuntimeError(
+                f"{target} exists and is not managed by rw_link. Refusing to delete."
+            )
+
+
+def _resolve_target_mods_directory(install: str | None) -> Path:
+    installation = find_installation(install)
     if not installation:
         UI.error("RimWorld installation not found.")
         sys.exit(1)
-    return Path(installation["directory"]) / "Mods"
+    return Path(installation["mods"])
 
 
 def _ensure_environment() -> None:
@@ -82,10 +337,17 @@ def _ensure_environment() -> None:
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Manage mod symlinks")
+    parser.add_argument(
+        "--install",
+        help="Registered installation name (see 'rw_find.py list')",
+    )
     subparsers = parser.add_subparsers(dest="command", metavar="")
 
     subparsers.add_parser("link", help="Create symlinks for all mods")
     subparsers.add_parser("unlink", help="Remove symlinks for all mods")
+    subparsers.add_parser(
+        "sync", help="Copy changed files instead of linking (no symlink support)"
+    )
 
     if len(sys.argv) == 1:
         parser.print_help(sys.stderr)
@@ -98,13 +360,15 @@ def run():
     _ensure_environment()
     args = _parse_args()
 
-    target_mods_path = _resolve_target_mods_directory()
+    target_mods_path = _resolve_target_mods_directory(args.install)
     source_mods_path = Paths.PROJECT / "Mods"
 
     if args.command == "link":
         _link_all_mods(source_mods_path, target_mods_path)
     elif args.command == "unlink":
         _unlink_all_mods(source_mods_path, target_mods_path)
+    elif args.command == "sync":
+        _sync_all_mods(source_mods_path, target_mods_path)
 
 
 if __name__ == "__main__":
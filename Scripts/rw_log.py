@@ -0,0 +1,547 @@
+import argparse
+import concurrent.futures
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import mmap
+import os
+import re
+import select
+import sys
+import time
+from pathlib import Path
+
+import setup
+from utils import UI, Colors
+
+
+class PlayerLog:
+    COMPANY = "Ludeon Studios"
+    PRODUCT = "RimWorld by Ludeon Studios"
+    PREFIX = b"[Microtools]"
+
+    @classmethod
+    def default_path(cls) -> Path:
+        if sys.platform == "win32":
+            base = Path.home() / "AppData" / "LocalLow"
+        elif sys.platform == "darwin":
+            base = Path.home() / "Library" / "Logs"
+        else:
+            base = Path.home() / ".config" / "unity3d"
+        return base / cls.COMPANY / cls.PRODUCT / "Player.log"
+
+
+def save_data_folder() -> Path:
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "RimWorld"
+    return PlayerLog.default_path().parent
+
+
+class _Inotify:
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_NONBLOCK = 0x800
+    IN_CLOEXEC = 0x80000
+
+    def __init__(self, directory: Path):
+        self.fd = -1
+        if sys.platform != "linux":
+            return
+
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            return
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+
+        mask = (
+            self.IN_MODIFY
+            | self.IN_CLOSE_WRITE
+            | self.IN_MOVED_TO
+            | self.IN_CREATE
+            | self.IN_DELETE
+        )
+        if libc.inotify_add_watch(fd, str(directory).encode(), mask) < 0:
+            os.close(fd)
+            return
+        self.fd = fd
+
+    @property
+    def active(self) -> bool:
+        return self.fd >= 0
+
+    def wait(self, timeout: float) -> None:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class LogFilter:
+    EXCEPTION = re.compile(rb"Exception\b|^Error\b|\bError in\b")
+    MAX_RECORD_LINES = 200
+
+    def __init__(
+        self,
+        show_all: bool = False,
+        tags: list[str] | None = None,
+        pattern: str | None = None,
+    ):
+        self.show_all = show_all
+        self.tags = [f"[Microtools] [{tag}]".encode() for tag in tags or []]
+        self.pattern = re.compile(pattern.encode()) if pattern else None
+        self.record: list[bytes] = []
+        self.record_matches = False
+
+    def _matches(self, line: bytes) -> bool:
+        if self.pattern and not self.pattern.search(line):
+            return False
+        if self.show_all:
+            return True
+        if self.tags:
+            return any(tag in line for tag in self.tags)
+        return PlayerLog.PREFIX in line or b"Microtools." in line
+
+    def _format(self, lines: list[bytes], exception: bool) -> str:
+        color = Colors.RED if exception else ""
+        out = []
+        for index, line in enumerate(lines):
+            text = line.decode("utf-8", errors="replace").rstrip("\r")
+            if exception:
+                shade = color if index == 0 else Colors.DIM
+                out.append(f"{shade}{text}{Colors.RESET}\n")
+            elif PlayerLog.PREFIX in line:
+                out.append(f"{Colors.CYAN}{text}{Colors.RESET}\n")
+            else:
+                out.append(text + "\n")
+        return "".join(out)
+
+    def flush(self) -> str:
+        if not self.record:
+            return ""
+        lines, matches = self.record, self.record_matches
+        self.record, self.record_matches = [], False
+        if not matches:
+            return ""
+        return self._format(lines, self.EXCEPTION.search(lines[0]) is not None)
+
+    def feed(self, lines: list[bytes]) -> str:
+        out = []
+        for line in lines:
+            if self.record:
+                if line.strip() and len(self.record) < self.MAX_RECORD_LINES:
+                    self.record.append(line)
+                    self.record_matches = self.record_matches or self._matches(line)
+                    continue
+                out.append(self.flush())
+
+            if self.EXCEPTION.search(line):
+                self.record = [line]
+                self.record_matches = self._matches(line)
+            elif self._matches(line):
+                out.append(self._format([line], False))
+        return "".join(out)
+
+
+class LogFollower:
+    CHUNK_SIZE = 1024 * 1024
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, path: Path, log_filter: LogFilter, from_start: bool = False):
+        self.path = path
+        self.filter = log_filter
+        self.from_start = from_start
+        self.file = None
+        self.inode = None
+        self.partial = b""
+
+    def _open(self, at_end: bool) -> bool:
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return False
+        if self.file:
+            self.file.close()
+        self.file = f
+        self.inode = os.fstat(f.fileno()).st_ino
+        self.partial = b""
+        if at_end:
+            f.seek(0, os.SEEK_END)
+        return True
+
+    def _check_rotation(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        if self.file is None or st.st_ino != self.inode:
+            if self.file is not None:
+                UI.info(f"{self.path.name} was recreated; following the new file.")
+            self._open(at_end=False)
+        elif st.st_size < self.file.tell():
+            UI.info(f"{self.path.name} was truncated; following from the start.")
+            self.file.seek(0)
+            self.partial = b""
+
+    def _drain(self) -> None:
+        while self.file:
+            chunk = self.file.read(self.CHUNK_SIZE)
+            if not chunk:
+                return
+            lines = (self.partial + chunk).split(b"\n")
+            self.partial = lines.pop()
+            text = self.filter.feed(lines)
+            if text:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+
+    def follow(self, process=None) -> None:
+        if not self._open(at_end=not self.from_start):
+            UI.warn(f"Waiting for {self.path} to appear...")
+
+        watcher = _Inotify(self.path.parent)
+        try:
+            while True:
+                self._check_rotation()
+                self._drain()
+
+                if process is not None and process.poll() is not None:
+                    self._drain()
+                    sys.stdout.write(self.filter.flush())
+                    UI.info(f"Game exited with code {process.returncode}.")
+                    return
+
+                if watcher.active:
+                    watcher.wait(1.0)
+                else:
+                    time.sleep(self.POLL_INTERVAL)
+        finally:
+            watcher.close()
+            if self.file:
+                self.file.close()
+
+
+class LogAnalyzer:
+    TOKEN = b"Exception"
+    RECORD_END = re.compile(rb"\n\r?\n")
+    MAX_RECORD = 64 * 1024
+    CHUNK_SIZE = 32 * 1024 * 1024
+
+    EXCEPTION_TYPE = re.compile(r"([\w.]+(?:Exception|Error))\b")
+    FEATURE = re.compile(r"\bMicrotools\.Features\.(\w+)")
+    NOISE = [
+        (re.compile(r" \[0x[0-9a-f]+\] in <[0-9a-f]*>:\d+"), ""),
+        (re.compile(r" in <[0-9a-f]*>:\d+"), ""),
+        (re.compile(r"_Patch\d+"), "_Patch"),
+        (re.compile(r"0x[0-9a-fA-F]+"), "0x?"),
+        (re.compile(r"\d+"), "N"),
+    ]
+    REF_LINE = re.compile(rb"\[Ref [0-9A-F]+\]")
+    DIGITS = bytes.maketrans(b"0123456789", b"##########")
+    SKIPPED_LINES = re.compile(r"^\s*(?:\[Ref [0-9A-F]+\]|\(Filename:)")
+
+    def __init__(self, path: Path, jobs: int | None = None):
+        self.path = path
+        self.jobs = jobs or os.cpu_count() or 1
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        for pattern, replacement in cls.NOISE:
+            text = pattern.sub(replacement, text)
+        return text.strip()
+
+    @classmethod
+    def parse_record(cls, record: str) -> tuple[str, dict]:
+        lines = [
+            line.rstrip()
+            for line in record.splitlines()
+            if line.strip() and not cls.SKIPPED_LINES.match(line)
+        ]
+        header = lines[0] if lines else ""
+        frames = [cls.normalize(line) for line in lines[1:]]
+
+        match = cls.EXCEPTION_TYPE.search(header)
+        exception_type = match.group(1) if match else "Exception"
+
+        feature = "-"
+        top_frame = ""
+        for frame in lines[1:]:
+            match = cls.FEATURE.search(frame)
+            if match:
+                feature, top_frame = match.group(1), frame.strip()
+                break
+            if "Microtools." in frame and feature == "-":
+                feature, top_frame = "Core", frame.strip()
+
+        key = "\n".join([exception_type, cls.normalize(header)] + frames)
+        signature = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return signature, {
+            "type": exception_type,
+            "feature": feature,
+            "message": header.strip(),
+            "top_frame": top_frame,
+            "stack": lines[1:],
+        }
+
+    @staticmethod
+    def _record_end(mm: mmap.mmap, pos: int, limit: int) -> tuple[int, int]:
+        end = mm.find(b"\n\n", pos, limit)
+        if end >= 0:
+            limit = end
+        crlf_end = mm.find(b"\n\r\n", pos, limit)
+        if crlf_end >= 0:
+            return crlf_end, crlf_end + 3
+        if end >= 0:
+            return end, end + 2
+        return limit, limit
+
+    @classmethod
+    def analyze_range(cls, path: Path, start: int, end: int) -> dict[str, dict]:
+        groups: dict[str, dict] = {}
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            pos = start
+            signatures: dict[bytes, str] = {}
+            while True:
+                hit = mm.find(cls.TOKEN, pos, end)
+                if hit < 0:
+                    break
+
+                line_start = mm.rfind(b"\n", 0, hit) + 1
+                limit = min(len(mm), hit + cls.MAX_RECORD)
+                record_end, pos = cls._record_end(mm, hit, limit)
+
+                raw = mm[line_start:record_end]
+                key = cls.REF_LINE.sub(b"", raw).translate(cls.DIGITS)
+                signature = signatures.get(key)
+                if signature is None:
+                    record = raw.decode("utf-8", errors="replace")
+                    signature, details = cls.parse_record(record)
+                    signatures[key] = signature
+                    if signature not in groups:
+                        details.update(count=0, first=line_start)
+                        groups[signature] = details
+
+                group = groups[signature]
+                group["count"] += 1
+                group["last"] = line_start
+        return groups
+
+    def _ranges(self) -> list[tuple[int, int]]:
+        size = self.path.stat().st_size
+        if size == 0:
+            return []
+
+        count = max(1, min(self.jobs * 4, size // self.CHUNK_SIZE or 1))
+        bounds = [0]
+        with open(self.path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for index in range(1, count):
+                match = self.RECORD_END.search(
+                    mm, max(bounds[-1], size * index // count)
+                )
+                if not match:
+                    break
+                if match.end() > bounds[-1]:
+                    bounds.append(match.end())
+        bounds.append(size)
+        return list(zip(bounds, bounds[1:]))
+
+    def _line_numbers(self, offsets: set[int]) -> dict[int, int]:
+        numbers = {}
+        line = 1
+        previous = 0
+        with open(self.path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for offset in sorted(offsets):
+                line += mm[previous:offset].count(b"\n")
+                numbers[offset] = line
+                previous = offset
+        return numbers
+
+    def run(self) -> list[dict]:
+        ranges = self._ranges()
+        if not ranges:
+            return []
+        merged: dict[str, dict] = {}
+
+        if len(ranges) <= 1 or self.jobs <= 1:
+            results = [self.analyze_range(self.path, *r) for r in ranges]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                results = list(
+                    pool.map(
+                        _analyze_range_worker,
+                        [self.path] * len(ranges),
+                        *zip(*ranges),
+                    )
+                )
+
+        for groups in results:
+            for signature, group in groups.items():
+                existing = merged.get(signature)
+                if existing is None:
+                    merged[signature] = group
+                else:
+                    existing["count"] += group["count"]
+                    existing["last"] = group["last"]
+
+        offsets = {g["first"] for g in merged.values()} | {
+            g["last"] for g in merged.values()
+        }
+        if not offsets:
+            return []
+        numbers = self._line_numbers(offsets)
+
+        report = []
+        for signature, group in merged.items():
+            group["signature"] = signature
+            group["first_line"] = numbers[group.pop("first")]
+            group["last_line"] = numbers[group.pop("last")]
+            report.append(group)
+        report.sort(key=lambda g: g["count"], reverse=True)
+        return report
+
+
+def _analyze_range_worker(path: Path, start: int, end: int) -> dict[str, dict]:
+    return LogAnalyzer.analyze_range(path, start, end)
+
+
+def print_report(report: list[dict], top: int) -> None:
+    total = sum(group["count"] for group in report)
+    UI.header(f"{total} exceptions, {len(report)} unique stack traces")
+    if not report:
+        return
+
+    UI.print_line(
+        f"{'count':>8}  {'feature':<22} {'first':>9} {'last':>9}  "
+        f"{'signature':<16}  type"
+    )
+    for group in report[:top]:
+        UI.print_line(
+            f"{group['count']:>8}  {group['feature']:<22} "
+            f"{group['first_line']:>9} {group['last_line']:>9}  "
+            f"{group['signature']:<16}  {group['type']}"
+        )
+        if group["top_frame"]:
+            UI.print_line(f"{'':>8}  {Colors.DIM}{group['top_frame']}{Colors.RESET}")
+    if len(report) > top:
+        UI.info(f"{len(report) - top} more signatures omitted (use --top).")
+
+    by_feature: dict[str, int] = {}
+    for group in report:
+        by_feature[group["feature"]] = (
+            by_feature.get(group["feature"], 0) + group["count"]
+        )
+    UI.header("By feature")
+    for feature, count in sorted(by_feature.items(), key=lambda kv: -kv[1]):
+        UI.print_line(f"{count:>8}  {feature}")
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--all-lines",
+        action="store_true",
+        help="Show every line instead of only Microtools output",
+    )
+    parser.add_argument(
+        "--tag",
+        action="append",
+        help="Only show [Microtools] lines from this caller (repeatable)",
+    )
+    parser.add_argument("--grep", help="Only show lines matching this regex")
+
+
+def create_filter(args) -> LogFilter:
+    return LogFilter(args.all_lines, args.tag, args.grep)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect RimWorld's Player.log")
+    parser.add_argument(
+        "--log",
+        type=Path,
+        default=PlayerLog.default_path(),
+        help="Path to Player.log (default: platform location)",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="")
+
+    follow_parser = subparsers.add_parser("follow", help="Tail Player.log live")
+    follow_parser.add_argument(
+        "--from-start",
+        action="store_true",
+        help="Replay the existing log before following",
+    )
+    add_filter_arguments(follow_parser)
+
+    analyze_parser = subparsers.add_parser(
+        "analyze", help="Summarize exceptions by deduplicated stack trace"
+    )
+    analyze_parser.add_argument(
+        "--top", type=int, default=20, help="Rows to show (default: 20)"
+    )
+    analyze_parser.add_argument(
+        "--feature", help="Only report traces attributed to this feature"
+    )
+    analyze_parser.add_argument("--json", type=Path, help="Write the full report here")
+    analyze_parser.add_argument(
+        "-j", "--jobs", type=int, help="Worker processes (default: CPU count)"
+    )
+
+    if len(sys.argv) == 1:
+        parser.print_help(sys.stderr)
+        sys.exit(1)
+
+    return parser.parse_args()
+
+
+def run():
+    setup.Runtime.enforce_venv()
+    args = _parse_args()
+
+    if args.command == "follow":
+        LogFollower(args.log, create_filter(args), args.from_start).follow()
+    elif args.command == "analyze":
+        if not args.log.is_file():
+            UI.error(f"Log file not found: {args.log}")
+            sys.exit(1)
+
+        start_time = time.perf_counter()
+        with UI.spin(f"Analyzing {args.log.name}..."):
+            report = LogAnalyzer(args.log, args.jobs).run()
+        if args.feature:
+            report = [g for g in report if g["feature"] == args.feature]
+        UI.info(f"Processed in {time.perf_counter() - start_time:.2f}s.")
+
+        print_report(report, args.top)
+        if args.json:
+            args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            UI.success(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    except KeyboardInterrupt:
+        UI.error("Cancelled by user.")
+        sys.exit(130)
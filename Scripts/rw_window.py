@@ -0,0 +1,487 @@
+import abc
+import os
+import select
+import socket
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+Monitor = Tuple[int, int, int, int]
+
+
+class WindowBackend(abc.ABC):
+
+    @abc.abstractmethod
+    def name(self) -> str:
+        pass
+
+    @abc.abstractmethod
+    def wait_for_window(self, pid: int, timeout: float) -> Optional[int]:
+        pass
+
+    @abc.abstractmethod
+    def monitors(self) -> List[Monitor]:
+        pass
+
+    @abc.abstractmethod
+    def place(
+        self,
+        window: int,
+        x: int,
+        y: int,
+        maximize: bool,
+        size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeWindowBackend(WindowBackend):
+
+    def __init__(
+        self,
+        windows: Optional[Dict[int, int]] = None,
+        monitors: Optional[List[Monitor]] = None,
+    ):
+        self.windows = windows
+        self.monitor_list = monitors or [(0, 0, 1920, 1080)]
+        self.placements: List[tuple] = []
+
+    def name(self) -> str:
+        return "fake"
+
+    def wait_for_window(self, pid: int, timeout: float) -> Optional[int]:
+        if self.windows is None:
+            return pid
+        return self.windows.get(pid)
+
+    def monitors(self) -> List[Monitor]:
+        return list(self.monitor_list)
+
+    def place(
+        self,
+        window: int,
+        x: int,
+        y: int,
+        maximize: bool,
+        size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        self.placements.append((window, x, y, maximize, size))
+
+
+class X11Error(RuntimeError):
+
+    def __init__(self, code: int, sequence: int):
+        super().__init__(f"X11 request {sequence} failed with error code {code}")
+        self.code = code
+        self.sequence = sequence
+
+
+class X11Connection:
+    SOCKET_DIR = "/tmp/.X11-unix"
+    AUTH_NAME = b"MIT-MAGIC-COOKIE-1"
+
+    def __init__(self, display: Optional[str] = None):
+        display = display or os.environ.get("DISPLAY")
+        if not display:
+            raise RuntimeError("DISPLAY is not set; no X server to talk to.")
+
+        host, number, screen = self._parse_display(display)
+        self.sock = self._open_socket(host, number)
+        self.sequence = 0
+        self.events: List[bytes] = []
+        self._buffer = b""
+        self._setup(host, number, screen)
+
+    @staticmethod
+    def _parse_display(display: str) -> Tuple[str, str, int]:
+        host, _, rest = display.rpartition(":")
+        number, _, screen = rest.partition(".")
+        if not number.isdigit():
+            raise RuntimeError(f"Invalid DISPLAY value: '{display}'")
+        return host, number, int(screen or 0)
+
+    @classmethod
+    def _open_socket(cls, host: str, number: str) -> socket.socket:
+        try:
+            if host in ("", "unix") or host.startswith("/"):
+                path = host if host.startswith("/") else f"{cls.SOCKET_DIR}/X{number}"
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    sock.connect(path)
+                except OSError:
+                    sock.connect("\0" + path)
+            else:
+                sock = socket.create_connection((host, 6000 + int(number)), timeout=5)
+                sock.settimeout(None)
+        except OSError as e:
+            raise RuntimeError(f"Could not connect to X display ':{number}': {e}")
+        return sock
+
+    @classmethod
+    def _read_cookie(cls, host: str, number: str) -> bytes:
+        path = os.environ.get("XAUTHORITY") or str(Path.home() / ".Xauthority")
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            return b""
+
+        hostname = socket.gethostname().encode()
+        wanted_host = host.encode() if host not in ("", "unix") else hostname
+        offset = 0
+        try:
+            while offset < len(data):
+                (family,) = struct.unpack_from(">H", data, offset)
+                offset += 2
+                fields = []
+                for _ in range(4):
+                    (length,) = struct.unpack_from(">H", data, offset)
+                    offset += 2
+                    fields.append(data[offset : offset + length])
+                    offset += length
+                address, display, name, cookie = fields
+                if name != cls.AUTH_NAME or display.decode() != number:
+                    continue
+                if family == 0xFFFF or address == wanted_host:
+                    return cookie
+        except struct.error:
+            pass
+        return b""
+
+    @staticmethod
+    def _pad(data: bytes) -> bytes:
+        return data + b"\0" * (-len(data) % 4)
+
+    def _recv(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise RuntimeError("X server closed the connection.")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _setup(self, host: str, number: str, screen: int) -> None:
+        cookie = self._read_cookie(host, number)
+        auth_name = self.AUTH_NAME if cookie else b""
+        request = struct.pack("<BxHHHH2x", 0x6C, 11, 0, len(auth_name), len(cookie))
+        self.sock.sendall(request + self._pad(auth_name) + self._pad(cookie))
+
+        status, reason_length, _, _, length = struct.unpack("<BBHHH", self._recv(8))
+        body = self._recv(length * 4)
+        if status != 1:
+            reason = body[: reason_length if status == 0 else len(body)]
+            raise RuntimeError(
+                f"X server refused connection: {reason.decode(errors='replace').strip()}"
+            )
+
+        vendor_length, _, screen_count, format_count = struct.unpack_from(
+            "<HHBB", body, 16
+        )
+        offset = 32 + vendor_length + (-vendor_length % 4) + format_count * 8
+
+        if screen >= screen_count:
+            screen = 0
+        for _ in range(screen):
+            depth_count = body[offset + 39]
+            offset += 40
+            for _ in range(depth_count):
+                (visual_count,) = struct.unpack_from("<H", body, offset + 2)
+                offset += 8 + visual_count * 24
+
+        self.root, _, _, _, _, self.width, self.height = struct.unpack_from(
+            "<IIIIIHH", body, offset
+        )
+
+    def _read_packet(self) -> bytes:
+        packet = self._recv(32)
+        if packet[0] == 1 or (packet[0] & 0x7F) == 35:
+            (extra,) = struct.unpack_from("<I", packet, 4)
+            packet += self._recv(extra * 4)
+        return packet
+
+    def send(self, *requests: bytes) -> int:
+        self.sock.sendall(b"".join(requests))
+        self.sequence = (self.sequence + len(requests)) & 0xFFFF
+        return self.sequence
+
+    def request(self, data: bytes) -> bytes:
+        sequence = self.send(data)
+        return self.wait_reply(sequence)
+
+    def wait_reply(self, sequence: int) -> bytes:
+        while True:
+            packet = self._read_packet()
+            code = packet[0]
+            packet_sequence = struct.unpack_from("<H", packet, 2)[0]
+            if code == 0:
+                if packet_sequence == sequence:
+                    raise X11Error(packet[1], sequence)
+            elif code == 1:
+                if packet_sequence == sequence:
+                    return packet
+            else:
+                self.events.append(packet)
+
+    def poll_events(self, timeout: float) -> List[bytes]:
+        if not self.events and not self._buffer:
+            readable, _, _ = select.select([self.sock], [], [], max(timeout, 0))
+            if not readable:
+                return []
+        if not self.events:
+            packet = self._read_packet()
+            if packet[0] > 1:
+                self.events.append(packet)
+        events, self.events = self.events, []
+        return events
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class X11Backend(WindowBackend):
+    SUBSTRUCTURE_NOTIFY = 1 << 19
+    SUBSTRUCTURE_REDIRECT = 1 << 20
+    PROPERTY_CHANGE = 1 << 22
+
+    MAP_NOTIFY = 19
+    PROPERTY_NOTIFY = 28
+    CLIENT_MESSAGE = 33
+
+    STATE_REMOVE = 0
+    STATE_ADD = 1
+    SOURCE_PAGER = 2
+
+    def __init__(self, display: Optional[str] = None):
+        self.conn = X11Connection(display)
+        self._atoms: Dict[str, int] = {}
+
+    def name(self) -> str:
+        return "x11"
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def atom(self, name: str) -> int:
+        if name not in self._atoms:
+            encoded = name.encode()
+            request = struct.pack(
+                "<BBHH2x", 16, 0, 2 + (len(encoded) + 3) // 4, len(encoded)
+            )
+            reply = self.conn.request(request + X11Connection._pad(encoded))
+            self._atoms[name] = struct.unpack_from("<I", reply, 8)[0]
+        return self._atoms[name]
+
+    def _intern_atoms(self, *names: str) -> None:
+        pending = [name for name in names if name not in self._atoms]
+        requests = []
+        for name in pending:
+            encoded = name.encode()
+            requests.append(
+                struct.pack("<BBHH2x", 16, 0, 2 + (len(encoded) + 3) // 4, len(encoded))
+                + X11Connection._pad(encoded)
+            )
+        if not requests:
+            return
+        last = self.conn.send(*requests)
+        first = (last - len(requests) + 1) & 0xFFFF
+        for index, name in enumerate(pending):
+            reply = self.conn.wait_reply((first + index) & 0xFFFF)
+            self._atoms[name] = struct.unpack_from("<I", reply, 8)[0]
+
+    def get_cardinals(self, window: int, prop: str) -> List[int]:
+        request = struct.pack(
+            "<BBHIIIII", 20, 0, 6, window, self.atom(prop), 0, 0, 0xFFFF
+        )
+        try:
+            reply = self.conn.request(request)
+        except X11Error:
+            return []
+        fmt = reply[1]
+        (count,) = struct.unpack_from("<I", reply, 16)
+        if fmt != 32 or not count:
+            return []
+        return list(struct.unpack_from(f"<{count}I", reply, 32))
+
+    def _select_root_events(self) -> None:
+        mask = self.SUBSTRUCTURE_NOTIFY | self.PROPERTY_CHANGE
+        self.conn.send(struct.pack("<BBHIII", 2, 0, 4, self.conn.root, 0x800, mask))
+
+    def _match_pid(self, windows: List[int], pid: int) -> Optional[int]:
+        if not windows:
+            return None
+        prop = self.atom("_NET_WM_PID")
+        requests = [
+            struct.pack("<BBHIIIII", 20, 0, 6, window, prop, 0, 0, 1)
+            for window in windows
+        ]
+        last = self.conn.send(*requests)
+        first = (last - len(requests) + 1) & 0xFFFF
+        match = None
+        for index, window in enumerate(windows):
+            try:
+                reply = self.conn.wait_reply((first + index) & 0xFFFF)
+            except X11Error:
+                continue
+            if reply[1] == 32 and struct.unpack_from("<I", reply, 16)[0] >= 1:
+                if match is None and struct.unpack_from("<I", reply, 32)[0] == pid:
+                    match = window
+        return match
+
+    def wait_for_window(self, pid: int, timeout: float) -> Optional[int]:
+        self._intern_atoms("_NET_CLIENT_LIST", "_NET_WM_PID")
+        self._select_root_events()
+        client_list = self.atom("_NET_CLIENT_LIST")
+
+        deadline = time.monotonic() + timeout
+        checked: set = set()
+        rescan = True
+
+        while True:
+            if rescan:
+                windows = self.get_cardinals(self.conn.root, "_NET_CLIENT_LIST")
+                fresh = [window for window in windows if window not in checked]
+                checked.update(fresh)
+                match = self._match_pid(fresh, pid)
+                if match:
+                    return match
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            rescan = False
+            for event in self.conn.poll_events(remaining):
+                code = event[0] & 0x7F
+                if code == self.MAP_NOTIFY:
+                    rescan = True
+                elif code == self.PROPERTY_NOTIFY:
+                    window, atom = struct.unpack_from("<II", event, 4)
+                    if window == self.conn.root and atom == client_list:
+                        rescan = True
+
+    def monitors(self) -> List[Monitor]:
+        conn = self.conn
+        name = b"RANDR"
+        reply = conn.request(
+            struct.pack("<BBHH2x", 98, 0, 2 + (len(name) + 3) // 4, len(name))
+            + X11Connection._pad(name)
+        )
+        present, randr = reply[8], reply[9]
+
+        if present:
+            reply = conn.request(struct.pack("<BBHII", randr, 0, 3, 1, 5))
+            major, minor = struct.unpack_from("<II", reply, 8)
+            if (major, minor) >= (1, 5):
+                reply = conn.request(
+                    struct.pack("<BBHIB3x", randr, 42, 3, conn.root, 1)
+                )
+                (count,) = struct.unpack_from("<I", reply, 12)
+                monitors = []
+                offset = 32
+                for _ in range(count):
+                    outputs, x, y, width, height = struct.unpack_from(
+                        "<HhhHH", reply, offset + 6
+                    )
+                    primary = reply[offset + 4]
+                    monitor = (x, y, width, height)
+                    if primary:
+                        monitors.insert(0, monitor)
+                    else:
+                        monitors.append(monitor)
+                    offset += 24 + outputs * 4
+                if monitors:
+                    return monitors
+
+        return [(0, 0, conn.width, conn.height)]
+
+    def _client_message(self, window: int, message_type: str, *data: int) -> bytes:
+        values = (list(data) + [0] * 5)[:5]
+        event = struct.pack(
+            "<BBHII5i",
+            self.CLIENT_MESSAGE,
+            32,
+            0,
+            window,
+            self.atom(message_type),
+            *values,
+        )
+        mask = self.SUBSTRUCTURE_REDIRECT | self.SUBSTRUCTURE_NOTIFY
+        return struct.pack("<BBHII", 25, 0, 11, self.conn.root, mask) + event
+
+    def place(
+        self,
+        window: int,
+        x: int,
+        y: int,
+        maximize: bool,
+        size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        self._intern_atoms(
+            "_NET_WM_STATE",
+            "_NET_WM_STATE_MAXIMIZED_VERT",
+            "_NET_WM_STATE_MAXIMIZED_HORZ",
+            "_NET_MOVERESIZE_WINDOW",
+        )
+        vert = self.atom("_NET_WM_STATE_MAXIMIZED_VERT")
+        horz = self.atom("_NET_WM_STATE_MAXIMIZED_HORZ")
+        move_flags = (1 << 8) | (1 << 9) | (self.SOURCE_PAGER << 12)
+        width, height = size or (0, 0)
+        if size:
+            move_flags |= (1 << 10) | (1 << 11)
+
+        requests = [
+            self._client_message(
+                window,
+                "_NET_WM_STATE",
+                self.STATE_REMOVE,
+                vert,
+                horz,
+                self.SOURCE_PAGER,
+            ),
+            self._client_message(
+                window, "_NET_MOVERESIZE_WINDOW", move_flags, x, y, width, height
+            ),
+        ]
+        if maximize:
+            requests.append(
+                self._client_message(
+                    window,
+                    "_NET_WM_STATE",
+                    self.STATE_ADD,
+                    vert,
+                    horz,
+                    self.SOURCE_PAGER,
+                )
+            )
+        requests.append(struct.pack("<BxH", 43, 1))
+        self.conn.wait_reply(self.conn.send(*requests))
+
+
+BACKENDS = {
+    "x11": X11Backend,
+    "fake": FakeWindowBackend,
+}
+
+BACKEND_ENV_VAR = "RW_WINDOW_BACKEND"
+
+
+def get_backend(name: Optional[str] = None) -> WindowBackend:
+    name = name or os.environ.get(BACKEND_ENV_VAR, "x11")
+    if name not in BACKENDS:
+        raise RuntimeError(
+            f"Unknown window backend '{name}'. Available: {', '.join(BACKENDS)}"
+        )
+    return BACKENDS[name]()
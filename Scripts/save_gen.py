@@ -0,0 +1,473 @@
+import argparse
+import copy
+import gzip
+import random
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.parsers import expat
+from xml.sax.saxutils import XMLGenerator
+
+import setup
+from save_inspect import COMPONENT_CLASS
+from utils import UI
+
+MAP_PATH = ["savegame", "game", "maps", "li"]
+CELL_PATTERN = re.compile(r"\((-?\d+),\s*(-?\d+),\s*(-?\d+)\)")
+STOCKPILE_CLASS = "Zone_Stockpile"
+ZONE_SIZE = 6
+EDGE_MARGIN = 10
+
+
+def _open(path: Path, mode: str, compress: bool = False):
+    if "r" in mode:
+        with open(path, "rb") as raw:
+            if raw.read(2) == b"\x1f\x8b":
+                return gzip.open(path, mode)
+    elif compress:
+        return gzip.open(path, mode, compresslevel=6)
+    return open(path, mode)
+
+
+class Template:
+    def __init__(self, path: Path, map_index: int, item_def: str | None):
+        self.path = path
+        self.map_index = map_index
+        self.item_def = item_def
+        self.maps = 0
+        self.size: tuple[int, int] | None = None
+        self.next_thing_id: int | None = None
+        self.next_zone_id: int | None = None
+        self.item: ET.Element | None = None
+        self.zone: ET.Element | None = None
+        self.zoned_cells: set[tuple[int, int]] = set()
+        self.has_component = False
+
+    def _is_item(self, elem: ET.Element) -> bool:
+        if elem.find("stackCount") is None or elem.find("pos") is None:
+            return False
+        return self.item_def is None or elem.findtext("def") == self.item_def
+
+    def scan(self) -> "Template":
+        path: list[str] = []
+        map_count = -1
+        with _open(self.path, "rb") as stream:
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    path.append(elem.tag)
+                    if len(path) == 4 and path == MAP_PATH:
+                        map_count += 1
+                    continue
+
+                depth = len(path)
+                path.pop()
+                parent = path[-1] if path else ""
+                if elem.tag == "nextThingID" and parent == "uniqueIDsManager":
+                    self.next_thing_id = int(elem.text)
+                elif elem.tag == "nextZoneID" and parent == "uniqueIDsManager":
+                    self.next_zone_id = int(elem.text)
+
+                if map_count != self.map_index or depth < 5 or path[:4] != MAP_PATH:
+                    if depth > 4:
+                        continue
+                    elem.clear()
+                    continue
+
+                if depth == 6 and path[4] == "mapInfo" and elem.tag == "size":
+                    match = CELL_PATTERN.fullmatch(elem.text.strip())
+                    if match:
+                        self.size = (int(match.group(1)), int(match.group(3)))
+                elif depth == 6 and path[4] == "things":
+                    if self.item is None and self._is_item(elem):
+                        self.item = copy.deepcopy(elem)
+                    elem.clear()
+                elif depth == 6 and path[4] == "components":
+                    if elem.get("Class") == COMPONENT_CLASS:
+                        self.has_component = True
+                    elem.clear()
+                elif depth == 7 and path[4:6] == ["zoneManager", "allZones"]:
+                    for cell in elem.iterfind("cells/li"):
+                        match = CELL_PATTERN.fullmatch(cell.text.strip())
+                        if match:
+                            self.zoned_cells.add(
+                                (int(match.group(1)), int(match.group(3)))
+                            )
+                    if self.zone is None and elem.get("Class") == STOCKPILE_CLASS:
+                        self.zone = copy.deepcopy(elem)
+                    elem.clear()
+        self.maps = map_count + 1
+        return self
+
+    def validate(self) -> None:
+        if self.map_index >= self.maps:
+            raise RuntimeError(
+                f"Template has {self.maps} map(s); --map {self.map_index} is out of range."
+            )
+        missing = [
+            name
+            for name, value in [
+                ("map size", self.size),
+                ("uniqueIDsManager/nextThingID", self.next_thing_id),
+                ("uniqueIDsManager/nextZoneID", self.next_zone_id),
+                (f"an item ({self.item_def or 'any stackable def'})", self.item),
+                ("a stockpile zone", self.zone),
+            ]
+            if value is None
+        ]
+        if missing:
+            raise RuntimeError(f"Template is missing {', '.join(missing)}.")
+
+
+class StressPlan:
+    def __init__(self, template: Template, args):
+        self.template = template
+        self.things = args.things
+        self.tracked = min(args.tracked, args.things)
+        self.zones = args.zones
+        self.held_ratio = args.held_ratio
+        self.random = random.Random(args.seed)
+
+        width, height = template.size
+        self.area = args.area or (
+            EDGE_MARGIN,
+            EDGE_MARGIN,
+            width - 2 * EDGE_MARGIN,
+            height - 2 * EDGE_MARGIN,
+        )
+        x, z, w, h = self.area
+        if x < 0 or z < 0 or w <= 0 or h <= 0 or x + w > width or z + h > height:
+            raise RuntimeError(
+                f"Area {self.area} does not fit the {width}x{height} map."
+            )
+        if self.things > w * h:
+            raise RuntimeError(
+                f"--things {self.things} exceeds the {w * h} area cells."
+            )
+        self.zone_slots = [
+            (left, bottom)
+            for bottom in range(z, z + h - ZONE_SIZE + 1, ZONE_SIZE)
+            for left in range(x, x + w - ZONE_SIZE + 1, ZONE_SIZE)
+            if not any(
+                cell in template.zoned_cells for cell in self._slot_cells(left, bottom)
+            )
+        ]
+        if self.zones > len(self.zone_slots):
+            raise RuntimeError(
+                f"--zones {self.zones} exceeds the {len(self.zone_slots)} free "
+                f"{ZONE_SIZE}x{ZONE_SIZE} slots in the area."
+            )
+
+        self.first_thing_id = template.next_thing_id
+        self.first_zone_id = template.next_zone_id
+        self.def_name = template.item.findtext("def")
+
+    def thing_cell(self, index: int) -> tuple[int, int]:
+        x, z, w, _ = self.area
+        return x + index % w, z + index // w
+
+    def random_cell(self) -> tuple[int, int]:
+        x, z, w, h = self.area
+        return x + self.random.randrange(w), z + self.random.randrange(h)
+
+    def thing_load_id(self, index: int) -> str:
+        return f"{self.def_name}{self.first_thing_id + index}"
+
+    @staticmethod
+    def _slot_cells(left: int, bottom: int):
+        for dz in range(ZONE_SIZE):
+            for dx in range(ZONE_SIZE):
+                yield left + dx, bottom + dz
+
+    def zone_cells(self, index: int):
+        return self._slot_cells(*self.zone_slots[index])
+
+
+class StressWriter:
+    def __init__(self, plan: StressPlan, out):
+        self.plan = plan
+        self.template = plan.template
+        self.out = XMLGenerator(out, encoding="utf-8", short_empty_elements=True)
+        self.path: list[str] = []
+        self.map_count = -1
+        self.skip_depth = 0
+        self.replace_text: str | None = None
+        self.whitespace = ""
+
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.XmlDeclHandler = lambda *_: self.out.startDocument()
+        self.parser.StartElementHandler = self._start
+        self.parser.EndElementHandler = self._end
+        self.parser.CharacterDataHandler = self._characters
+
+    def _in_target_map(self) -> bool:
+        return self.map_count == self.template.map_index and self.path[:4] == MAP_PATH
+
+    def _indent(self, depth: int) -> None:
+        self.out.ignorableWhitespace("\n" + "\t" * depth)
+
+    def _element(self, tag: str, text: str, depth: int, attrs=None) -> None:
+        self._indent(depth)
+        self.out.startElement(tag, attrs or {})
+        self.out.characters(text)
+        self.out.endElement(tag)
+
+    def _tree(self, elem: ET.Element, depth: int) -> None:
+        self._indent(depth)
+        self.out.startElement(elem.tag, dict(elem.attrib))
+        if len(elem):
+            for child in elem:
+                self._tree(child, depth + 1)
+            self._indent(depth)
+        elif elem.text:
+            self.out.characters(elem.text)
+        self.out.endElement(elem.tag)
+
+    def _write_things(self, depth: int) -> None:
+        item = copy.deepcopy(self.template.item)
+        id_node, pos_node = item.find("id"), item.find("pos")
+        for index in range(self.plan.things):
+            x, z = self.plan.thing_cell(index)
+            id_node.text = self.plan.thing_load_id(index)
+            pos_node.text = f"({x}, 0, {z})"
+            self._tree(item, depth)
+
+    def _write_zones(self, depth: int) -> None:
+        zone = copy.deepcopy(self.template.zone)
+        cells = zone.find("cells")
+        if cells is None:
+            cells = ET.SubElement(zone, "cells")
+        for index in range(self.plan.zones):
+            zone_id = self.plan.first_zone_id + index
+            for tag, text in [("ID", str(zone_id)), ("label", f"Stress {zone_id}")]:
+                node = zone.find(tag)
+                if node is not None:
+                    node.text = text
+            cells.clear()
+            for x, z in self.plan.zone_cells(index):
+                ET.SubElement(cells, "li").text = f"({x}, 0, {z})"
+            self._tree(zone, depth)
+
+    def _write_direct_haul(self, depth: int) -> None:
+        plan = self.plan
+        held = [plan.random.random() < plan.held_ratio for _ in range(plan.tracked)]
+
+        self._indent(depth)
+        self.out.startElement("DirectHaul", {})
+        self._indent(depth + 1)
+        self.out.startElement("thingKeys", {})
+        for index in range(plan.tracked):
+            self._element("li", f"Thing_{plan.thing_load_id(index)}", depth + 2)
+        self._indent(depth + 1)
+        self.out.endElement("thingKeys")
+
+        self._indent(depth + 1)
+        self.out.startElement("dataValues", {})
+        for is_held in held:
+            self._indent(depth + 2)
+            self.out.startElement("li", {})
+            self._element("status", "Held" if is_held else "Pending", depth + 3)
+            if not is_held:
+                x, z = plan.random_cell()
+                self._element("targetCell", f"({x}, 0, {z})", depth + 3)
+            self._indent(depth + 2)
+            self.out.endElement("li")
+        self._indent(depth + 1)
+        self.out.endElement("dataValues")
+        self._indent(depth)
+        self.out.endElement("DirectHaul")
+
+    def _flush_whitespace(self) -> None:
+        if self.whitespace:
+            self.out.ignorableWhitespace(self.whitespace)
+            self.whitespace = ""
+
+    def _start(self, name: str, attrs: dict) -> None:
+        if self.skip_depth:
+            self.skip_depth += 1
+            return
+
+        self._flush_whitespace()
+        self.path.append(name)
+        depth = len(self.path)
+        if depth == 4 and self.path == MAP_PATH:
+            self.map_count += 1
+
+        self.out.startElement(name, attrs)
+
+        if depth >= 2 and self.path[-2] == "uniqueIDsManager":
+            if name == "nextThingID":
+                self.replace_text = str(self.plan.first_thing_id + self.plan.things)
+            elif name == "nextZoneID":
+                self.replace_text = str(self.plan.first_zone_id + self.plan.zones)
+        elif (
+            depth == 6
+            and self.path[4] == "components"
+            and attrs.get("Class") == COMPONENT_CLASS
+            and self._in_target_map()
+        ):
+            self._write_direct_haul(depth)
+            self.skip_depth = 1
+
+    def _end(self, name: str) -> None:
+        if self.skip_depth:
+            self.skip_depth -= 1
+            if self.skip_depth:
+                return
+            self._indent(len(self.path) - 1)
+            self.out.endElement(name)
+            self.path.pop()
+            return
+
+        depth = len(self.path)
+        if self.replace_text is not None:
+            self.out.characters(self.replace_text)
+            self.replace_text = None
+        elif self._in_target_map():
+            if depth == 5 and name == "things":
+                self.whitespace = ""
+                self._write_things(depth)
+                self._indent(depth - 1)
+            elif depth == 6 and self.path[4:6] == ["zoneManager", "allZones"]:
+                self.whitespace = ""
+                self._write_zones(depth)
+                self._indent(depth - 1)
+            elif (
+                depth == 5 and name == "components" and not self.template.has_component
+            ):
+                self.whitespace = ""
+                self._indent(depth)
+                self.out.startElement("li", {"Class": COMPONENT_CLASS})
+                self._write_direct_haul(depth + 1)
+                self._indent(depth)
+                self.out.endElement("li")
+                self._indent(depth - 1)
+
+        self._flush_whitespace()
+        self.out.endElement(name)
+        self.path.pop()
+
+    def _characters(self, text: str) -> None:
+        if self.skip_depth or self.replace_text is not None:
+            return
+        if not text.strip():
+            self.whitespace += text
+        else:
+            self._flush_whitespace()
+            self.out.characters(text)
+
+    def write(self, source) -> None:
+        self.parser.ParseFile(source)
+        self.out.ignorableWhitespace("\n")
+        self.out.endDocument()
+
+
+def run_generate(args) -> None:
+    if args.output.resolve() == args.template.resolve():
+        raise RuntimeError("Output must not overwrite the template.")
+
+    start_time = time.perf_counter()
+    with UI.spin(f"Scanning {args.template.name}..."):
+        template = Template(args.template, args.map, args.item_def).scan()
+    template.validate()
+    plan = StressPlan(template, args)
+    UI.info(
+        f"Map {args.map}: {template.size[0]}x{template.size[1]}, item {plan.def_name}, "
+        f"area {plan.area}"
+    )
+
+    temp = args.output.with_name(args.output.name + ".tmp")
+    with UI.spin(f"Writing {args.output.name}..."):
+        try:
+            with _open(args.template, "rb") as source, _open(
+                temp, "wb", args.output.suffix == ".gz"
+            ) as out:
+                StressWriter(plan, out).write(source)
+            temp.replace(args.output)
+        except (expat.ExpatError, OSError):
+            temp.unlink(missing_ok=True)
+            raise
+
+    UI.success(
+        f"Wrote {args.output} ({args.output.stat().st_size / 1024 / 1024:.1f} MB) in "
+        f"{time.perf_counter() - start_time:.2f}s: {plan.things} items, "
+        f"{plan.tracked} tracked, {plan.zones} stockpiles"
+    )
+    UI.info(f"Inspect with: python Scripts/save_inspect.py {args.output}")
+
+
+def _area(value: str) -> tuple[int, int, int, int]:
+    try:
+        x, z, w, h = (int(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected x,z,width,height")
+    return x, z, w, h
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate a DirectHaul/StorageLens stress save from a template"
+    )
+    parser.add_argument("template", type=Path, help="Small template save (.rws)")
+    parser.add_argument(
+        "output", type=Path, help="Output save (.rws, or .rws.gz for gzip)"
+    )
+    parser.add_argument(
+        "--things",
+        type=int,
+        default=20000,
+        help="Items to add by cloning one of the template's (default: 20000)",
+    )
+    parser.add_argument(
+        "--tracked",
+        type=int,
+        default=10000,
+        help="DirectHaul entries over the added items (default: 10000)",
+    )
+    parser.add_argument(
+        "--zones",
+        type=int,
+        default=200,
+        help=f"{ZONE_SIZE}x{ZONE_SIZE} stockpiles to add (default: 200)",
+    )
+    parser.add_argument(
+        "--held-ratio",
+        type=float,
+        default=0.5,
+        help="Fraction of tracked entries marked Held, the rest Pending (default: 0.5)",
+    )
+    parser.add_argument(
+        "--map", type=int, default=0, help="Map index to populate (default: 0)"
+    )
+    parser.add_argument(
+        "--area",
+        type=_area,
+        help=f"Cell rect x,z,width,height to fill (default: map minus {EDGE_MARGIN})",
+    )
+    parser.add_argument(
+        "--item-def", help="Def of the template item to clone (default: first stack)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed for statuses and targets"
+    )
+    return parser.parse_args()
+
+
+def run():
+    setup.Runtime.enforce_venv()
+    args = _parse_args()
+    try:
+        run_generate(args)
+    except (RuntimeError, OSError, expat.ExpatError, ET.ParseError) as e:
+        UI.error(f"Fatal error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    except KeyboardInterrupt:
+        UI.error("Cancelled by user.")
+        sys.exit(130)
@@ -0,0 +1,327 @@
+import argparse
+import gzip
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from xml.parsers import expat
+
+import setup
+from rw_log import save_data_folder
+from utils import UI, Colors
+
+COMPONENT_CLASS = "Microtools.MicrotoolsMapComponent"
+CELL_PATTERN = re.compile(r"\((-?\d+),\s*(-?\d+),\s*(-?\d+)\)")
+READ_SIZE = 1 << 20
+
+
+class MapReport:
+    def __init__(self, index: int):
+        self.index = index
+        self.unique_id = ""
+        self.size: tuple[int, int] | None = None
+        self.component_start = 0
+        self.component_bytes = 0
+        self.keys: list[str] = []
+        self.statuses: list[str] = []
+        self.targets: list[str] = []
+
+    def to_dict(self, thing_ids: set[bytes], total_bytes: int, examples: int) -> dict:
+        null_keys = sum(1 for key in self.keys if key == "null")
+        dangling = [
+            key
+            for key in self.keys
+            if key != "null" and key.removeprefix("Thing_").encode() not in thing_ids
+        ]
+
+        statuses: dict[str, int] = {}
+        for status in self.statuses:
+            statuses[status] = statuses.get(status, 0) + 1
+
+        targets = {"cell": 0, "thing": 0, "null": 0, "outside map": 0}
+        for target in self.targets:
+            match = CELL_PATTERN.fullmatch(target)
+            if match:
+                x, z = int(match.group(1)), int(match.group(3))
+                inside = self.size is None or (
+                    0 <= x < self.size[0] and 0 <= z < self.size[1]
+                )
+                targets["cell" if inside else "outside map"] += 1
+            elif target.startswith("Thing_"):
+                targets["thing"] += 1
+            else:
+                targets["null"] += 1
+
+        return {
+            "map": self.index,
+            "offset": self.component_start,
+            "unique_id": self.unique_id,
+            "entries": len(self.keys),
+            "data_values": len(self.statuses),
+            "null_keys": null_keys,
+            "dangling": len(dangling),
+            "dangling_examples": dangling[:examples],
+            "statuses": statuses,
+            "targets": targets,
+            "bytes": self.component_bytes,
+            "share": self.component_bytes / total_bytes if total_bytes else 0.0,
+        }
+
+
+class _ComponentParser:
+    def __init__(self, report: MapReport):
+        self.report = report
+        self.done = False
+        self.fed = 0
+        self.end_offset = 0
+        self._kind = None
+        self._text: list[str] = []
+        self._path: list[str] = []
+
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self._start
+        self.parser.EndElementHandler = self._end
+
+    def _capture(self, kind: str) -> None:
+        self._kind = kind
+        self._text = []
+        self.parser.CharacterDataHandler = self._text.append
+
+    def _start(self, name: str, attrs: dict) -> None:
+        self._path.append(name)
+        depth = len(self._path)
+        if depth == 4 and name == "li":
+            if self._path[2] == "thingKeys":
+                self._capture("key")
+            elif self._path[2] == "dataValues":
+                self.report.statuses.append("None")
+                self.report.targets.append("null")
+        elif depth == 5 and self._path[2] == "dataValues":
+            if name == "status":
+                self._capture("status")
+            elif name == "targetCell":
+                self._capture("target")
+
+    def _end(self, name: str) -> None:
+        self._path.pop()
+        if self._kind is not None:
+            text = "".join(self._text).strip()
+            self.parser.CharacterDataHandler = None
+            if self._kind == "key":
+                self.report.keys.append(text)
+            elif self._kind == "status":
+                self.report.statuses[-1] = text
+            else:
+                self.report.targets[-1] = text
+            self._kind = None
+        elif not self._path:
+            self.done = True
+            self.end_offset = self.parser.CurrentByteIndex + len(f"</{name}>")
+
+    def feed(self, data: bytes) -> int:
+        fed = self.fed
+        self.fed += len(data)
+        try:
+            self.parser.Parse(data, False)
+        except expat.ExpatError:
+            if not self.done:
+                raise
+        return self.end_offset - fed if self.done else len(data)
+
+
+class SaveInspector:
+    ID_PATTERN = re.compile(rb"<id>([^<]*)</id>")
+    MAP_PATTERN = re.compile(
+        rb"<maps>|<uniqueID>([^<]*)</uniqueID>|<size>\((\d+),\s*\d+,\s*(\d+)\)</size>"
+    )
+    COMPONENT_TAG = f'<li Class="{COMPONENT_CLASS}">'.encode()
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.maps: list[MapReport] = []
+        self.thing_ids: set[bytes] = set()
+        self.total_bytes = 0
+        self._component: _ComponentParser | None = None
+        self._unique_id = ""
+        self._size: tuple[int, int] | None = None
+
+    def _scan(self, data: bytes, offset: int) -> None:
+        position = 0
+        while position < len(data):
+            if self._component is not None:
+                position += self._component.feed(data[position:])
+                if not self._component.done:
+                    return
+                self._component.report.component_bytes = self._component.end_offset
+                self._component = None
+                continue
+
+            start = data.find(self.COMPONENT_TAG, position)
+            stop = len(data) if start < 0 else start
+            self.thing_ids.update(self.ID_PATTERN.findall(data, position, stop))
+            for match in self.MAP_PATTERN.finditer(data, position, stop):
+                unique_id, width, height = match.groups()
+                if unique_id is not None:
+                    self._unique_id = unique_id.decode()
+                elif width is not None:
+                    self._size = (int(width), int(height))
+                else:
+                    self._unique_id, self._size = "", None
+            if start < 0:
+                return
+
+            report = MapReport(len(self.maps))
+            report.component_start = offset + start
+            report.unique_id, report.size = self._unique_id, self._size
+            self._unique_id, self._size = "", None
+            self.maps.append(report)
+            self._component = _ComponentParser(report)
+            position = start
+
+    def run(self, examples: int) -> dict:
+        with open(self.path, "rb") as raw:
+            compressed = raw.read(2) == b"\x1f\x8b"
+        opener = gzip.open if compressed else open
+
+        carry = b""
+        offset = 0
+        with opener(self.path, "rb") as stream:
+            while True:
+                chunk = stream.read(READ_SIZE)
+                data = carry + chunk
+                if not data:
+                    break
+                cut = data.rfind(b"\n") + 1 if chunk else len(data)
+                try:
+                    self._scan(data[:cut], offset)
+                except expat.ExpatError as e:
+                    raise RuntimeError(f"Malformed Microtools data: {e}")
+                offset += cut
+                carry = data[cut:]
+        self.total_bytes = offset
+
+        return {
+            "save": str(self.path),
+            "compressed": compressed,
+            "file_bytes": self.path.stat().st_size,
+            "xml_bytes": self.total_bytes,
+            "things": len(self.thing_ids),
+            "maps": [
+                m.to_dict(self.thing_ids, self.total_bytes, examples) for m in self.maps
+            ],
+        }
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ["B", "KB", "MB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def print_report(report: dict, elapsed: float) -> None:
+    UI.header(f"{Path(report['save']).name}")
+    UI.info(
+        f"{_format_bytes(report['file_bytes'])} on disk"
+        f"{' (gzip)' if report['compressed'] else ''}, "
+        f"{_format_bytes(report['xml_bytes'])} XML, {report['things']} thing ids, "
+        f"parsed in {elapsed:.2f}s"
+    )
+
+    if not report["maps"]:
+        UI.info("No Microtools data in this save.")
+    for m in report["maps"]:
+        UI.print_line(
+            f"{Colors.BOLD}Map uniqueID {m['unique_id'] or '?'}{Colors.RESET}"
+        )
+
+        UI.print_line(
+            f"  entries     {m['entries']:>8}"
+            + (
+                f"  {Colors.YELLOW}dataValues {m['data_values']}{Colors.RESET}"
+                if m["data_values"] != m["entries"]
+                else ""
+            )
+        )
+        stale = m["dangling"] + m["null_keys"]
+        color = Colors.RED if stale else Colors.GREEN
+        UI.print_line(
+            f"  stale refs  {color}{stale:>8}{Colors.RESET}"
+            f"  ({m['null_keys']} null, {m['dangling']} unresolved)"
+        )
+        UI.print_line(
+            "  statuses    "
+            + ", ".join(f"{k} {v}" for k, v in sorted(m["statuses"].items()))
+        )
+        UI.print_line(
+            "  targets     "
+            + ", ".join(f"{k} {v}" for k, v in m["targets"].items() if v)
+        )
+        UI.print_line(
+            f"  size        {_format_bytes(m['bytes']):>8}  ({m['share']:.2%} of save)"
+        )
+        for key in m["dangling_examples"]:
+            UI.print_line(f"  {Colors.DIM}unresolved {key}{Colors.RESET}")
+
+
+def _resolve(save: str) -> Path:
+    path = Path(save)
+    if path.is_file():
+        return path
+    named = save_data_folder() / "Saves" / f"{save}.rws"
+    if named.is_file():
+        return named
+    UI.error(f"Save not found: {save}")
+    sys.exit(1)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Inspect Microtools data stored in RimWorld saves"
+    )
+    parser.add_argument(
+        "saves",
+        nargs="+",
+        help="Save files (.rws, plain or gzip) or save names from the Saves folder",
+    )
+    parser.add_argument(
+        "--examples",
+        type=int,
+        default=5,
+        help="Unresolved references to list per map (default: 5)",
+    )
+    parser.add_argument("--json", type=Path, help="Write the full report here")
+    return parser.parse_args()
+
+
+def run():
+    setup.Runtime.enforce_venv()
+    args = _parse_args()
+
+    reports = []
+    for save in args.saves:
+        path = _resolve(save)
+        start_time = time.perf_counter()
+        try:
+            with UI.spin(f"Parsing {path.name}..."):
+                report = SaveInspector(path).run(args.examples)
+        except (RuntimeError, OSError) as e:
+            UI.error(f"Fatal error: {e}")
+            sys.exit(1)
+        print_report(report, time.perf_counter() - start_time)
+        reports.append(report)
+
+    if args.json:
+        args.json.write_text(json.dumps(reports, indent=2), encoding="utf-8")
+        UI.success(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    except KeyboardInterrupt:
+        UI.error("Cancelled by user.")
+        sys.exit(130)
@@ -5,9 +5,11 @@ import shutil
 import stat
 import subprocess
 import sys
+import time
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import utils
 from utils import UI
@@ -263,6 +265,144 @@ class DotNetToolRequirement(Requirement):
                 pass
 
 
+class BuildCacheCollector:
+    DEFAULT_BUDGET = 10 * 1024**3
+    TEMP_MAX_AGE = 60 * 60
+
+    def __init__(self, root: Path = utils.Paths.BUILD):
+        self.root = root
+
+    def _protected(self) -> List[Path]:
+        return [
+            utils.Paths.VENV,
+            utils.Paths.TOOLS,
+            utils.Paths.INSTANCES,
+            utils.Paths.INSTALL_REGISTRY,
+            utils.Paths.SYNC,
+            utils.CacheIndex.FILE,
+        ]
+
+    def _candidates(self) -> List[Tuple[str, Path]]:
+        if not self.root.exists():
+            return []
+
+        candidates = []
+        for path in self.root.iterdir():
+            if path == utils.CacheIndex.FILE:
+                continue
+            if path.name == ".venv" and path.is_dir():
+                candidates += [("venv", p) for p in path.iterdir()]
+            elif path == utils.Paths.TOOLS:
+                candidates.append(("tools", path))
+            elif path == utils.Paths.TEMP and path.is_dir():
+                candidates += [("tmp", p) for p in path.iterdir()]
+            elif path == utils.Paths.CACHE and path.is_dir():
+                for child in path.iterdir():
+                    if child.name == "unity-project" and child.is_dir():
+                        candidates += [("unity-project", p) for p in child.iterdir()]
+                    else:
+                        candidates.append(("cache", child))
+            else:
+                candidates.append(("other", path))
+        return candidates
+
+    def scan(self) -> List[Dict]:
+        index = utils.CacheIndex.load()
+        protected = {p.resolve() for p in self._protected()}
+        candidates = self._candidates()
+
+        with ThreadPoolExecutor(max_workers=min(8, len(candidates) or 1)) as pool:
+            stats = list(pool.map(lambda c: utils.Fs.dir_stats(c[1]), candidates))
+
+        entries = []
+        for (category, path), (size, newest) in zip(candidates, stats):
+            key = utils.CacheIndex.key(path)
+            entries.append(
+                {
+                    "category": category,
+                    "path": path,
+                    "size": size,
+                    "last_used": max(newest, index.get(key, 0.0) if key else 0.0),
+                    "protected": path.resolve() in protected,
+                }
+            )
+        return entries
+
+    def plan(self, entries: List[Dict], budget: int) -> List[Dict]:
+        now = time.time()
+        evict = [
+            e
+            for e in entries
+            if e["category"] == "tmp" and now - e["last_used"] > self.TEMP_MAX_AGE
+        ]
+
+        total = sum(e["size"] for e in entries) - sum(e["size"] for e in evict)
+        for entry in sorted(entries, key=lambda e: e["last_used"]):
+            if total <= budget:
+                break
+            if entry["protected"] or entry["category"] == "tmp" and entry in evict:
+                continue
+            evict.append(entry)
+            total -= entry["size"]
+        return evict
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def collect(self, budget: int, dry_run: bool) -> None:
+        UI.header("Build Cache Garbage Collection")
+        entries = self.scan()
+        if not entries:
+            UI.info(f"Nothing to collect in {self.root}.")
+            return
+
+        categories: Dict[str, List[int]] = {}
+        for entry in entries:
+            totals = categories.setdefault(entry["category"], [0, 0])
+            totals[0] += 1
+            totals[1] += entry["size"]
+        for category, (count, size) in sorted(categories.items()):
+            size_str = utils.format_size(size)
+            UI.info(f"{category:<14} {count:>4} entries {size_str:>10}")
+
+        total = sum(e["size"] for e in entries)
+        UI.info(
+            f"{'total':<14} {len(entries):>4} entries {utils.format_size(total):>10}"
+        )
+
+        evict = self.plan(entries, budget)
+        if not evict:
+            UI.success(f"Build cache is within budget ({utils.format_size(budget)}).")
+            return
+
+        freed = 0
+        index = utils.CacheIndex.load()
+        for entry in evict:
+            name = entry["path"].relative_to(self.root)
+            idle_days = (time.time() - entry["last_used"]) / 86400
+            detail = f"{utils.format_size(entry['size'])}, {idle_days:.1f}d idle"
+            if dry_run:
+                UI.step(f"Would remove {name} ({detail})")
+            else:
+                self._remove(entry["path"])
+                index.pop(utils.CacheIndex.key(entry["path"]) or "", None)
+                UI.step(f"Removed {name} ({detail})")
+            freed += entry["size"]
+
+        if dry_run:
+            UI.success(f"Would free {utils.format_size(freed)}.")
+        else:
+            utils.CacheIndex.save(index)
+            UI.success(f"Freed {utils.format_size(freed)}.")
+
+
 class Runtime:
 
     @staticmethod
@@ -391,7 +531,8 @@ MANIFEST: Dict[str, Component] = {
         [
             DotNetToolRequirement(
                 "CryptikLemur.AssetBundleBuilder", "4.0.1", "assetbundlebuilder"
-            )
+            ),
+            PipRequirement("assets_deps", ["numpy"]),
         ],
     ),
 }
@@ -427,6 +568,19 @@ def parse_args():
         help="Components to remove",
     )
 
+    gc_parser = subparsers.add_parser(
+        "gc", help="Evict least recently used build caches"
+    )
+    gc_parser.add_argument(
+        "--budget",
+        type=int,
+        default=BuildCacheCollector.DEFAULT_BUDGET,
+        help="Target size of .build in bytes",
+    )
+    gc_parser.add_argument(
+        "--dry-run", action="store_true", help="Report without deleting"
+    )
+
     args = parser.parse_args()
 
     if not args.command:
@@ -448,6 +602,8 @@ def main():
         env.check(args.components)
     elif args.command == "clean":
         env.clean(args.components)
+    elif args.command == "gc":
+        BuildCacheCollector().collect(args.budget, args.dry_run)
 
 
 if __name__ == "__main__":
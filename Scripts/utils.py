@@ -8,8 +8,9 @@ import contextlib
 import itertools
 import platform
 import shlex
+import json
 from pathlib import Path
-from typing import Optional, Union, List, Tuple
+from typing import Dict, Optional, Union, List, Tuple
 
 PLATFORM_ID = f"{sys.platform}-{platform.machine().lower()}"
 
@@ -20,6 +21,11 @@ class Paths:
 
     VENV = BUILD / ".venv" / PLATFORM_ID
     TOOLS = BUILD / "tools"
+    CACHE = BUILD / "cache"
+    TEMP = BUILD / "tmp"
+    INSTANCES = BUILD / "instances"
+    INSTALL_REGISTRY = BUILD / "rw_installs.json"
+    SYNC = BUILD / "sync"
 
 
 class Colors:
@@ -170,6 +176,16 @@ class UI:
             sys.stderr.write(f"{prefix}{text}\n")
 
 
+def format_size(size: int) -> str:
+    if size >= 1024**3:
+        return f"{size / 1024**3:.1f} GB"
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+
 def require(binary: str):
     if shutil.which(binary) is None:
         UI.error(f"Missing required binary: {binary}")
@@ -186,6 +202,40 @@ class Fs:
         if path.exists():
             shutil.rmtree(path)
 
+    @staticmethod
+    def dir_stats(path: Path) -> Tuple[int, float]:
+        total = 0
+        newest = 0.0
+        try:
+            st = path.stat()
+        except OSError:
+            return 0, 0.0
+        if not path.is_dir():
+            return st.st_size, st.st_mtime
+
+        newest = st.st_mtime
+        stack = [str(path)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            entry_stat = entry.stat(follow_symlinks=False)
+                            newest = max(newest, entry_stat.st_mtime)
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            else:
+                                total += entry_stat.st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return total, newest
+
+    @staticmethod
+    def dir_size(path: Path) -> int:
+        return Fs.dir_stats(path)[0]
+
     @staticmethod
     def create_symlink(source: Path, target: Path):
         if target.is_symlink():
@@ -209,6 +259,47 @@ class Fs:
             )
 
 
+class CacheIndex:
+    FILE = Paths.BUILD / "cache-index.json"
+
+    @classmethod
+    def load(cls) -> Dict[str, float]:
+        try:
+            with open(cls.FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @classmethod
+    def key(cls, path: Path) -> Optional[str]:
+        try:
+            return path.resolve().relative_to(Paths.BUILD.resolve()).as_posix()
+        except ValueError:
+            return None
+
+    @classmethod
+    def touch(cls, path: Path) -> None:
+        key = cls.key(path)
+        if key is None:
+            return
+
+        data = cls.load()
+        data[key] = time.time()
+        cls.save(data)
+
+    @classmethod
+    def save(cls, data: Dict[str, float]) -> None:
+        try:
+            cls.FILE.parent.mkdir(parents=True, exist_ok=True)
+            temp = cls.FILE.with_name(f"{cls.FILE.name}.{os.getpid()}.tmp")
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp, cls.FILE)
+        except OSError:
+            pass
+
+
 def run(
     cmd: Union[str, List[str]],
     *,
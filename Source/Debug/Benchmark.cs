@@ -0,0 +1,309 @@
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
+using System.Linq;
+using System.Text;
+using Microtools.Features.DirectHaul;
+using RimWorld;
+using UnityEngine;
+using Verse;
+
+namespace Microtools.Debug
+{
+    public class Benchmark
+    {
+        public const string SaveArg = "microtoolsBenchmark";
+        public const string SecondsArg = "microtoolsBenchmarkSeconds";
+        public const string ThingsArg = "microtoolsBenchmarkThings";
+        public const string OutputArg = "microtoolsBenchmarkOut";
+        public const string ResultFileName = "MicrotoolsBenchmark.json";
+
+        private const float DefaultSeconds = 30f;
+        private const int DefaultThingCount = 2000;
+        private const float WarmupSeconds = 5f;
+        private const float StorageLensToggleSeconds = 1f;
+        private const float FocusOrbitRadius = 20f;
+        private const float FocusOrbitSpeed = 0.5f;
+        private const int DragLength = 12;
+        private const float CameraRootSize = 60f;
+
+        private static Benchmark _current;
+
+        private readonly string _saveName;
+        private readonly float _phaseSeconds;
+        private readonly int _thingCount;
+        private readonly string _outputPath;
+
+        private readonly PlacementService _placementService = new();
+        private readonly List<Thing> _things = [];
+        private readonly List<string> _phases = [];
+        private readonly Dictionary<string, List<float>> _frameTimes = [];
+
+        private float _startTime = -1f;
+        private int _phaseIndex = -1;
+        private bool _finished;
+        private IStoreSettingsParent _storage;
+
+        private Benchmark(string saveName, float phaseSeconds, int thingCount, string outputPath)
+        {
+            _saveName = saveName;
+            _phaseSeconds = phaseSeconds;
+            _thingCount = thingCount;
+            _outputPath = outputPath;
+        }
+
+        public static void TryLoadSave()
+        {
+            if (!GenCommandLine.TryGetCommandLineArg(SaveArg, out string saveName))
+            {
+                return;
+            }
+
+            float seconds = DefaultSeconds;
+            if (GenCommandLine.TryGetCommandLineArg(SecondsArg, out string secondsText))
+            {
+                float.TryParse(
+                    secondsText,
+                    NumberStyles.Float,
+                    CultureInfo.InvariantCulture,
+                    out seconds
+                );
+            }
+            int thingCount = DefaultThingCount;
+            if (GenCommandLine.TryGetCommandLineArg(ThingsArg, out string thingsText))
+            {
+                int.TryParse(thingsText, out thingCount);
+            }
+            if (!GenCommandLine.TryGetCommandLineArg(OutputArg, out string outputPath))
+            {
+                outputPath = Path.Combine(GenFilePaths.SaveDataFolderPath, ResultFileName);
+            }
+
+            _current = new Benchmark(saveName, Mathf.Max(seconds, 1f), thingCount, outputPath);
+
+            if (!File.Exists(GenFilePaths.FilePathForSavedGame(saveName)))
+            {
+                _current.Abort(
+                    $"Save '{saveName}' not found in {GenFilePaths.SavedGamesFolderPath}"
+                );
+                return;
+            }
+
+            Verse.Log.Message($"[Microtools] [Benchmark] Loading save '{saveName}'");
+            GameDataSaveLoader.LoadGame(saveName);
+        }
+
+        public static void Update(MicrotoolsMapComponent component, Map map)
+        {
+            if (_current == null || _current._finished)
+            {
+                return;
+            }
+            _current.Step(component, map);
+        }
+
+        private void Step(MicrotoolsMapComponent component, Map map)
+        {
+            float now = Time.realtimeSinceStartup;
+            if (_startTime < 0f)
+            {
+                Setup(map);
+                _startTime = now + WarmupSeconds;
+                return;
+            }
+
+            float elapsed = now - _startTime;
+            if (elapsed < 0f)
+            {
+                return;
+            }
+
+            int phaseIndex = (int)(elapsed / _phaseSeconds);
+            if (phaseIndex != _phaseIndex)
+            {
+                LeavePhase(component);
+                _phaseIndex = phaseIndex;
+                if (_phaseIndex >= _phases.Count)
+                {
+                    Finish();
+                    return;
+                }
+                Verse.Log.Message($"[Microtools] [Benchmark] Phase '{_phases[_phaseIndex]}'");
+            }
+            else
+            {
+                _frameTimes[_phases[_phaseIndex]].Add(Time.unscaledDeltaTime * 1000f);
+            }
+
+            float phaseElapsed = elapsed - _phaseIndex * _phaseSeconds;
+            switch (_phases[_phaseIndex])
+            {
+                case "directhaul":
+                    PreviewPlacement(component, map, phaseElapsed);
+                    break;
+                case "storagelens":
+                    ToggleStorageLens(component, phaseElapsed);
+                    break;
+            }
+        }
+
+        private void Setup(Map map)
+        {
+            Find.TickManager.CurTimeSpeed = TimeSpeed.Paused;
+            Find.CameraDriver.SetRootPosAndSize(map.Center.ToVector3Shifted(), CameraRootSize);
+
+            _things.AddRange(
+                map.listerThings.ThingsInGroup(ThingRequestGroup.HaulableEver)
+                    .Where(t => t.Spawned && !t.Destroyed)
+                    .OrderBy(t => t.thingIDNumber)
+                    .Take(_thingCount)
+            );
+
+            var slotGroups = map.haulDestinationManager.AllGroupsListForReading;
+            _storage = slotGroups.Count > 0 ? slotGroups[0].parent : null;
+
+            _phases.Add("idle");
+            if (_things.Count > 0)
+            {
+                _phases.Add("directhaul");
+            }
+            if (_storage != null)
+            {
+                _phases.Add("storagelens");
+                Find.Selector.ClearSelection();
+                Find.Selector.Select(_storage, false, false);
+            }
+            foreach (var phase in _phases)
+            {
+                _frameTimes[phase] = new List<float>(4096);
+            }
+
+            Verse.Log.Message(
+                $"[Microtools] [Benchmark] {_things.Count} things, storage: "
+                    + $"{_storage?.ToString() ?? "none"}, phases: {string.Join(", ", _phases)}"
+            );
+        }
+
+        private void PreviewPlacement(MicrotoolsMapComponent component, Map map, float elapsed)
+        {
+            float angle = elapsed * FocusOrbitSpeed;
+            var focus1 = (
+                map.Center.ToVector3Shifted()
+                + new Vector3(Mathf.Cos(angle), 0f, Mathf.Sin(angle)) * FocusOrbitRadius
+            ).ToIntVec3();
+            var focus2 = (int)elapsed % 2 == 0 ? focus1 : focus1 + new IntVec3(DragLength, 0, 0);
+
+            _placementService.Calculate(
+                new PlacementRequest(
+                    _things,
+                    map,
+                    focus1.ClampInsideMap(map),
+                    focus2.ClampInsideMap(map),
+                    component.DirectHaul.ThingStateManager.PendingTargetCells
+                )
+            );
+        }
+
+        private void ToggleStorageLens(MicrotoolsMapComponent component, float elapsed)
+        {
+            var storageLens = component.StorageLens;
+            bool shouldBeActive = (int)(elapsed / StorageLensToggleSeconds) % 2 == 0;
+
+            if (shouldBeActive && !storageLens.IsActive)
+            {
+                storageLens.Activate();
+            }
+            else if (!shouldBeActive && storageLens.IsActive)
+            {
+                storageLens.Deactivate();
+            }
+
+            if (storageLens.IsActive)
+            {
+                storageLens.Update();
+            }
+        }
+
+        private static void LeavePhase(MicrotoolsMapComponent component)
+        {
+            if (component.StorageLens.IsActive)
+            {
+                component.StorageLens.Deactivate();
+            }
+        }
+
+        private void Finish()
+        {
+            _finished = true;
+            Perf.Flush();
+
+            var json = new StringBuilder();
+            json.Append("{\n")
+                .Append("  \"save\": \"")
+                .Append(Escape(_saveName))
+                .Append("\",\n")
+                .Append("  \"version\": \"")
+                .Append(Escape(VersionControl.CurrentVersionStringWithRev))
+                .Append("\",\n")
+                .Append("  \"phase_seconds\": ")
+                .Append(Format(_phaseSeconds))
+                .Append(",\n")
+                .Append("  \"things\": ")
+                .Append(_things.Count)
+                .Append(",\n")
+                .Append("  \"phases\": {");
+
+            for (int i = 0; i < _phases.Count; i++)
+            {
+                var frames = _frameTimes[_phases[i]];
+                json.Append(i == 0 ? "\n" : ",\n")
+                    .Append("    \"")
+                    .Append(_phases[i])
+                    .Append("\": [");
+                for (int j = 0; j < frames.Count; j++)
+                {
+                    if (j > 0)
+                    {
+                        json.Append(',');
+                    }
+                    json.Append(Format(frames[j]));
+                }
+                json.Append(']');
+            }
+            json.Append("\n  }\n}\n");
+
+            WriteResult(json.ToString());
+        }
+
+        private void Abort(string error)
+        {
+            _finished = true;
+            Verse.Log.Error($"[Microtools] [Benchmark] {error}");
+            WriteResult(
+                $"{{\n  \"save\": \"{Escape(_saveName)}\",\n"
+                    + $"  \"error\": \"{Escape(error)}\"\n}}\n"
+            );
+        }
+
+        private void WriteResult(string content)
+        {
+            try
+            {
+                File.WriteAllText(_outputPath, content);
+                Verse.Log.Message($"[Microtools] [Benchmark] Results written to {_outputPath}");
+            }
+            catch (Exception ex)
+            {
+                Verse.Log.Error($"[Microtools] [Benchmark] Could not write results: {ex.Message}");
+            }
+            Root.Shutdown();
+        }
+
+        private static string Format(float value) =>
+            value.ToString("0.###", CultureInfo.InvariantCulture);
+
+        private static string Escape(string value) =>
+            value.Replace("\\", "\\\\").Replace("\"", "\\\"");
+    }
+}
@@ -0,0 +1,154 @@
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Text;
+using UnityEngine;
+using Verse;
+
+namespace Microtools.Debug
+{
+    public static class Perf
+    {
+        public const string FileName = "MicrotoolsPerf.log";
+        private const float FlushIntervalSeconds = 10f;
+
+        private static readonly double MicrosecondsPerTick = 1_000_000.0 / Stopwatch.Frequency;
+        private static readonly Dictionary<string, ScopeStats> Scopes = [];
+        private static readonly StringBuilder Buffer = new();
+
+        private static int _currentFrame = -1;
+        private static int _windowStartFrame = -1;
+        private static float _lastFlushTime;
+        private static string _filePath;
+
+        public readonly struct Scope(string name, long startTimestamp) : IDisposable
+        {
+            private readonly string _name = name;
+            private readonly long _startTimestamp = startTimestamp;
+
+            public void Dispose()
+            {
+                Record(_name, Stopwatch.GetTimestamp() - _startTimestamp);
+            }
+        }
+
+        private sealed class ScopeStats
+        {
+            public long FrameTicks;
+            public int Calls;
+            public readonly List<int> FrameMicroseconds = new(1024);
+        }
+
+        public static Scope Measure(string name) => new(name, Stopwatch.GetTimestamp());
+
+        public static void Flush()
+        {
+            CommitFrame();
+            if (_windowStartFrame >= 0)
+            {
+                Flush(Time.frameCount + 1);
+            }
+        }
+
+        private static void Record(string name, long elapsedTicks)
+        {
+            int frame = Time.frameCount;
+            if (frame != _currentFrame)
+            {
+                CommitFrame();
+                _currentFrame = frame;
+                if (_windowStartFrame < 0)
+                {
+                    _windowStartFrame = frame;
+                    _lastFlushTime = Time.realtimeSinceStartup;
+                }
+                else if (Time.realtimeSinceStartup - _lastFlushTime >= FlushIntervalSeconds)
+                {
+                    Flush(frame);
+                }
+            }
+
+            if (!Scopes.TryGetValue(name, out var stats))
+            {
+                stats = new ScopeStats();
+                Scopes[name] = stats;
+            }
+            stats.FrameTicks += elapsedTicks;
+            stats.Calls++;
+        }
+
+        private static void CommitFrame()
+        {
+            foreach (var stats in Scopes.Values)
+            {
+                if (stats.FrameTicks == 0)
+                {
+                    continue;
+                }
+                stats.FrameMicroseconds.Add((int)(stats.FrameTicks * MicrosecondsPerTick));
+                stats.FrameTicks = 0;
+            }
+        }
+
+        private static void Flush(int frame)
+        {
+            int frames = frame - _windowStartFrame;
+            _windowStartFrame = frame;
+            _lastFlushTime = Time.realtimeSinceStartup;
+
+            Buffer.Clear();
+            foreach (var pair in Scopes)
+            {
+                var stats = pair.Value;
+                if (stats.Calls == 0)
+                {
+                    continue;
+                }
+
+                Buffer
+                    .Append(pair.Key)
+                    .Append(" frames=")
+                    .Append(frames)
+                    .Append(" calls=")
+                    .Append(stats.Calls)
+                    .Append(" us=");
+                for (int i = 0; i < stats.FrameMicroseconds.Count; i++)
+                {
+                    if (i > 0)
+                    {
+                        Buffer.Append(',');
+                    }
+                    Buffer.Append(stats.FrameMicroseconds[i]);
+                }
+                Buffer.Append('\n');
+
+                stats.FrameMicroseconds.Clear();
+                stats.Calls = 0;
+            }
+
+            if (Buffer.Length == 0)
+            {
+                return;
+            }
+
+            try
+            {
+                if (_filePath == null)
+                {
+                    _filePath = Path.Combine(GenFilePaths.SaveDataFolderPath, FileName);
+                    string version = VersionControl.CurrentVersionStringWithRev;
+                    File.AppendAllText(_filePath, $"# session {DateTime.UtcNow:o} {version}\n");
+                }
+                File.AppendAllText(_filePath, Buffer.ToString());
+            }
+            catch (Exception ex)
+            {
+                Log.MessageOnce(
+                    $"Could not write {FileName}: {ex.Message}",
+                    FileName.GetHashCode()
+                );
+            }
+        }
+    }
+}
@@ -64,6 +64,10 @@ namespace Microtools.Features.DirectHaul
 
         public void Update()
         {
+#if DEBUG
+            using var perfScope = Debug.Perf.Measure("GraphicsController_StatusOverlay.Update");
+#endif
+
             if (!MicrotoolsMod.Settings.directHaulSettings.enableStatusOverlays)
             {
                 ClearInternal(applyFadeOut: true);
@@ -111,6 +111,10 @@ namespace Microtools.Features.DirectHaul
 
         public Dictionary<Thing, IntVec3> Calculate(PlacementRequest request)
         {
+#if DEBUG
+            using var perfScope = Debug.Perf.Measure("PlacementService.Calculate");
+#endif
+
             if (!IsCalculateInputValid(request.Focus1, request.Map, request.ThingsToPlace.Count))
             {
                 return [];
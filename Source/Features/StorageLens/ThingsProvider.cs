@@ -19,6 +19,10 @@ namespace Microtools.Features.StorageLens
 
         public void Update()
         {
+#if DEBUG
+            using var perfScope = Debug.Perf.Measure("StorageLens.ThingsProvider.Update");
+#endif
+
             var map = _state.CurrentMap;
             var storageParent = _state.SelectedStorage;
 
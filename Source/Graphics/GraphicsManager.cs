@@ -172,6 +172,10 @@ namespace Microtools.Graphics
 
         public void UpdateTweens()
         {
+#if DEBUG
+            using var perfScope = Debug.Perf.Measure("GraphicsManager.UpdateTweens");
+#endif
+
             if (_activeTweens.Count == 0 && _finishedTweenKeysToRemove.Count == 0)
                 return;
 
@@ -193,6 +197,10 @@ namespace Microtools.Graphics
 
         public void UpdateGraphicObjects()
         {
+#if DEBUG
+            using var perfScope = Debug.Perf.Measure("GraphicsManager.UpdateGraphicObjects");
+#endif
+
             if (_graphicObjects.Count == 0)
                 return;
 
@@ -251,6 +259,10 @@ namespace Microtools.Graphics
 
         public void RenderGraphicObjects()
         {
+#if DEBUG
+            using var perfScope = Debug.Perf.Measure("GraphicsManager.RenderGraphicObjects");
+#endif
+
             if (_graphicObjects.Count == 0)
                 return;
 
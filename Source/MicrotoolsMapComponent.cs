@@ -113,6 +113,10 @@ namespace Microtools
                 }
             }
 
+#if DEBUG
+            Debug.Benchmark.Update(this, map);
+#endif
+
             GraphicsManager?.UpdateTweens();
             GraphicsManager?.UpdateGraphicObjects();
             GraphicsManager?.RenderGraphicObjects();
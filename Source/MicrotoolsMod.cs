@@ -24,6 +24,7 @@ namespace Microtools
             LongEventHandler.ExecuteWhenFinished(() =>
             {
                 harmony.PatchCategory(typeof(MicrotoolsMod).Assembly, "Debug");
+                Debug.Benchmark.TryLoadSave();
             });
 #endif
         }